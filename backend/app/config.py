@@ -6,6 +6,8 @@ from pathlib import Path
 # Корень backend (папка, где лежат app/, data/, docker/)
 BACKEND_ROOT = Path(__file__).resolve().parents[1]
 DEFAULT_LOG_FOLDER = BACKEND_ROOT / "logs"
+# Локальные служебные данные (зеркало Hood, кэши); папки с JSON смонтированы только на чтение.
+DEFAULT_STATE_FOLDER = BACKEND_ROOT / "state"
 DOTENV_PATH = BACKEND_ROOT / ".env"
 
 
@@ -71,6 +73,7 @@ class Settings:
 
     JSON_FOLDER: str = _resolve_path(os.getenv("JSON_FOLDER", ""), allow_empty=True)
     LOG_FOLDER: str = _resolve_path(os.getenv("LOG_FOLDER", str(DEFAULT_LOG_FOLDER)))
+    STATE_FOLDER: str = _resolve_path(os.getenv("STATE_FOLDER", str(DEFAULT_STATE_FOLDER)))
     PRICE_SHEET_PATH: str = _resolve_path(os.getenv("PRICE_SHEET_PATH", ""), allow_empty=True)
     HTML_DESCRIPTIONS_FOLDER: str = _resolve_path(
         os.getenv("HTML_DESCRIPTIONS_FOLDER", ""),
@@ -0,0 +1,160 @@
+"""
+Чекпоинты фоновых update/upload: какие товары (itemNumber / reference_id) задача уже обработала и с каким итогом.
+Итоги копятся в памяти и пишутся в SQLite в STATE_FOLDER пачками (JOB_CHECKPOINT_EVERY записей
+или раз в JOB_CHECKPOINT_INTERVAL_SECONDS), так что после рестарта задачу можно продолжить (resume)
+и не отправлять повторно товары, которые уже прошли успешно.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Set, Tuple
+
+from app.config import settings
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS job_checkpoints (
+    kind TEXT NOT NULL,
+    job_id TEXT NOT NULL,
+    item_key TEXT NOT NULL,
+    success INTEGER NOT NULL,
+    outcome TEXT,
+    updated_at TEXT NOT NULL,
+    PRIMARY KEY (kind, job_id, item_key)
+);
+CREATE INDEX IF NOT EXISTS job_checkpoints_updated ON job_checkpoints (updated_at);
+"""
+
+_STORE: "CheckpointStore | None" = None
+_STORE_LOCK = threading.Lock()
+
+
+class CheckpointStore:
+    def __init__(self, db_path: str) -> None:
+        self.db_path = db_path
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def put_many(self, kind: str, job_id: str, outcomes: List[Tuple[str, bool, Dict[str, Any] | None]]) -> None:
+        if not outcomes:
+            return
+        now = datetime.now(timezone.utc).isoformat()
+        with self._connect() as conn:
+            # Успех не затирается более поздней неудачей (повторная отправка уже созданного товара).
+            conn.executemany(
+                "INSERT INTO job_checkpoints (kind, job_id, item_key, success, outcome, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (kind, job_id, item_key) DO UPDATE SET "
+                "success = MAX(success, excluded.success), outcome = CASE WHEN success > excluded.success "
+                "THEN outcome ELSE excluded.outcome END, updated_at = excluded.updated_at",
+                [
+                    (
+                        kind,
+                        job_id,
+                        key,
+                        1 if success else 0,
+                        json.dumps(outcome, ensure_ascii=False, default=str) if outcome else None,
+                        now,
+                    )
+                    for key, success, outcome in outcomes
+                ],
+            )
+
+    def succeeded_keys(self, kind: str, job_id: str) -> Set[str]:
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT item_key FROM job_checkpoints WHERE kind = ? AND job_id = ? AND success = 1",
+                (kind, job_id),
+            ).fetchall()
+        return {row[0] for row in rows}
+
+    def counts(self, kind: str, job_id: str) -> Dict[str, int]:
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT success, COUNT(*) FROM job_checkpoints WHERE kind = ? AND job_id = ? GROUP BY success",
+                (kind, job_id),
+            ).fetchall()
+        by_success = {bool(success): count for success, count in rows}
+        return {"succeeded": by_success.get(True, 0), "failed": by_success.get(False, 0)}
+
+    def delete(self, kind: str, job_id: str) -> int:
+        with self._connect() as conn:
+            cur = conn.execute("DELETE FROM job_checkpoints WHERE kind = ? AND job_id = ?", (kind, job_id))
+        return cur.rowcount
+
+    def evict_older_than(self, seconds: float) -> int:
+        cutoff = (datetime.now(timezone.utc) - timedelta(seconds=seconds)).isoformat()
+        with self._connect() as conn:
+            cur = conn.execute("DELETE FROM job_checkpoints WHERE updated_at < ?", (cutoff,))
+        return cur.rowcount
+
+
+def get_checkpoint_store() -> CheckpointStore:
+    global _STORE
+    with _STORE_LOCK:
+        if _STORE is None:
+            _STORE = CheckpointStore(str(Path(settings.STATE_FOLDER) / "job_checkpoints.sqlite3"))
+        return _STORE
+
+
+class JobCheckpoint:
+    """
+    Чекпоинт одной задачи. done_keys — товары, уже успешно обработанные прошлыми запусками;
+    record() буферизует итоги и сбрасывает их на диск по порогу; flush() — принудительно (в конце/при ошибке).
+    """
+
+    def __init__(self, kind: str, job_id: str) -> None:
+        self.kind = kind
+        self.job_id = job_id
+        self.every = max(1, int(os.environ.get("JOB_CHECKPOINT_EVERY", "50")))
+        self.interval = float(os.environ.get("JOB_CHECKPOINT_INTERVAL_SECONDS", "5"))
+        self.done_keys: Set[str] = get_checkpoint_store().succeeded_keys(kind, job_id)
+        self._buffer: List[Tuple[str, bool, Dict[str, Any] | None]] = []
+        self._flushed_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def record(self, key: str, success: bool, outcome: Dict[str, Any] | None = None) -> None:
+        self.record_many([(key, success, outcome)])
+
+    def record_many(self, outcomes: Iterable[Tuple[str, bool, Dict[str, Any] | None]]) -> None:
+        with self._lock:
+            self._buffer.extend((str(key), bool(success), outcome) for key, success, outcome in outcomes if key)
+            due = len(self._buffer) >= self.every or time.monotonic() - self._flushed_at >= self.interval
+        if due:
+            self.flush()
+
+    def flush(self) -> None:
+        with self._lock:
+            batch, self._buffer = self._buffer, []
+            self._flushed_at = time.monotonic()
+            if batch:
+                get_checkpoint_store().put_many(self.kind, self.job_id, batch)
+
+
+def checkpoint_counts(kind: str, job_id: str) -> Dict[str, int]:
+    return get_checkpoint_store().counts(kind, job_id)
+
+
+def drop_checkpoints(kind: str, job_id: str) -> int:
+    """Удаляет чекпоинт задачи (после успешного завершения он больше не нужен)."""
+    return get_checkpoint_store().delete(kind, job_id)
+
+
+def evict_expired_checkpoints(ttl_seconds: float) -> int:
+    return get_checkpoint_store().evict_older_than(ttl_seconds)
@@ -5,16 +5,21 @@ from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Any, Callable, Dict, List, Tuple
 
 from app.config import settings
+from app.items.hood_mirror import current_hood_items
 from app.items.storage import load_all_items, load_items_from_source_file
-from app.items.utils import normalize_item
+from app.items.normalize_cache import normalize_items_cached
 from app.logger import get_logger
 from hood_api.api.parsers import parse_item_detail_response
 from hood_api.builders import build_item_detail_by_item_number
 from hood_api.client import send_request
+from hood_api.concurrency import current_limit, get_concurrency_limiter, run_in_slot
 from hood_api.config import ApiConfig
 
 logger = get_logger("items")
 _NOT_FOUND_MARKER = "artikel nicht gefunden"
+CHECK_MODES: tuple[str, ...] = ("snapshot", "item_detail")
+# itemDetail находит товар в любом статусе, поэтому снимок по умолчанию собирается по всем.
+SNAPSHOT_STATUSES_DEFAULT = "running,sold,unsuccessful"
 
 
 def get_server_items(json_folder: str | None = None) -> List[Dict[str, Any]]:
@@ -64,14 +69,116 @@ def _exists_in_hood_by_item_detail(item_number: str, cfg: ApiConfig) -> Tuple[bo
     return False, "itemDetail returned no items"
 
 
+class HoodInventorySnapshot:
+    """
+    Снимок инвентаря Hood: itemNumber -> itemIDs из локального зеркала (или одного прохода itemList).
+    Проверки существования отвечают из памяти; itemDetail вызывается только для
+    неоднозначных случаев (товар не найден, но в снимке есть позиции без itemNumber).
+    """
+
+    def __init__(
+        self,
+        cfg: ApiConfig,
+        ids_by_number: Dict[str, List[str]],
+        items_without_number: int = 0,
+        verify_missing: bool = False,
+    ) -> None:
+        self.cfg = cfg
+        self.ids_by_number = ids_by_number
+        self.items_without_number = items_without_number
+        self.verify_missing = verify_missing
+
+    @classmethod
+    def load(
+        cls,
+        cfg: ApiConfig,
+        item_statuses: List[str] | None = None,
+        verify_missing: bool = False,
+        progress_cb: Callable[[Dict[str, Any]], None] | None = None,
+    ) -> "HoodInventorySnapshot":
+        statuses = item_statuses or snapshot_statuses()
+        ids_by_number: Dict[str, List[str]] = {}
+        items_without_number = 0
+        for status_name in statuses:
+            for it in current_hood_items(cfg=cfg, item_status=status_name, progress_cb=progress_cb):
+                item_number = _normalize_item_number(it.get("itemNumber"))
+                item_id = str(it.get("itemID") or "").strip()
+                if not item_number:
+                    items_without_number += 1
+                    continue
+                ids = ids_by_number.setdefault(item_number, [])
+                if item_id and item_id not in ids:
+                    ids.append(item_id)
+        return cls(
+            cfg=cfg,
+            ids_by_number=ids_by_number,
+            items_without_number=items_without_number,
+            verify_missing=verify_missing,
+        )
+
+    def lookup(self, item_number: str) -> bool | None:
+        """Ответ из памяти; None — нужен запрос itemDetail (verify_missing)."""
+        if item_number in self.ids_by_number:
+            return True
+        if self.verify_missing and self.items_without_number:
+            return None
+        return False
+
+    def exists(self, item_number: str) -> Tuple[bool, str | None]:
+        found = self.lookup(item_number)
+        if found is None:
+            return _exists_in_hood_by_item_detail(item_number, self.cfg)
+        return found, None
+
+
+def snapshot_statuses() -> List[str]:
+    raw = os.environ.get("HOOD_EXISTENCE_SNAPSHOT_STATUSES", SNAPSHOT_STATUSES_DEFAULT)
+    statuses = [x.strip().lower() for x in raw.split(",") if x.strip()]
+    return statuses or SNAPSHOT_STATUSES_DEFAULT.split(",")
+
+
+def resolve_check_mode(check_mode: str | None) -> str:
+    mode = str(check_mode or os.environ.get("HOOD_EXISTENCE_CHECK_MODE", "snapshot")).strip().lower()
+    if mode not in CHECK_MODES:
+        raise ValueError(f"check_mode must be one of: {', '.join(CHECK_MODES)}")
+    return mode
+
+
+def _existence_checker(
+    cfg: ApiConfig,
+    check_mode: str,
+    verify_missing: bool,
+    progress_cb: Callable[[Dict[str, Any]], None] | None = None,
+) -> Tuple[Callable[[str], Tuple[bool, str | None]], Callable[[str], bool | None] | None]:
+    """
+    (exists, lookup): exists(item_number) может ходить в Hood и выполняется пулом под слотом лимитера;
+    lookup — ответ из снимка в памяти (None — решает exists), для item_detail его нет.
+    """
+    if check_mode == "item_detail":
+        return lambda item_number: _exists_in_hood_by_item_detail(item_number, cfg), None
+
+    def snapshot_progress(progress: Dict[str, Any]) -> None:
+        if progress_cb is not None:
+            progress_cb({**progress, "phase": "loading_hood_snapshot"})
+
+    snapshot = HoodInventorySnapshot.load(cfg, verify_missing=verify_missing, progress_cb=snapshot_progress)
+    return snapshot.exists, snapshot.lookup
+
+
 def split_uploaded_items(
     account: str | None = None,
     json_folder: str | None = None,
     progress_cb: Callable[[Dict[str, Any]], None] | None = None,
+    check_mode: str | None = None,
+    verify_missing: bool = False,
 ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], List[Dict[str, Any]], str]:
     cfg = ApiConfig.from_env(account=account)
+    check_mode = resolve_check_mode(check_mode)
     workers = max(1, min(int(os.environ.get("HOOD_UPLOADED_SPLIT_WORKERS", "8")), 32))
+    adaptive = get_concurrency_limiter(cfg)
+    pool_size = adaptive.max_limit if adaptive is not None else workers
     local_items = load_all_items(json_folder=json_folder)
+    exists_in_hood, lookup = _existence_checker(cfg, check_mode, verify_missing, progress_cb=progress_cb)
     uploaded: List[Dict[str, Any]] = []
     not_uploaded: List[Dict[str, Any]] = []
     warnings: List[Dict[str, Any]] = []
@@ -98,64 +205,80 @@ def split_uploaded_items(
                 "not_uploaded": 0,
                 "warnings_count": len(warnings),
                 "workers": workers,
+                "concurrency": current_limit(adaptive, workers),
             }
         )
 
-    futures_map: Dict[Any, Dict[str, Any]] = {}
-    with ThreadPoolExecutor(max_workers=workers) as executor:
-        for raw in local_items:
-            norm = normalize_item(raw)
-            item_number = _normalize_item_number(norm.get("item_number") or norm.get("ean"))
-            if not item_number:
-                warnings.append(
-                    {
-                        "reason": "missing_item_number",
-                        "local_id": str(raw.get("ID") or raw.get("id") or "").strip() or None,
-                        "factory": _factory_from_raw(raw) or None,
-                    }
-                )
-                not_uploaded.append(_raw_with_factory(raw))
-                continue
-            future = executor.submit(_exists_in_hood_by_item_detail, item_number, cfg)
-            futures_map[future] = {"item_number": item_number, "raw": raw}
-
-        processed = 0
-        for future in as_completed(futures_map):
-            ctx = futures_map[future]
-            item_number = str(ctx["item_number"])
-            raw = ctx["raw"]
-            try:
-                exists, err = future.result()
-            except Exception as exc:
-                exists, err = False, f"worker_error: {exc}"
-
-            if err:
-                warnings.append(
-                    {
-                        "item_number": item_number,
-                        "reason": err,
-                        "factory": _factory_from_raw(raw) or None,
-                    }
-                )
+    checkable: List[Tuple[Dict[str, Any], str]] = []
+    for raw, norm in zip(local_items, normalize_items_cached(local_items, compact=True)):
+        item_number = _normalize_item_number(norm.get("item_number") or norm.get("ean"))
+        if not item_number:
+            warnings.append(
+                {
+                    "reason": "missing_item_number",
+                    "local_id": str(raw.get("ID") or raw.get("id") or "").strip() or None,
+                    "factory": _factory_from_raw(raw) or None,
+                }
+            )
+            not_uploaded.append(_raw_with_factory(raw))
+            continue
+        checkable.append((raw, item_number))
 
-            if exists:
-                uploaded.append(_raw_with_factory(raw, item_number=item_number))
-            else:
-                not_uploaded.append(_raw_with_factory(raw, item_number=item_number))
+    processed = 0
 
-            processed += 1
-            if progress_cb is not None and (processed % 100 == 0 or processed == len(futures_map)):
-                progress_cb(
-                    {
-                        "phase": "checking_items",
-                        "total_items": len(local_items),
-                        "processed_items": processed,
-                        "uploaded": len(uploaded),
-                        "not_uploaded": len(not_uploaded),
-                        "warnings_count": len(warnings),
-                        "workers": workers,
-                    }
-                )
+    def record(raw: Dict[str, Any], item_number: str, exists: bool, err: str | None) -> None:
+        nonlocal processed
+        if err:
+            warnings.append(
+                {
+                    "item_number": item_number,
+                    "reason": err,
+                    "factory": _factory_from_raw(raw) or None,
+                }
+            )
+
+        if exists:
+            uploaded.append(_raw_with_factory(raw, item_number=item_number))
+        else:
+            not_uploaded.append(_raw_with_factory(raw, item_number=item_number))
+
+        processed += 1
+        if progress_cb is not None and (processed % 100 == 0 or processed == len(checkable)):
+            progress_cb(
+                {
+                    "phase": "checking_items",
+                    "total_items": len(local_items),
+                    "processed_items": processed,
+                    "uploaded": len(uploaded),
+                    "not_uploaded": len(not_uploaded),
+                    "warnings_count": len(warnings),
+                    "workers": workers,
+                    "concurrency": current_limit(adaptive, workers),
+                }
+            )
+
+    # Snapshot answers come from memory: only itemDetail requests go through the pool and the limiter.
+    remote: List[Tuple[Dict[str, Any], str]] = []
+    for raw, item_number in checkable:
+        found = lookup(item_number) if lookup is not None else None
+        if found is None:
+            remote.append((raw, item_number))
+        else:
+            record(raw, item_number, found, None)
+
+    if remote:
+        with ThreadPoolExecutor(max_workers=pool_size) as executor:
+            futures_map: Dict[Any, Tuple[Dict[str, Any], str]] = {
+                executor.submit(run_in_slot, adaptive, exists_in_hood, item_number): (raw, item_number)
+                for raw, item_number in remote
+            }
+            for future in as_completed(futures_map):
+                raw, item_number = futures_map[future]
+                try:
+                    exists, err = future.result()
+                except Exception as exc:
+                    exists, err = False, f"worker_error: {exc}"
+                record(raw, item_number, exists, err)
 
     account_suffix = str((account or "default")).strip().lower() or "default"
     not_uploaded_path = os.path.join(settings.LOG_FOLDER, f"not_in_hood_{account_suffix}.json")
@@ -195,8 +318,11 @@ def check_selected_source_files(
     account: str | None = None,
     json_folder: str | None = None,
     progress_cb: Callable[[Dict[str, Any]], None] | None = None,
+    check_mode: str | None = None,
+    verify_missing: bool = False,
 ) -> Dict[str, Any]:
     cfg = ApiConfig.from_env(account=account)
+    check_mode = resolve_check_mode(check_mode)
     workers = max(1, min(int(os.environ.get("HOOD_CHECK_SELECTED_FILES_WORKERS", "8")), 32))
 
     normalized_files: List[str] = []
@@ -217,6 +343,7 @@ def check_selected_source_files(
     total_missing_number = 0
     total_processed_items = 0
     files: List[Dict[str, Any]] = []
+    exists_in_hood, lookup = _existence_checker(cfg, check_mode, verify_missing, progress_cb=progress_cb)
 
     for source_file in normalized_files:
         file_items = load_items_from_source_file(source_file, json_folder=json_folder)
@@ -224,46 +351,54 @@ def check_selected_source_files(
         file_not_uploaded = 0
         file_missing_number = 0
         missing_items: List[Dict[str, Any]] = []
-        futures_map: Dict[Any, Dict[str, Any]] = {}
+        remote: List[Tuple[Dict[str, Any], str]] = []
 
-        with ThreadPoolExecutor(max_workers=workers) as executor:
-            for raw in file_items:
-                norm = normalize_item(raw)
-                item_number = _normalize_item_number(norm.get("item_number") or norm.get("ean"))
-                if not item_number:
-                    file_missing_number += 1
-                    missing_items.append(
-                        {
-                            "id": str(raw.get("ID") or raw.get("id") or "").strip() or None,
-                            "item_number": None,
-                            "factory": str(raw.get("__source_name__") or source_file),
-                            "reason": "missing_item_number",
-                        }
-                    )
-                    continue
-                future = executor.submit(_exists_in_hood_by_item_detail, item_number, cfg)
-                futures_map[future] = {"item_number": item_number, "raw": raw}
+        def record(raw: Dict[str, Any], item_number: str, exists: bool, err: str | None) -> None:
+            nonlocal file_uploaded, file_not_uploaded
+            if exists:
+                file_uploaded += 1
+            else:
+                file_not_uploaded += 1
+                missing_items.append(
+                    {
+                        "id": str(raw.get("ID") or raw.get("id") or "").strip() or None,
+                        "item_number": item_number,
+                        "factory": str(raw.get("__source_name__") or source_file),
+                        "reason": err or "not_found_in_hood",
+                    }
+                )
 
-            for future in as_completed(futures_map):
-                ctx = futures_map[future]
-                raw = ctx["raw"]
-                item_number = str(ctx["item_number"])
-                try:
-                    exists, err = future.result()
-                except Exception as exc:
-                    exists, err = False, f"worker_error: {exc}"
-                if exists:
-                    file_uploaded += 1
-                else:
-                    file_not_uploaded += 1
-                    missing_items.append(
-                        {
-                            "id": str(raw.get("ID") or raw.get("id") or "").strip() or None,
-                            "item_number": item_number,
-                            "factory": str(raw.get("__source_name__") or source_file),
-                            "reason": err or "not_found_in_hood",
-                        }
-                    )
+        for raw, norm in zip(file_items, normalize_items_cached(file_items, compact=True)):
+            item_number = _normalize_item_number(norm.get("item_number") or norm.get("ean"))
+            if not item_number:
+                file_missing_number += 1
+                missing_items.append(
+                    {
+                        "id": str(raw.get("ID") or raw.get("id") or "").strip() or None,
+                        "item_number": None,
+                        "factory": str(raw.get("__source_name__") or source_file),
+                        "reason": "missing_item_number",
+                    }
+                )
+                continue
+            found = lookup(item_number) if lookup is not None else None
+            if found is None:
+                remote.append((raw, item_number))
+            else:
+                record(raw, item_number, found, None)
+
+        if remote:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures_map: Dict[Any, Tuple[Dict[str, Any], str]] = {
+                    executor.submit(exists_in_hood, item_number): (raw, item_number) for raw, item_number in remote
+                }
+                for future in as_completed(futures_map):
+                    raw, item_number = futures_map[future]
+                    try:
+                        exists, err = future.result()
+                    except Exception as exc:
+                        exists, err = False, f"worker_error: {exc}"
+                    record(raw, item_number, exists, err)
 
         file_checkable = len(file_items) - file_missing_number
         files_done += 1
@@ -313,6 +448,7 @@ def check_selected_source_files(
         )
 
     return {
+        "check_mode": check_mode,
         "files_total": files_total,
         "files_done": files_done,
         "processed_items": total_processed_items,
@@ -0,0 +1,182 @@
+"""
+HTML-описания товаров по EAN: файлы <EAN>.html / <EAN>.htm в папке аккаунта.
+Папка сканируется один раз в индекс EAN -> файлы и пересканируется, когда меняется mtime каталога;
+содержимое файлов держится в LRU с ограничением по размеру и перепроверяется по (mtime, size) файла
+при каждом попадании — правка файла на месте не меняет mtime каталога. Вместо строки лога на каждый товар —
+счётчики попаданий/промахов (description_stats).
+"""
+
+import os
+import threading
+from collections import Counter, OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+_HTML_EXTENSIONS = (".html", ".htm")
+
+# (st_mtime_ns, st_size) файла на момент чтения.
+_Stamp = Tuple[int, int]
+
+_PROVIDERS: Dict[str, "HtmlDescriptionProvider"] = {}
+_PROVIDERS_LOCK = threading.Lock()
+_FALLBACKS: Counter = Counter()
+_FALLBACKS_LOCK = threading.Lock()
+
+
+def _record_fallback(reason: str) -> None:
+    with _FALLBACKS_LOCK:
+        _FALLBACKS[reason] += 1
+
+
+class HtmlDescriptionProvider:
+    def __init__(self, folder: str, max_bytes: int) -> None:
+        self.folder = Path(folder)
+        self.max_bytes = max(0, int(max_bytes))
+        self._lock = threading.Lock()
+        self._dir_mtime_ns: int | None = None
+        self._index: Dict[str, List[Path]] = {}
+        # path -> (stamp, размер в байтах, текст)
+        self._cache: "OrderedDict[Path, Tuple[_Stamp, int, str]]" = OrderedDict()
+        self._cache_bytes = 0
+        self._counters: Counter = Counter()
+
+    def _refresh_index_locked(self) -> bool:
+        try:
+            mtime_ns = self.folder.stat().st_mtime_ns
+        except OSError:
+            self._index = {}
+            self._dir_mtime_ns = None
+            return False
+        if mtime_ns == self._dir_mtime_ns:
+            return True
+
+        index: Dict[str, List[Path]] = {}
+        with os.scandir(self.folder) as entries:
+            for entry in entries:
+                stem, ext = os.path.splitext(entry.name)
+                if ext in _HTML_EXTENSIONS and entry.is_file():
+                    index.setdefault(stem, []).append(Path(entry.path))
+        for paths in index.values():
+            # Как и раньше: сначала .html, потом .htm.
+            paths.sort(key=lambda p: _HTML_EXTENSIONS.index(p.suffix))
+        self._index = index
+        self._dir_mtime_ns = mtime_ns
+        self._cache.clear()
+        self._cache_bytes = 0
+        self._counters["index_rebuilds"] += 1
+        return True
+
+    def _forget_locked(self, path: Path) -> None:
+        entry = self._cache.pop(path, None)
+        if entry is not None:
+            self._cache_bytes -= entry[1]
+
+    def _remember_locked(self, path: Path, stamp: _Stamp, text: str) -> None:
+        # Два потока могли промахнуться по одному файлу: старую запись вычитаем, а не затираем.
+        self._forget_locked(path)
+        size = len(text.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        self._cache[path] = (stamp, size, text)
+        self._cache_bytes += size
+        while self._cache_bytes > self.max_bytes and self._cache:
+            _, (_, evicted_size, _) = self._cache.popitem(last=False)
+            self._cache_bytes -= evicted_size
+            self._counters["cache_evictions"] += 1
+
+    @staticmethod
+    def _stamp(path: Path) -> _Stamp | None:
+        try:
+            st = path.stat()
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    @staticmethod
+    def _read(path: Path) -> str | None:
+        try:
+            return path.read_text(encoding="utf-8").strip()
+        except UnicodeDecodeError:
+            return path.read_text(encoding="utf-8-sig", errors="ignore").strip()
+        except OSError:
+            return None
+
+    def get(self, ean: str) -> str | None:
+        with self._lock:
+            if not self._refresh_index_locked():
+                self._counters["folder_missing"] += 1
+                return None
+            paths = list(self._index.get(ean) or [])
+            if not paths:
+                self._counters["index_misses"] += 1
+                return None
+            self._counters["index_hits"] += 1
+
+        for path in paths:
+            stamp = self._stamp(path)
+            with self._lock:
+                entry = self._cache.get(path)
+                if entry is not None:
+                    if stamp is not None and entry[0] == stamp:
+                        self._cache.move_to_end(path)
+                        self._counters["cache_hits"] += 1
+                        return entry[2]
+                    self._forget_locked(path)
+                    self._counters["cache_stale"] += 1
+            if stamp is None:
+                continue
+            text = self._read(path)
+            if text:
+                with self._lock:
+                    self._counters["cache_misses"] += 1
+                    self._remember_locked(path, stamp, text)
+                return text
+        with self._lock:
+            self._counters["empty_or_unreadable"] += 1
+        return None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "indexed_eans": len(self._index),
+                "cached_files": len(self._cache),
+                "cached_bytes": self._cache_bytes,
+                "max_bytes": self.max_bytes,
+                **dict(self._counters),
+            }
+
+
+def get_description_provider(html_folder: str) -> HtmlDescriptionProvider:
+    key = str(Path(html_folder))
+    with _PROVIDERS_LOCK:
+        provider = _PROVIDERS.get(key)
+        if provider is None:
+            max_mb = float(os.environ.get("HOOD_HTML_CACHE_MAX_MB", "64"))
+            provider = HtmlDescriptionProvider(key, max_bytes=int(max_mb * 1024 * 1024))
+            _PROVIDERS[key] = provider
+        return provider
+
+
+def lookup_html_description(html_folder: str | None, ean: str) -> str | None:
+    """HTML-описание по EAN или None (причина попадает в счётчики fallback)."""
+    if not ean:
+        _record_fallback("no_ean")
+        return None
+    if not (html_folder or "").strip():
+        _record_fallback("html_path_not_configured")
+        return None
+    html_text = get_description_provider(html_folder).get(ean)
+    if html_text is None:
+        _record_fallback("file_not_found")
+    return html_text
+
+
+def description_stats() -> Dict[str, Any]:
+    with _PROVIDERS_LOCK:
+        providers = dict(_PROVIDERS)
+    with _FALLBACKS_LOCK:
+        fallbacks = dict(_FALLBACKS)
+    return {
+        "fallbacks": fallbacks,
+        "folders": {folder: provider.stats() for folder, provider in providers.items()},
+    }
@@ -3,13 +3,15 @@ import json
 import os
 import re
 import threading
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, as_completed, wait
 from datetime import datetime, timezone
+from functools import partial
 from pathlib import Path
 from typing import Any, Callable, Dict, List, Tuple
 from uuid import uuid4
 
 from fastapi import APIRouter, BackgroundTasks, Body, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
 from app.config import (
@@ -21,12 +23,15 @@ from app.config import (
 )
 from app.logger import get_logger
 from hood_api.config import ApiConfig
-from hood_api.client import send_request
+from hood_api.client import AsyncHoodClient, send_request
+from hood_api.concurrency import concurrency_stats, current_limit, get_concurrency_limiter, run_in_slot
+from hood_api.ratelimit import rate_limiter_stats
 from hood_api.builders import (
     build_item_delete,
     build_item_detail,
     build_item_insert,
     build_item_list,
+    build_item_price_update,
     build_item_status,
     build_item_update,
     build_item_validate,
@@ -42,26 +47,54 @@ from hood_api.api.parsers import (
 )
 from app.items.prices import load_prices
 from app.items.storage import (
+    find_item,
     list_json_source_files,
     load_all_items,
     load_items_from_source_file,
 )
-from app.items.crud import check_selected_source_files, split_uploaded_items
-from app.items.utils import normalize_item
+from app.items.crud import check_selected_source_files, resolve_check_mode, snapshot_statuses, split_uploaded_items
+from app.items.checkpoints import JobCheckpoint, checkpoint_counts, drop_checkpoints
+from app.items.descriptions import description_stats, lookup_html_description
+from app.items.fingerprints import (
+    PRICE_UPDATE_MODES,
+    UPDATE_MODES,
+    record_fingerprints,
+    record_prices,
+    resolve_update_mode,
+    split_unchanged_payloads,
+    split_unchanged_prices,
+)
+from app.items.hood_inventory import iter_hood_items_tail_first
+from app.items.job_events import job_event, job_event_stream
+from app.items.jobs import JOB_KINDS, get_job, list_jobs, set_job
+from app.items.ndjson_stream import ndjson_stream_response, resolve_stream_mode
+from app.items.result_sink import ResultSink, read_result_page
+from app.items.hood_mirror import (
+    clear_hood_status,
+    ensure_hood_mirror,
+    find_hood_items_by_reference,
+    forget_hood_items,
+    hood_item_number_to_ids,
+    hood_mirror_stats,
+    mirror_item_ids,
+    refresh_hood_mirror,
+    remember_hood_items,
+)
+from app.items.normalize_cache import normalize_cache_stats, normalize_item_cached, normalize_items_cached
+from app.items.prep_pipeline import (
+    PrepPipeline,
+    prep_chunk_size,
+    prep_pipeline_stats,
+    render_insert_bodies,
+    render_update_bodies,
+)
+from app.items.utils import NormalizedItem
 
 router = APIRouter()
 logger = get_logger("items")
 
 # Р¤Р°Р№Р», РєСѓРґР° Р±СѓРґРµРј СЃРєР»Р°РґС‹РІР°С‚СЊ С‚РѕРІР°СЂС‹, РЅРµ Р·Р°РіСЂСѓР·РёРІС€РёРµСЃСЏ РІ Hood
 FAILED_ITEMS_PATH = Path(settings.LOG_FOLDER).resolve() / "failed_items.json"
-UPDATE_JOBS: Dict[str, Dict[str, Any]] = {}
-UPDATE_JOBS_LOCK = threading.Lock()
-UPLOAD_JOBS: Dict[str, Dict[str, Any]] = {}
-UPLOAD_JOBS_LOCK = threading.Lock()
-DELETE_JOBS: Dict[str, Dict[str, Any]] = {}
-DELETE_JOBS_LOCK = threading.Lock()
-SPLIT_JOBS: Dict[str, Dict[str, Any]] = {}
-SPLIT_JOBS_LOCK = threading.Lock()
 DELETE_ALL_STATUSES: tuple[str, ...] = ("running", "sold", "unsuccessful")
 
 
@@ -72,6 +105,27 @@ def _account_mode(account: str | None) -> str | None:
         raise HTTPException(status_code=400, detail=str(exc))
 
 
+def _update_mode(mode: str | None, allowed: Tuple[str, ...] = UPDATE_MODES) -> str:
+    try:
+        return resolve_update_mode(mode, allowed=allowed)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+
+def _stream_mode(stream: str | None) -> bool:
+    try:
+        return resolve_stream_mode(stream)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+
+def _check_mode(check_mode: str | None) -> str:
+    try:
+        return resolve_check_mode(check_mode)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+
 def _resolve_delete_all_statuses(item_status: str | None) -> List[str]:
     raw = str(item_status or "").strip().lower()
     if raw in ("", "all", "*"):
@@ -93,121 +147,18 @@ def _resolve_delete_all_statuses(item_status: str | None) -> List[str]:
     return list(dict.fromkeys(tokens))
 
 
-def _load_all_hood_items(
-    cfg: ApiConfig,
-    item_status: str = "running",
-    group_size: int = 500,
-    progress_cb: Callable[[Dict[str, Any]], None] | None = None,
-) -> List[Dict[str, Any]]:
-    items: List[Dict[str, Any]] = []
-    start_at = 1
-
-    while True:
-        xml_body = build_item_list(
-            item_status=item_status,
-            start_at=start_at,
-            group_size=group_size,
-            start_date=None,
-            end_date=None,
-            config=cfg,
-        )
-        try:
-            response_xml = send_request(xml_body, config=cfg)
-        except Exception as exc:
-            raise HTTPException(status_code=502, detail=str(exc))
-
-        page = parse_item_list_response(response_xml)
-        if page.get("errors"):
-            raise HTTPException(
-                status_code=502,
-                detail={"message": page.get("message"), "errors": page.get("errors")},
-            )
-
-        page_items = page.get("items", [])
-        items.extend(page_items)
-        total_records = int(page.get("total_records") or 0)
-        if progress_cb is not None:
-            progress_cb(
-                {
-                    "phase": "loading_items",
-                    "fetched_items": len(items),
-                    "total_items": total_records if total_records > 0 else None,
-                    "start_at": int(page.get("start_at") or start_at),
-                    "group_size": int(page.get("group_size") or len(page_items) or group_size),
-                }
-            )
-
-        if not page_items:
-            break
-        if total_records and len(items) >= total_records:
-            break
-        # Hood can cap groupSize in response; use the effective page size for pagination.
-        effective_group_size = int(page.get("group_size") or 0)
-        step = effective_group_size if effective_group_size > 0 else len(page_items)
-        if len(page_items) < step:
-            break
-
-        start_at += step
-
-    return items
-
-
-def _resolve_description_for_api(norm: Dict[str, Any], html_folder: str | None = None) -> str:
+def _resolve_description_for_api(norm: Dict[str, Any] | NormalizedItem, html_folder: str | None = None) -> str:
     """
     Р”Р»СЏ API РѕС‚РїСЂР°РІР»СЏРµРј HTML-РѕРїРёСЃР°РЅРёРµ РїРѕ EAN, РµСЃР»Рё РЅР°Р№РґРµРЅ С„Р°Р№Р» <EAN>.html/.htm.
     Р•СЃР»Рё С„Р°Р№Р»Р° РЅРµС‚ РёР»Рё С‡С‚РµРЅРёРµ РЅРµ СѓРґР°Р»РѕСЃСЊ, РѕС‚РїСЂР°РІР»СЏРµРј РѕР±С‹С‡РЅС‹Р№ description.
     """
     fallback = str(norm.get("description") or "")
-    reference_id = str(norm.get("reference_id") or "")
     raw_ean = str(norm.get("ean") or "").strip()
     ean = raw_ean[:-2] if raw_ean.endswith(".0") else raw_ean
     ean = re.sub(r"\s+", "", ean)
-    if not ean:
-        logger.info(
-            "HTML description source: fallback description (reason=no_ean, reference_id=%s)",
-            reference_id or "?",
-        )
-        return fallback
-
-    candidate_dirs = []
-    if (html_folder or "").strip():
-        candidate_dirs.append(Path(html_folder))
-    if not candidate_dirs:
-        logger.info(
-            "HTML description source: fallback description (reason=html_path_not_configured, reference_id=%s, ean=%s)",
-            reference_id or "?",
-            ean,
-        )
-        return fallback
-
-    for html_dir in candidate_dirs:
-        if not html_dir.exists() or not html_dir.is_dir():
-            continue
-        for ext in (".html", ".htm"):
-            html_file = html_dir / f"{ean}{ext}"
-            if not html_file.exists():
-                continue
-            try:
-                html_text = html_file.read_text(encoding="utf-8").strip()
-            except UnicodeDecodeError:
-                html_text = html_file.read_text(encoding="utf-8-sig", errors="ignore").strip()
-            except OSError:
-                continue
-            if html_text:
-                logger.info(
-                    "HTML description source: file=%s (reference_id=%s, ean=%s)",
-                    html_file,
-                    reference_id or "?",
-                    ean,
-                )
-                return html_text
-
-    logger.info(
-        "HTML description source: fallback description (reason=file_not_found, reference_id=%s, ean=%s)",
-        reference_id or "?",
-        ean,
-    )
-    return fallback
+    # Index + LRU per HTML folder; hit/miss counters are exposed via /items/api_stats.
+    html_text = lookup_html_description(html_folder, ean)
+    return html_text if html_text else fallback
 
 
 @router.get("/json")
@@ -237,7 +188,7 @@ def items_from_json(
 
     total = len(all_items)
     chunk = all_items[offset : offset + limit]
-    items = [normalize_item(x) for x in chunk] if normalized else chunk
+    items = normalize_items_cached(chunk) if normalized else chunk
     return {
         "total": total,
         "offset": offset,
@@ -336,22 +287,24 @@ def lookup_in_hood(reference_id: str, account: str | None = Query(default=None))
     """
     account_mode = _account_mode(account)
     cfg = ApiConfig.from_env(account=account_mode)
-    xml_body = build_item_list(
-        item_status="running",
-        start_at=1,
-        group_size=500,
-        start_date=None,
-        end_date=None,
-        config=cfg,
-    )
-    try:
-        response_xml = send_request(xml_body, config=cfg)
-    except Exception as exc:
-        raise HTTPException(status_code=502, detail=str(exc))
+    found = find_hood_items_by_reference(cfg, reference_id, item_status="running")
+    if found is None:
+        xml_body = build_item_list(
+            item_status="running",
+            start_at=1,
+            group_size=500,
+            start_date=None,
+            end_date=None,
+            config=cfg,
+        )
+        try:
+            response_xml = send_request(xml_body, config=cfg)
+        except Exception as exc:
+            raise HTTPException(status_code=502, detail=str(exc))
 
-    data = parse_item_list_response(response_xml)
-    items = data.get("items", [])
-    found = [it for it in items if it.get("referenceID") == reference_id]
+        data = parse_item_list_response(response_xml)
+        items = data.get("items", [])
+        found = [it for it in items if it.get("referenceID") == reference_id]
     if not found:
         raise HTTPException(status_code=404, detail="Item with this reference_id not found in Hood")
     # РµСЃР»Рё РЅРµСЃРєРѕР»СЊРєРѕ вЂ” РІРµСЂРЅС‘Рј РІСЃРµ, РЅРѕ С‡Р°С‰Рµ РІСЃРµРіРѕ Р±СѓРґРµС‚ РѕРґРёРЅ
@@ -363,15 +316,7 @@ def _find_raw_item_by_id(
     source_file: str | None = None,
     json_folder: str | None = None,
 ) -> Dict[str, Any] | None:
-    source_items = (
-        load_items_from_source_file(source_file, json_folder=json_folder)
-        if source_file
-        else load_all_items(json_folder=json_folder)
-    )
-    for it in source_items:
-        if str(it.get("ID", "")) == str(item_id):
-            return it
-    return None
+    return find_item(json_folder=json_folder, source_file=source_file, item_id=item_id)
 
 
 def _extract_internal_id_from_reference(reference_id: str) -> str | None:
@@ -392,23 +337,13 @@ def _find_raw_item_for_hood_item(hood_item: Dict[str, Any], json_folder: str) ->
         if found:
             return found
 
-    for raw in load_all_items(json_folder=json_folder):
-        raw_id = str(raw.get("ID") or "").strip()
-        raw_reference_id = str(raw.get("reference_id") or "").strip()
-        raw_item_number = str(raw.get("item_number") or raw.get("ItemNumber") or "").strip()
-        raw_ean = str(raw.get("EAN") or raw.get("ean") or "").strip()
-
-        if hood_reference_id and raw_reference_id and raw_reference_id == hood_reference_id:
-            return raw
-        if hood_item_number and (
-            (raw_item_number and raw_item_number == hood_item_number)
-            or (raw_ean and raw_ean == hood_item_number)
-        ):
-            return raw
-        if hood_item_id and raw_id and raw_id == hood_item_id:
-            return raw
-
-    return None
+    return find_item(
+        json_folder=json_folder,
+        item_id=hood_item_id,
+        ean=hood_item_number,
+        item_number=hood_item_number,
+        reference_id=hood_reference_id,
+    )
 
 
 _ITEM_NOT_FOUND_MARKER = "artikel nicht gefunden"
@@ -450,7 +385,7 @@ def _exists_in_hood(item_number: str, cfg: ApiConfig) -> Tuple[bool, bool, str |
     return False, True, "itemDetail returned no items"
 
 
-def _build_item_payload_from_norm(norm: Dict[str, Any], api_description: str) -> Dict[str, Any]:
+def _build_item_payload_from_norm(norm: Dict[str, Any] | NormalizedItem, api_description: str) -> Dict[str, Any]:
     return {
         "reference_id": norm["reference_id"],
         "title": norm["item_name"],
@@ -477,31 +412,19 @@ def _utc_now_iso() -> str:
 
 
 def _set_update_job(job_id: str, patch: Dict[str, Any]) -> None:
-    with UPDATE_JOBS_LOCK:
-        current = UPDATE_JOBS.get(job_id, {})
-        current.update(patch)
-        UPDATE_JOBS[job_id] = current
+    set_job("update", job_id, patch)
 
 
 def _set_upload_job(job_id: str, patch: Dict[str, Any]) -> None:
-    with UPLOAD_JOBS_LOCK:
-        current = UPLOAD_JOBS.get(job_id, {})
-        current.update(patch)
-        UPLOAD_JOBS[job_id] = current
+    set_job("upload", job_id, patch)
 
 
 def _set_delete_job(job_id: str, patch: Dict[str, Any]) -> None:
-    with DELETE_JOBS_LOCK:
-        current = DELETE_JOBS.get(job_id, {})
-        current.update(patch)
-        DELETE_JOBS[job_id] = current
+    set_job("delete", job_id, patch)
 
 
 def _set_split_job(job_id: str, patch: Dict[str, Any]) -> None:
-    with SPLIT_JOBS_LOCK:
-        current = SPLIT_JOBS.get(job_id, {})
-        current.update(patch)
-        SPLIT_JOBS[job_id] = current
+    set_job("split", job_id, patch)
 
 
 def _is_item_number_ambiguous_error(parsed: Dict[str, Any]) -> bool:
@@ -531,9 +454,38 @@ def _delete_by_item_number(cfg: ApiConfig, item_number: str) -> Dict[str, Any]:
         }
     parsed = parse_item_delete_response(delete_resp_xml)
     parsed["item_number"] = item_number
+    _forget_deleted_in_mirror(cfg, parsed, [item_number])
     return parsed
 
 
+def _forget_deleted_in_mirror(
+    cfg: ApiConfig,
+    parsed: Dict[str, Any],
+    requested_item_numbers: List[str] | None = None,
+    requested_item_ids: List[str] | None = None,
+) -> None:
+    item_results = parsed.get("items") or []
+    if item_results:
+        deleted_rows = [x for x in item_results if str(x.get("status") or "").lower() == "success"]
+        forget_hood_items(
+            cfg,
+            item_ids=[x.get("item_id") for x in deleted_rows if x.get("item_id")],
+            item_numbers=[x.get("item_number") for x in deleted_rows if x.get("item_number")],
+        )
+    elif parsed.get("success"):
+        forget_hood_items(cfg, item_ids=requested_item_ids or [], item_numbers=requested_item_numbers or [])
+
+
+def _remember_inserted_in_mirror(cfg: ApiConfig, resp: Dict[str, Any], item_number: Any) -> None:
+    # Until the next refresh the mirror would not know the new item and upload_all_missing would send it again.
+    item_id = str(resp.get("item_id") or "").strip()
+    if resp.get("success") and item_id:
+        remember_hood_items(
+            cfg,
+            [{"itemID": item_id, "itemNumber": item_number, "referenceID": resp.get("reference_id")}],
+        )
+
+
 def _cleanup_duplicate_item_number(
     cfg: ApiConfig,
     item_number: str,
@@ -557,18 +509,7 @@ def _get_item_number_to_ids_map(cfg: ApiConfig, cache: Dict[str, Any]) -> Dict[s
     cached = cache.get("item_number_to_ids")
     if cached is not None:
         return cached
-    hood_items = _load_all_hood_items(cfg=cfg, item_status="running", group_size=500)
-    mapping: Dict[str, List[str]] = {}
-    for it in hood_items:
-        item_number = str(it.get("itemNumber") or "").strip()
-        item_id = str(it.get("itemID") or "").strip()
-        if not item_number or not item_id:
-            continue
-        if item_number not in mapping:
-            mapping[item_number] = [item_id]
-            continue
-        if item_id not in mapping[item_number]:
-            mapping[item_number].append(item_id)
+    mapping = hood_item_number_to_ids(cfg, item_status="running")
     cache["item_number_to_ids"] = mapping
     return mapping
 
@@ -646,6 +587,7 @@ def _delete_one_item_number_by_item_ids(
         else:
             failed_item_ids.extend(chunk)
 
+    forget_hood_items(cfg, item_ids=deleted_item_ids)
     success = len(failed_item_ids) == 0 and len(deleted_item_ids) > 0
     if success:
         mapping[item_number] = []
@@ -686,9 +628,13 @@ def _send_update_chunk_with_duplicate_cleanup(
     chunk: List[Dict[str, Any]],
     cfg: ApiConfig,
     cache: Dict[str, Any],
+    build_xml: Callable[..., str] = build_item_update,
+    xml_update: str | None = None,
 ) -> Dict[str, Any]:
+    """xml_update — тело чанка, заранее собранное PrepPipeline; одиночные повторы собираются здесь."""
     chunk_numbers = [str(x.get("item_number") or x.get("ean") or "").strip() for x in chunk]
-    xml_update = build_item_update(items=chunk, config=cfg)
+    if xml_update is None:
+        xml_update = build_xml(items=chunk, config=cfg)
     try:
         resp_xml = send_request(xml_update, config=cfg)
         parsed = parse_item_update_response(resp_xml)
@@ -697,11 +643,17 @@ def _send_update_chunk_with_duplicate_cleanup(
 
     parsed["item_numbers"] = chunk_numbers
     if parsed.get("success"):
-        return {"details": [parsed], "updated": len(chunk_numbers), "failed": 0}
+        return {
+            "details": [parsed],
+            "updated": len(chunk_numbers),
+            "failed": 0,
+            "updated_item_numbers": chunk_numbers,
+        }
 
     details: List[Dict[str, Any]] = [parsed]
     updated = 0
     failed = 0
+    updated_item_numbers: List[str] = []
 
     # Fast path for non-ambiguous failures: count per-item results if provided.
     if not _is_item_number_ambiguous_error(parsed):
@@ -717,11 +669,17 @@ def _send_update_chunk_with_duplicate_cleanup(
                 status = by_number.get(num, "")
                 if status == "success":
                     updated += 1
+                    updated_item_numbers.append(num)
                 else:
                     failed += 1
         else:
             failed = len(chunk_numbers)
-        return {"details": details, "updated": updated, "failed": failed}
+        return {
+            "details": details,
+            "updated": updated,
+            "failed": failed,
+            "updated_item_numbers": updated_item_numbers,
+        }
 
     # Ambiguous case: isolate bad rows with single-item retries.
     for payload in chunk:
@@ -739,7 +697,7 @@ def _send_update_chunk_with_duplicate_cleanup(
             )
             continue
 
-        single_xml = build_item_update(items=[payload], config=cfg)
+        single_xml = build_xml(items=[payload], config=cfg)
         try:
             single_resp_xml = send_request(single_xml, config=cfg)
             single_parsed = parse_item_update_response(single_resp_xml)
@@ -750,6 +708,7 @@ def _send_update_chunk_with_duplicate_cleanup(
         if single_parsed.get("success"):
             details.append(single_parsed)
             updated += 1
+            updated_item_numbers.append(item_number)
             continue
 
         if not _is_item_number_ambiguous_error(single_parsed):
@@ -758,7 +717,7 @@ def _send_update_chunk_with_duplicate_cleanup(
             continue
 
         cleanup_info = _cleanup_duplicate_item_number(cfg=cfg, item_number=item_number, cache=cache)
-        retry_xml = build_item_update(items=[payload], config=cfg)
+        retry_xml = build_xml(items=[payload], config=cfg)
         try:
             retry_resp_xml = send_request(retry_xml, config=cfg)
             retry_parsed = parse_item_update_response(retry_resp_xml)
@@ -772,10 +731,232 @@ def _send_update_chunk_with_duplicate_cleanup(
         details.append(retry_parsed)
         if retry_parsed.get("success"):
             updated += 1
+            updated_item_numbers.append(item_number)
         else:
             failed += 1
 
-    return {"details": details, "updated": updated, "failed": failed}
+    return {
+        "details": details,
+        "updated": updated,
+        "failed": failed,
+        "updated_item_numbers": updated_item_numbers,
+    }
+
+
+def _collect_details(
+    details: List[Dict[str, Any]],
+    sink: ResultSink | None,
+    chunk_details: List[Dict[str, Any]],
+) -> None:
+    if sink is not None:
+        sink.add_many(chunk_details)
+    else:
+        details.extend(chunk_details)
+
+
+def _collect_result(
+    results: List[Dict[str, Any]],
+    sink: ResultSink | None,
+    record: Dict[str, Any],
+    success: bool | None = None,
+) -> None:
+    if sink is not None:
+        sink.add(record, success=success)
+    else:
+        results.append(record)
+
+
+def _checkpoint_update_chunk(
+    checkpoint: JobCheckpoint | None,
+    chunk_ids: List[str],
+    chunk_result: Dict[str, Any],
+) -> None:
+    if checkpoint is None:
+        return
+    updated = set(chunk_result.get("updated_item_numbers") or [])
+    checkpoint.record_many((number, number in updated, None) for number in chunk_ids)
+
+
+def _record_updated_chunk(
+    cfg: ApiConfig,
+    chunk: List[Dict[str, Any]],
+    chunk_result: Dict[str, Any],
+    fingerprints: Dict[str, str] | None,
+) -> None:
+    # Per chunk, so a crashed or restarted job keeps delta/price state for everything already sent.
+    updated_item_numbers = chunk_result.get("updated_item_numbers") or []
+    if fingerprints is None or not updated_item_numbers:
+        return
+    record_fingerprints(cfg, fingerprints, updated_item_numbers)
+    record_prices(cfg, chunk, updated_item_numbers)
+
+
+def _run_update_chunks(
+    chunks: List[List[Dict[str, Any]]],
+    cfg: ApiConfig,
+    workers: int,
+    failed: int = 0,
+    progress_cb: Callable[[Dict[str, Any]], None] | None = None,
+    build_xml: Callable[..., str] = build_item_update,
+    checkpoint: JobCheckpoint | None = None,
+    sink: ResultSink | None = None,
+    fingerprints: Dict[str, str] | None = None,
+) -> Dict[str, Any]:
+    """
+    Отправляет чанки itemUpdate (последовательно или пулом workers / AIMD) с progress.
+    build_xml — построитель XML чанка (полный itemUpdate или только цены).
+    checkpoint — итог каждого itemNumber записывается в чекпоинт задачи (для resume).
+    fingerprints — после каждого чанка сохраняются отпечатки и цены успешно обновлённых товаров (mode=delta/price).
+    sink — details уходят в файл итогов задачи, в ответе остаётся только выборка неудач.
+    """
+    details: List[Dict[str, Any]] = []
+    updated = 0
+    updated_item_numbers: List[str] = []
+    total_chunks = len(chunks)
+    total_items = sum(len(chunk) for chunk in chunks)
+    duplicate_cleanup_cache: Dict[str, Any] = {}
+    # With adaptive concurrency the pool is sized to the AIMD ceiling and the shared limiter
+    # decides how many chunks are actually in flight.
+    adaptive = get_concurrency_limiter(cfg)
+    pool_size = adaptive.max_limit if adaptive is not None else workers
+
+    # XML bodies are rendered ahead by the prep pipeline (process pool) while earlier chunks are on the wire.
+    prepared = PrepPipeline(
+        chunks,
+        partial(render_update_bodies, build_xml=build_xml),
+        cfg,
+        chunk_size=prep_chunk_size(per_unit=5),
+    )
+    try:
+        if pool_size <= 1 or total_chunks <= 1:
+            idx = 0
+            while (batch := prepared.next_batch()) is not None:
+                for chunk, xml_update in batch:
+                    idx += 1
+                    chunk_ids = [str(x.get("item_number") or x.get("ean") or "") for x in chunk]
+                    chunk_result = _send_update_chunk_with_duplicate_cleanup(
+                        chunk=chunk,
+                        cfg=cfg,
+                        cache=duplicate_cleanup_cache,
+                        build_xml=build_xml,
+                        xml_update=xml_update,
+                    )
+                    _collect_details(details, sink, chunk_result["details"])
+                    updated += int(chunk_result["updated"])
+                    failed += int(chunk_result["failed"])
+                    updated_item_numbers.extend(chunk_result["updated_item_numbers"])
+                    _checkpoint_update_chunk(checkpoint, chunk_ids, chunk_result)
+                    _record_updated_chunk(cfg, chunk, chunk_result, fingerprints)
+                    last_detail = chunk_result["details"][-1] if chunk_result["details"] else {}
+
+                    if progress_cb is not None:
+                        progress_cb(
+                            {
+                                "phase": "updating",
+                                "total_chunks": total_chunks,
+                                "processed_chunks": idx,
+                                "total_items": total_items,
+                                "processed_items": min(idx * 5, total_items),
+                                "updated": updated,
+                                "failed": failed,
+                                "workers": workers,
+                                "concurrency": current_limit(adaptive, workers),
+                                "last_chunk_item_numbers": chunk_ids,
+                                "last_chunk_success": bool(last_detail.get("success")),
+                                "last_chunk_status": last_detail.get("status"),
+                                "last_chunk_message": last_detail.get("message"),
+                                "last_chunk_errors": last_detail.get("errors") or [],
+                            }
+                        )
+        else:
+            # Parallel chunk updates to speed up long runs.
+            # NOTE: duplicate_cleanup_cache isn't thread-safe; each worker uses its own local cache.
+            progress_lock = threading.Lock()
+            processed_chunks = 0
+            processed_items = 0
+
+            def collect(future: Future, meta: Dict[str, Any]) -> None:
+                nonlocal updated, failed, processed_chunks, processed_items
+                chunk_ids = meta.get("chunk_ids") or []
+                chunk_size = int(meta.get("chunk_size") or 0)
+                chunk_result = future.result()
+                last_detail = chunk_result["details"][-1] if chunk_result.get("details") else {}
+
+                with progress_lock:
+                    _collect_details(details, sink, chunk_result.get("details") or [])
+                    updated += int(chunk_result.get("updated") or 0)
+                    failed += int(chunk_result.get("failed") or 0)
+                    updated_item_numbers.extend(chunk_result.get("updated_item_numbers") or [])
+                    processed_chunks += 1
+                    processed_items += chunk_size
+                _checkpoint_update_chunk(checkpoint, chunk_ids, chunk_result)
+                _record_updated_chunk(cfg, meta["chunk"], chunk_result, fingerprints)
+
+                if progress_cb is not None:
+                    progress_cb(
+                        {
+                            "phase": "updating",
+                            "total_chunks": total_chunks,
+                            "processed_chunks": processed_chunks,
+                            "total_items": total_items,
+                            "processed_items": min(processed_items, total_items),
+                            "updated": updated,
+                            "failed": failed,
+                            "workers": workers,
+                            "concurrency": current_limit(adaptive, workers),
+                            "last_chunk_item_numbers": chunk_ids,
+                            "last_chunk_success": bool(last_detail.get("success")),
+                            "last_chunk_status": last_detail.get("status"),
+                            "last_chunk_message": last_detail.get("message"),
+                            "last_chunk_errors": last_detail.get("errors") or [],
+                        }
+                    )
+
+            with ThreadPoolExecutor(max_workers=pool_size) as executor:
+                future_meta: Dict[Any, Dict[str, Any]] = {}
+                # Bounded in-flight window: rendered bodies wait in the prep queue, not in the executor backlog.
+                max_in_flight = pool_size * 2
+                try:
+                    while (batch := prepared.next_batch()) is not None:
+                        for chunk, xml_update in batch:
+                            if len(future_meta) >= max_in_flight:
+                                done, _ = wait(list(future_meta.keys()), return_when=FIRST_COMPLETED)
+                                for future in done:
+                                    collect(future, future_meta.pop(future))
+                            # Each worker gets its own cache to avoid cross-thread mutation.
+                            future = executor.submit(
+                                run_in_slot,
+                                adaptive,
+                                _send_update_chunk_with_duplicate_cleanup,
+                                chunk,
+                                cfg,
+                                {},
+                                build_xml,
+                                xml_update,
+                            )
+                            future_meta[future] = {
+                                "chunk": chunk,
+                                "chunk_ids": [str(x.get("item_number") or x.get("ean") or "") for x in chunk],
+                                "chunk_size": len(chunk),
+                            }
+
+                    for future in as_completed(list(future_meta.keys())):
+                        collect(future, future_meta.pop(future))
+                except BaseException:
+                    # Consumer gave up (stream client disconnected, job crashed): don't send queued chunks.
+                    for future in future_meta:
+                        future.cancel()
+                    raise
+    finally:
+        prepared.close()
+
+    return {
+        "details": sink.failures_sample() if sink is not None else details,
+        "updated": updated,
+        "failed": failed,
+        "updated_item_numbers": updated_item_numbers,
+        "concurrency": current_limit(adaptive, workers),
+    }
 
 
 def _run_items_update(
@@ -784,8 +965,12 @@ def _run_items_update(
     account: str | None,
     workers: int = 1,
     progress_cb: Callable[[Dict[str, Any]], None] | None = None,
+    mode: str = "full",
+    checkpoint: JobCheckpoint | None = None,
+    sink: ResultSink | None = None,
 ) -> Dict[str, Any]:
     account_mode = _account_mode(account)
+    mode = resolve_update_mode(mode)
     cfg = ApiConfig.from_env(account=account_mode)
     json_folder = get_json_folder_for_account(account_mode)
     html_folder = get_html_folder_for_account(account_mode)
@@ -796,7 +981,7 @@ def _run_items_update(
         else load_all_items(json_folder=json_folder)
     )
 
-    norms: List[Dict[str, Any]] = [normalize_item(raw) for raw in source_items]
+    norms: List[NormalizedItem] = normalize_items_cached(source_items, compact=True)
     if limit > 0:
         norms = norms[:limit]
 
@@ -820,130 +1005,79 @@ def _run_items_update(
         payload["item_number"] = item_number
         update_payloads.append(payload)
 
+    prepared_count = len(update_payloads)
+    resumed_done = 0
+    if checkpoint is not None and checkpoint.done_keys:
+        # Resumed job: items already updated by an earlier run of this job are not sent again.
+        update_payloads = [p for p in update_payloads if p["item_number"] not in checkpoint.done_keys]
+        resumed_done = prepared_count - len(update_payloads)
+    # mode=delta: items whose payload matches the last successful update are not sent again.
+    update_payloads, unchanged, fingerprints = split_unchanged_payloads(cfg, update_payloads, mode)
+
     chunks = [update_payloads[i : i + 5] for i in range(0, len(update_payloads), 5)]
-    details: List[Dict[str, Any]] = []
-    updated = 0
     failed = len(skipped)
     total_chunks = len(chunks)
     total_items = len(update_payloads)
-    duplicate_cleanup_cache: Dict[str, Any] = {}
+    adaptive = get_concurrency_limiter(cfg)
 
     if progress_cb is not None:
         progress_cb(
             {
                 "phase": "prepared",
                 "requested": len(norms),
-                "prepared": total_items,
+                "prepared": prepared_count,
+                "sent": total_items,
                 "skipped": len(skipped),
+                "unchanged": len(unchanged),
+                "resumed_done": resumed_done,
+                "mode": mode,
                 "total_chunks": total_chunks,
                 "processed_chunks": 0,
                 "processed_items": 0,
                 "updated": 0,
                 "failed": failed,
                 "workers": workers,
+                "concurrency": current_limit(adaptive, workers),
             }
         )
 
-    if workers <= 1 or total_chunks <= 1:
-        for idx, chunk in enumerate(chunks, start=1):
-            chunk_ids = [str(x.get("item_number") or x.get("ean") or "") for x in chunk]
-            chunk_result = _send_update_chunk_with_duplicate_cleanup(
-                chunk=chunk,
-                cfg=cfg,
-                cache=duplicate_cleanup_cache,
-            )
-            details.extend(chunk_result["details"])
-            updated += int(chunk_result["updated"])
-            failed += int(chunk_result["failed"])
-            last_detail = chunk_result["details"][-1] if chunk_result["details"] else {}
-
-            if progress_cb is not None:
-                progress_cb(
-                    {
-                        "phase": "updating",
-                        "total_chunks": total_chunks,
-                        "processed_chunks": idx,
-                        "total_items": total_items,
-                        "processed_items": min(idx * 5, total_items),
-                        "updated": updated,
-                        "failed": failed,
-                        "workers": workers,
-                        "last_chunk_item_numbers": chunk_ids,
-                        "last_chunk_success": bool(last_detail.get("success")),
-                        "last_chunk_status": last_detail.get("status"),
-                        "last_chunk_message": last_detail.get("message"),
-                        "last_chunk_errors": last_detail.get("errors") or [],
-                    }
-                )
-    else:
-        # Parallel chunk updates to speed up long runs.
-        # NOTE: duplicate_cleanup_cache isn't thread-safe; each worker uses its own local cache.
-        progress_lock = threading.Lock()
-        processed_chunks = 0
-        processed_items = 0
-
-        with ThreadPoolExecutor(max_workers=workers) as executor:
-            future_meta: Dict[Any, Dict[str, Any]] = {}
-            for chunk in chunks:
-                chunk_ids = [str(x.get("item_number") or x.get("ean") or "") for x in chunk]
-                # Each worker gets its own cache to avoid cross-thread mutation.
-                future = executor.submit(
-                    _send_update_chunk_with_duplicate_cleanup,
-                    chunk,
-                    cfg,
-                    {},
-                )
-                future_meta[future] = {
-                    "chunk_ids": chunk_ids,
-                    "chunk_size": len(chunk),
-                }
-
-            for future in as_completed(list(future_meta.keys())):
-                meta = future_meta.get(future) or {}
-                chunk_ids = meta.get("chunk_ids") or []
-                chunk_size = int(meta.get("chunk_size") or 0)
-                chunk_result = future.result()
-                last_detail = chunk_result["details"][-1] if chunk_result.get("details") else {}
-
-                with progress_lock:
-                    details.extend(chunk_result.get("details") or [])
-                    updated += int(chunk_result.get("updated") or 0)
-                    failed += int(chunk_result.get("failed") or 0)
-                    processed_chunks += 1
-                    processed_items += chunk_size
-
-                if progress_cb is not None:
-                    progress_cb(
-                        {
-                            "phase": "updating",
-                            "total_chunks": total_chunks,
-                            "processed_chunks": processed_chunks,
-                            "total_items": total_items,
-                            "processed_items": min(processed_items, total_items),
-                            "updated": updated,
-                            "failed": failed,
-                            "workers": workers,
-                            "last_chunk_item_numbers": chunk_ids,
-                            "last_chunk_success": bool(last_detail.get("success")),
-                            "last_chunk_status": last_detail.get("status"),
-                            "last_chunk_message": last_detail.get("message"),
-                            "last_chunk_errors": last_detail.get("errors") or [],
-                        }
-                    )
+    chunk_run = _run_update_chunks(
+        chunks,
+        cfg,
+        workers,
+        failed=failed,
+        progress_cb=progress_cb,
+        checkpoint=checkpoint,
+        sink=sink,
+        fingerprints=fingerprints,
+    )
+    details = chunk_run["details"]
+    updated = int(chunk_run["updated"])
+    failed = int(chunk_run["failed"])
 
     result = {
         "requested": len(norms),
-        "prepared": len(update_payloads),
+        "prepared": prepared_count,
+        "sent": len(update_payloads),
+        "unchanged": len(unchanged),
+        "resumed_done": resumed_done,
         "updated": updated,
         "failed": failed,
+        "mode": mode,
         "account": account_mode,
         "source_file": source_file,
         "workers": workers,
+        "concurrency": current_limit(adaptive, workers),
         "details": details,
         "skipped": skipped,
     }
     if progress_cb is not None:
-        progress_cb({"phase": "completed", "result_summary": {"updated": updated, "failed": failed}})
+        progress_cb(
+            {
+                "phase": "completed",
+                "result_summary": {"updated": updated, "failed": failed, "unchanged": len(unchanged)},
+            }
+        )
     return result
 
 
@@ -961,7 +1095,7 @@ def _upload_one_by_id(item_id: str, source_file: str | None = None, account: str
         raise HTTPException(status_code=404, detail="Item not found in JSON by ID")
 
     cfg = ApiConfig.from_env(account=account_mode)
-    norm = normalize_item(raw)
+    norm = normalize_item_cached(raw)
     api_description = _resolve_description_for_api(norm, html_folder=html_folder)
 
     payload = _build_item_payload_from_norm(norm, api_description)
@@ -997,6 +1131,7 @@ def _upload_one_by_id(item_id: str, source_file: str | None = None, account: str
     msg = (resp.get("item_message") or "") + " " + " ".join(resp.get("errors") or [])
     if "Sie haben bereits einen identischen Artikel" in msg:
         resp["success"] = True
+    _remember_inserted_in_mirror(cfg, resp, payload["item_number"])
 
     return resp
 
@@ -1022,7 +1157,7 @@ def validate_one(
     if not raw:
         raise HTTPException(status_code=404, detail="Item not found in JSON by ID")
     cfg = ApiConfig.from_env(account=account_mode)
-    norm = normalize_item(raw)
+    norm = normalize_item_cached(raw)
     api_description = _resolve_description_for_api(norm, html_folder=html_folder)
     payload = _build_item_payload_from_norm(norm, api_description)
     xml_body = build_item_validate(
@@ -1154,7 +1289,7 @@ def update_many(
             skipped.append({"item_id_local": item_id, "success": False, "error": "Item not found in JSON by ID"})
             continue
 
-        norm = normalize_item(raw)
+        norm = normalize_item_cached(raw)
         api_description = _resolve_description_for_api(norm, html_folder=html_folder)
         item_number = str(norm.get("item_number") or norm.get("ean") or "").strip()
         if not item_number:
@@ -1212,17 +1347,43 @@ def items_update(
     source_file: str | None = Query(default=None),
     account: str | None = Query(default=None),
     workers: int = Query(default=1, ge=1, le=10),
+    mode: str = Query(default="full"),
+    stream: str | None = Query(default=None),
 ) -> Dict[str, Any]:
     """
     Массовое обновление товаров из JSON в Hood через itemUpdate.
     limit=0 — обновить все товары из выбранного source_file (или из всей папки JSON).
+    mode=delta — отправлять только товары, чей payload изменился с последнего успешного обновления.
+    stream=ndjson — итоги чанков отдаются построчно по мере отправки, последней строкой — сводка.
     """
+    mode = _update_mode(mode)
+    if _stream_mode(stream):
+        _account_mode(account)
+
+        def run(sink: ResultSink) -> Dict[str, Any]:
+            try:
+                result = _run_items_update(
+                    limit=limit,
+                    source_file=source_file,
+                    account=account,
+                    workers=workers,
+                    mode=mode,
+                    sink=sink,
+                )
+            except FileNotFoundError:
+                raise HTTPException(status_code=404, detail=f"JSON file not found: {source_file}")
+            # Chunk details were already streamed line by line.
+            result.pop("details", None)
+            return result
+
+        return ndjson_stream_response(run)
     try:
         return _run_items_update(
             limit=limit,
             source_file=source_file,
             account=account,
             workers=workers,
+            mode=mode,
         )
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc))
@@ -1235,17 +1396,20 @@ def items_update_all(
     limit: int = 1,
     account: str | None = Query(default=None),
     workers: int = Query(default=1, ge=1, le=10),
+    mode: str = Query(default="full"),
 ) -> Dict[str, Any]:
     """
     Массовое обновление товаров из ВСЕХ JSON-файлов (как /items/upload, но через itemUpdate).
     limit=0 — обновить все товары из папки JSON.
     """
+    mode = _update_mode(mode)
     try:
         return _run_items_update(
             limit=limit,
             source_file=None,
             account=account,
             workers=workers,
+            mode=mode,
         )
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc))
@@ -1261,9 +1425,11 @@ def items_update_all_async(
     limit: int = 1,
     account: str | None = Query(default=None),
     workers: int = Query(default=1, ge=1, le=10),
+    mode: str = Query(default="full"),
 ) -> Dict[str, Any]:
     # Validate account early to fail fast on bad input.
     _account_mode(account)
+    mode = _update_mode(mode)
 
     job_id = uuid4().hex
     _set_update_job(
@@ -1277,6 +1443,7 @@ def items_update_all_async(
             "account": account,
             "kind": "update_all",
             "workers": workers,
+            "mode": mode,
         },
     )
     background_tasks.add_task(_run_items_update_job, job_id, limit, None, account)
@@ -1303,41 +1470,54 @@ def _run_items_update_job(job_id: str, limit: int, source_file: str | None, acco
     def progress_cb(progress: Dict[str, Any]) -> None:
         _set_update_job(job_id, {"progress": progress, "last_update_at": _utc_now_iso()})
 
+    checkpoint: JobCheckpoint | None = None
+    sink = ResultSink("update", job_id)
     try:
-        with UPDATE_JOBS_LOCK:
-            job_cfg = UPDATE_JOBS.get(job_id) or {}
+        job_cfg = get_job("update", job_id) or {}
         workers = int(job_cfg.get("workers") or 1)
+        checkpoint = JobCheckpoint("update", job_id)
         result = _run_items_update(
             limit=limit,
             source_file=source_file,
             account=account,
             workers=workers,
             progress_cb=progress_cb,
+            mode=str(job_cfg.get("mode") or "full"),
+            checkpoint=checkpoint,
+            sink=sink,
         )
     except Exception as exc:
+        if checkpoint is not None:
+            checkpoint.flush()
+        sink.close()
         _set_update_job(
             job_id,
             {
                 "status": "failed",
                 "finished_at": _utc_now_iso(),
                 "error": str(exc),
+                "details_log": sink.summary(),
                 "progress": {"phase": "failed"},
             },
         )
         return
 
+    sink.close()
+    drop_checkpoints("update", job_id)
     _set_update_job(
         job_id,
         {
             "status": "completed",
             "finished_at": _utc_now_iso(),
             "result": result,
+            "details_log": sink.summary(),
             "progress": {
                 "phase": "completed",
                 "total_items": result.get("prepared", 0),
                 "processed_items": result.get("prepared", 0),
                 "updated": result.get("updated", 0),
                 "failed": result.get("failed", 0),
+                "unchanged": result.get("unchanged", 0),
             },
         },
     )
@@ -1350,9 +1530,11 @@ def items_update_async(
     source_file: str | None = Query(default=None),
     account: str | None = Query(default=None),
     workers: int = Query(default=1, ge=1, le=10),
+    mode: str = Query(default="full"),
 ) -> Dict[str, Any]:
     # Validate account early to fail fast on bad input.
     _account_mode(account)
+    mode = _update_mode(mode)
 
     job_id = uuid4().hex
     _set_update_job(
@@ -1365,6 +1547,7 @@ def items_update_async(
             "source_file": source_file,
             "account": account,
             "workers": workers,
+            "mode": mode,
         },
     )
     background_tasks.add_task(_run_items_update_job, job_id, limit, source_file, account)
@@ -1377,8 +1560,7 @@ def items_update_async(
 
 @router.get("/update_async/{job_id}")
 def items_update_async_status(job_id: str) -> Dict[str, Any]:
-    with UPDATE_JOBS_LOCK:
-        job = UPDATE_JOBS.get(job_id)
+    job = get_job("update", job_id)
     if not job:
         raise HTTPException(status_code=404, detail="job not found")
     return job
@@ -1396,43 +1578,55 @@ def _run_items_upload_job(job_id: str, limit: int, source_file: str | None, acco
     def progress_cb(progress: Dict[str, Any]) -> None:
         _set_upload_job(job_id, {"progress": progress, "last_update_at": _utc_now_iso()})
 
+    checkpoint: JobCheckpoint | None = None
+    sink = ResultSink("upload", job_id)
     try:
-        with UPLOAD_JOBS_LOCK:
-            job_cfg = UPLOAD_JOBS.get(job_id) or {}
+        job_cfg = get_job("upload", job_id) or {}
         workers = int(job_cfg.get("workers") or 0)
-        result = asyncio.run(
+        checkpoint = JobCheckpoint("upload", job_id)
+        asyncio.run(
             _run_items_upload(
                 limit=limit,
                 source_file=source_file,
                 account=account,
                 workers=workers,
                 progress_cb=progress_cb,
+                checkpoint=checkpoint,
+                sink=sink,
             )
         )
     except Exception as exc:
+        if checkpoint is not None:
+            checkpoint.flush()
+        sink.close()
         _set_upload_job(
             job_id,
             {
                 "status": "failed",
                 "finished_at": _utc_now_iso(),
                 "error": str(exc),
+                "details_log": sink.summary(),
                 "progress": {"phase": "failed"},
             },
         )
         return
 
+    sink.close()
+    drop_checkpoints("upload", job_id)
     _set_upload_job(
         job_id,
         {
             "status": "completed",
             "finished_at": _utc_now_iso(),
-            "result": result,
+            # Full per-item responses are in details_log; the result keeps the failure sample.
+            "result": sink.failures_sample(),
+            "details_log": sink.summary(),
             "progress": {
                 "phase": "completed",
-                "total_items": len(result),
-                "processed_items": len(result),
-                "success": sum(1 for r in result if r.get("success")),
-                "failed": sum(1 for r in result if not r.get("success")),
+                "total_items": sink.success + sink.failed,
+                "processed_items": sink.success + sink.failed,
+                "success": sink.success,
+                "failed": sink.failed,
             },
         },
     )
@@ -1444,6 +1638,8 @@ async def _run_items_upload_many(
     account: str | None = None,
     workers: int = 0,
     progress_cb: Callable[[Dict[str, Any]], None] | None = None,
+    checkpoint: JobCheckpoint | None = None,
+    sink: ResultSink | None = None,
 ) -> Dict[str, Any]:
     normalized_files: List[str] = []
     seen: set[str] = set()
@@ -1513,29 +1709,36 @@ async def _run_items_upload_many(
                 }
             )
 
+        sink_before = (sink.success, sink.failed) if sink is not None else (0, 0)
         file_result = await _run_items_upload(
             limit=limit,
             source_file=source_file,
             account=account,
             workers=workers,
             progress_cb=file_progress_cb,
+            checkpoint=checkpoint,
+            sink=sink,
         )
-        file_success = sum(1 for r in file_result if r.get("success"))
-        file_failed = sum(1 for r in file_result if not r.get("success"))
-        file_processed = len(file_result)
+        if sink is not None:
+            file_success = sink.success - sink_before[0]
+            file_failed = sink.failed - sink_before[1]
+        else:
+            file_success = sum(1 for r in file_result if r.get("success"))
+            file_failed = sum(1 for r in file_result if not r.get("success"))
+        file_processed = file_success + file_failed
         total_processed += file_processed
         total_success += file_success
         total_failed += file_failed
         files_completed += 1
-        details.append(
-            {
-                "source_file": source_file,
-                "requested": len(file_result),
-                "success": file_success,
-                "failed": file_failed,
-                "details": file_result,
-            }
-        )
+        file_details: Dict[str, Any] = {
+            "source_file": source_file,
+            "requested": file_processed,
+            "success": file_success,
+            "failed": file_failed,
+        }
+        if sink is None:
+            file_details["details"] = file_result
+        details.append(file_details)
 
         if progress_cb is not None:
             progress_cb(
@@ -1587,10 +1790,12 @@ def _run_items_upload_many_job(job_id: str, source_files: List[str], limit: int,
     def progress_cb(progress: Dict[str, Any]) -> None:
         _set_upload_job(job_id, {"progress": progress, "last_update_at": _utc_now_iso()})
 
+    checkpoint: JobCheckpoint | None = None
+    sink = ResultSink("upload", job_id)
     try:
-        with UPLOAD_JOBS_LOCK:
-            job_cfg = UPLOAD_JOBS.get(job_id) or {}
+        job_cfg = get_job("upload", job_id) or {}
         workers = int(job_cfg.get("workers") or 0)
+        checkpoint = JobCheckpoint("upload", job_id)
         result = asyncio.run(
             _run_items_upload_many(
                 source_files=source_files,
@@ -1598,26 +1803,35 @@ def _run_items_upload_many_job(job_id: str, source_files: List[str], limit: int,
                 account=account,
                 workers=workers,
                 progress_cb=progress_cb,
+                checkpoint=checkpoint,
+                sink=sink,
             )
         )
     except Exception as exc:
+        if checkpoint is not None:
+            checkpoint.flush()
+        sink.close()
         _set_upload_job(
             job_id,
             {
                 "status": "failed",
                 "finished_at": _utc_now_iso(),
                 "error": str(exc),
+                "details_log": sink.summary(),
                 "progress": {"phase": "failed"},
             },
         )
         return
 
+    sink.close()
+    drop_checkpoints("upload", job_id)
     _set_upload_job(
         job_id,
         {
             "status": "completed",
             "finished_at": _utc_now_iso(),
             "result": result,
+            "details_log": sink.summary(),
             "progress": {
                 "phase": "completed",
                 "files_total": result.get("files_total", 0),
@@ -1703,8 +1917,7 @@ def items_upload_many_async(
 
 @router.get("/upload_async/{job_id}")
 def items_upload_async_status(job_id: str) -> Dict[str, Any]:
-    with UPLOAD_JOBS_LOCK:
-        job = UPLOAD_JOBS.get(job_id)
+    job = get_job("upload", job_id)
     if not job:
         raise HTTPException(status_code=404, detail="job not found")
     return job
@@ -1730,26 +1943,237 @@ def items_status() -> Dict[str, Any]:
     return {"failed_items": data}
 
 
-@router.get("/uploaded_split")
-def items_uploaded_split(account: str | None = Query(default=None)) -> Dict[str, Any]:
+@router.get("/api_stats")
+def hood_api_stats() -> Dict[str, Any]:
     """
-    Разделяет локальные товары на загруженные в Hood и не загруженные по itemNumber.
+    Метрики общего лимитера запросов к Hood по аккаунтам:
+    сколько запросов ждали токен, сколько времени провели в очереди
+    и текущий адаптивный параллелизм (AIMD); счётчики кэша HTML-описаний, кэша нормализации товаров
+    и пула подготовки XML.
     """
-    account_mode = _account_mode(account)
-    json_folder = get_json_folder_for_account(account_mode)
+    return {
+        "rate_limits": rate_limiter_stats(),
+        "adaptive_concurrency": concurrency_stats(),
+        "html_descriptions": description_stats(),
+        "normalize_cache": normalize_cache_stats(),
+        "prep_pipeline": prep_pipeline_stats(),
+    }
 
-    try:
-        uploaded, not_uploaded, warnings, not_uploaded_file = split_uploaded_items(
-            account=account_mode,
-            json_folder=json_folder,
-        )
-    except Exception as exc:
-        raise HTTPException(status_code=502, detail=str(exc))
+
+@router.get("/jobs")
+def items_jobs(
+    kind: str | None = Query(default=None),
+    status: str | None = Query(default=None),
+    account: str | None = Query(default=None),
+    include_result: bool = Query(default=False),
+    limit: int = Query(default=50, ge=1, le=500),
+    offset: int = Query(default=0, ge=0),
+) -> Dict[str, Any]:
+    """
+    Фоновые задачи из хранилища (новые сверху): kind = update | upload | delete | split,
+    status = queued | running | completed | failed. Без include_result — без тяжёлого result.
+    Тип задачи из хранилища — в store_kind (kind задачи, например update_prices, остаётся как есть).
+    """
+    if kind is not None and kind not in JOB_KINDS:
+        raise HTTPException(status_code=400, detail=f"kind must be one of: {', '.join(JOB_KINDS)}")
+    jobs = list_jobs(kind=kind, status=status, account=account, limit=limit, offset=offset)
+    if not include_result:
+        for job in jobs:
+            job.pop("result", None)
+    return {"jobs": jobs, "limit": limit, "offset": offset}
+
+
+_SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+
+@router.get("/jobs/events")
+def items_jobs_events(
+    kind: str | None = Query(default=None),
+    account: str | None = Query(default=None),
+) -> StreamingResponse:
+    """
+    SSE-поток изменений фоновых задач (event: job, data — задача без result) вместо опроса статусов.
+    Поток открывается текущими queued/running задачами; kind/account сужают выборку.
+    """
+    if kind is not None and kind not in JOB_KINDS:
+        raise HTTPException(status_code=400, detail=f"kind must be one of: {', '.join(JOB_KINDS)}")
+
+    def reload() -> List[Dict[str, Any]]:
+        jobs = [
+            job
+            for status in ("queued", "running")
+            for job in list_jobs(kind=kind, status=status, account=account, limit=500)
+        ]
+        return [job_event(job["store_kind"], job) for job in jobs]
+
+    return StreamingResponse(
+        job_event_stream(kind=kind, account=account, reload=reload),
+        media_type="text/event-stream",
+        headers=_SSE_HEADERS,
+    )
+
+
+@router.get("/jobs/{kind}/{job_id}/events")
+def items_job_events(kind: str, job_id: str) -> StreamingResponse:
+    """SSE-поток одной задачи: текущее состояние, затем изменения; закрывается после completed/failed."""
+    if kind not in JOB_KINDS:
+        raise HTTPException(status_code=400, detail=f"kind must be one of: {', '.join(JOB_KINDS)}")
+    if not get_job(kind, job_id):
+        raise HTTPException(status_code=404, detail="job not found")
+
+    def reload() -> List[Dict[str, Any]]:
+        job = get_job(kind, job_id)
+        return [job_event(kind, job)] if job else []
+
+    return StreamingResponse(
+        job_event_stream(kind=kind, job_id=job_id, reload=reload, until_done=True),
+        media_type="text/event-stream",
+        headers=_SSE_HEADERS,
+    )
+
+
+@router.get("/jobs/{kind}/{job_id}/details")
+def items_job_details(
+    kind: str,
+    job_id: str,
+    offset: int = Query(default=0, ge=0),
+    limit: int = Query(default=100, ge=1, le=1000),
+    only_failed: bool = Query(default=False),
+) -> Dict[str, Any]:
+    """Полные итоги задачи по товарам/батчам (details_log) постранично; only_failed — только неудачи."""
+    if kind not in JOB_KINDS:
+        raise HTTPException(status_code=400, detail=f"kind must be one of: {', '.join(JOB_KINDS)}")
+    page = read_result_page(kind, job_id, offset=offset, limit=limit, only_failed=only_failed)
+    if page is None:
+        if not get_job(kind, job_id):
+            raise HTTPException(status_code=404, detail="job not found")
+        page = {"items": [], "offset": offset, "limit": limit, "only_failed": only_failed, "next_offset": None}
+    return {"job_id": job_id, "kind": kind, **page}
+
+
+def _job_is_stale(job: Dict[str, Any]) -> bool:
+    """queued/running-задача без обновлений дольше JOB_STALE_SECONDS — её процесс, скорее всего, перезапущен."""
+    last = job.get("last_update_at") or job.get("started_at") or job.get("created_at")
+    try:
+        last_at = datetime.fromisoformat(str(last))
+    except ValueError:
+        return True
+    stale_after = float(os.environ.get("JOB_STALE_SECONDS", "600"))
+    return (datetime.now(timezone.utc) - last_at).total_seconds() > stale_after
+
+
+@router.post("/jobs/{kind}/{job_id}/resume")
+def items_job_resume(
+    kind: str,
+    job_id: str,
+    background_tasks: BackgroundTasks,
+    force: bool = Query(default=False),
+) -> Dict[str, Any]:
+    """
+    Продолжает упавшую или прерванную задачу update/upload с последнего чекпоинта:
+    товары, уже успешно обработанные этой задачей, повторно не отправляются.
+    queued/running считается прерванной, если не обновлялась дольше JOB_STALE_SECONDS (force=true — без проверки).
+    """
+    if kind not in ("update", "upload"):
+        raise HTTPException(status_code=400, detail="kind must be one of: update, upload")
+    job = get_job(kind, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="job not found")
+    if kind == "update" and job.get("kind") not in (None, "update_all"):
+        raise HTTPException(status_code=400, detail=f"{job.get('kind')} jobs cannot be resumed")
+    status = job.get("status")
+    if status == "completed":
+        raise HTTPException(status_code=409, detail="job is already completed")
+    if status in ("queued", "running") and not force and not _job_is_stale(job):
+        raise HTTPException(status_code=409, detail="job is still running")
+
+    limit = int(job.get("limit") or 0)
+    account = job.get("account")
+    checkpoint = checkpoint_counts(kind, job_id)
+    set_job(
+        kind,
+        job_id,
+        {
+            "status": "queued",
+            "resumed_at": _utc_now_iso(),
+            "resume_count": int(job.get("resume_count") or 0) + 1,
+            "error": None,
+            "finished_at": None,
+            "progress": {"phase": "queued", "checkpoint": checkpoint},
+        },
+    )
+    if kind == "update":
+        background_tasks.add_task(_run_items_update_job, job_id, limit, job.get("source_file"), account)
+        status_url = f"/api/items/{job.get('kind') or 'update'}_async/{job_id}"
+    elif job.get("mode") == "many_files":
+        source_files = list(job.get("source_files") or [])
+        background_tasks.add_task(_run_items_upload_many_job, job_id, source_files, limit, account)
+        status_url = f"/api/items/upload_async/{job_id}"
+    else:
+        background_tasks.add_task(_run_items_upload_job, job_id, limit, job.get("source_file"), account)
+        status_url = f"/api/items/upload_async/{job_id}"
+    return {
+        "job_id": job_id,
+        "status": "queued",
+        "checkpoint": checkpoint,
+        "status_url": status_url,
+    }
+
+
+@router.get("/mirror")
+def hood_mirror_status(account: str | None = Query(default=None)) -> Dict[str, Any]:
+    """Состояние локального зеркала Hood: число товаров по статусам и время синхронизаций."""
+    account_mode = _account_mode(account)
+    cfg = ApiConfig.from_env(account=account_mode)
+    return {"account": account_mode, **hood_mirror_stats(cfg)}
+
+
+@router.post("/mirror/refresh")
+def hood_mirror_refresh(
+    account: str | None = Query(default=None),
+    item_status: str = Query(default="running"),
+    full: bool | None = Query(default=None),
+) -> Dict[str, Any]:
+    """
+    Обновляет зеркало: full=true — полный itemList, full=false — только dateRange
+    с последней синхронизации, без параметра — по возрасту последнего полного прохода.
+    """
+    account_mode = _account_mode(account)
+    cfg = ApiConfig.from_env(account=account_mode)
+    result = refresh_hood_mirror(cfg, item_status=item_status.strip().lower(), full=full)
+    return {"account": account_mode, **result}
+
+
+@router.get("/uploaded_split")
+def items_uploaded_split(
+    account: str | None = Query(default=None),
+    check_mode: str | None = Query(default=None),
+    verify_missing: bool = Query(default=False),
+) -> Dict[str, Any]:
+    """
+    Разделяет локальные товары на загруженные в Hood и не загруженные по itemNumber.
+    check_mode=snapshot (по умолчанию) — один проход itemList вместо itemDetail на каждый товар;
+    как и itemDetail, учитываются все статусы (HOOD_EXISTENCE_SNAPSHOT_STATUSES).
+    """
+    account_mode = _account_mode(account)
+    mode = _check_mode(check_mode)
+    json_folder = get_json_folder_for_account(account_mode)
+
+    try:
+        uploaded, not_uploaded, warnings, not_uploaded_file = split_uploaded_items(
+            account=account_mode,
+            json_folder=json_folder,
+            check_mode=mode,
+            verify_missing=verify_missing,
+        )
+    except Exception as exc:
+        raise HTTPException(status_code=502, detail=str(exc))
 
     return {
         "account": account_mode,
         "json_folder": json_folder,
         "match_by": "item_number",
+        "check_mode": mode,
         "partial": bool(warnings),
         "warnings": warnings,
         "not_uploaded_file": not_uploaded_file,
@@ -1764,14 +2188,19 @@ def items_uploaded_split(account: str | None = Query(default=None)) -> Dict[str,
 def check_selected_files(
     source_files: List[str] = Body(..., embed=True),
     account: str | None = Query(default=None),
+    check_mode: str | None = Query(default=None),
+    verify_missing: bool = Query(default=False),
 ) -> Dict[str, Any]:
     account_mode = _account_mode(account)
+    mode = _check_mode(check_mode)
     json_folder = get_json_folder_for_account(account_mode)
     try:
         result = check_selected_source_files(
             source_files=source_files,
             account=account_mode,
             json_folder=json_folder,
+            check_mode=mode,
+            verify_missing=verify_missing,
         )
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc))
@@ -1787,7 +2216,12 @@ def check_selected_files(
     }
 
 
-def _run_items_uploaded_split_job(job_id: str, account: str | None) -> None:
+def _run_items_uploaded_split_job(
+    job_id: str,
+    account: str | None,
+    check_mode: str | None = None,
+    verify_missing: bool = False,
+) -> None:
     _set_split_job(
         job_id,
         {
@@ -1806,11 +2240,14 @@ def _run_items_uploaded_split_job(job_id: str, account: str | None) -> None:
             account=account_mode,
             json_folder=json_folder,
             progress_cb=progress_cb,
+            check_mode=check_mode,
+            verify_missing=verify_missing,
         )
         result = {
             "account": account_mode,
             "json_folder": json_folder,
             "match_by": "item_number",
+            "check_mode": check_mode,
             "partial": bool(warnings),
             "warnings": warnings,
             "not_uploaded_file": not_uploaded_file,
@@ -1851,8 +2288,11 @@ def _run_items_uploaded_split_job(job_id: str, account: str | None) -> None:
 def items_uploaded_split_async(
     background_tasks: BackgroundTasks,
     account: str | None = Query(default=None),
+    check_mode: str | None = Query(default=None),
+    verify_missing: bool = Query(default=False),
 ) -> Dict[str, Any]:
     _account_mode(account)
+    mode = _check_mode(check_mode)
     job_id = uuid4().hex
     _set_split_job(
         job_id,
@@ -1861,9 +2301,11 @@ def items_uploaded_split_async(
             "status": "queued",
             "created_at": _utc_now_iso(),
             "account": account,
+            "check_mode": mode,
+            "verify_missing": verify_missing,
         },
     )
-    background_tasks.add_task(_run_items_uploaded_split_job, job_id, account)
+    background_tasks.add_task(_run_items_uploaded_split_job, job_id, account, mode, verify_missing)
     return {
         "job_id": job_id,
         "status": "queued",
@@ -1873,27 +2315,40 @@ def items_uploaded_split_async(
 
 @router.get("/uploaded_split_async/{job_id}")
 def items_uploaded_split_async_status(job_id: str) -> Dict[str, Any]:
-    with SPLIT_JOBS_LOCK:
-        job = SPLIT_JOBS.get(job_id)
+    job = get_job("split", job_id)
     if not job:
         raise HTTPException(status_code=404, detail="job not found")
     return job
 
 
 @router.post("/validate")
-def items_validate(account: str | None = Query(default=None)) -> List[Dict[str, Any]]:
+def items_validate(
+    account: str | None = Query(default=None),
+    stream: str | None = Query(default=None),
+) -> List[Dict[str, Any]]:
     """
     РџСЂРѕРІРµСЂРєР° СЃС‚СЂСѓРєС‚СѓСЂС‹ С‚РѕРІР°СЂРѕРІ: itemValidate РґР»СЏ РІСЃРµС… С‚РѕРІР°СЂРѕРІ СЃРµСЂРІРµСЂР°.
     """
     account_mode = _account_mode(account)
+    if _stream_mode(stream):
+
+        def run(sink: ResultSink) -> Dict[str, Any]:
+            _run_items_validate(account_mode, sink=sink)
+            return {"account": account_mode}
+
+        return ndjson_stream_response(run)
+    return _run_items_validate(account_mode)
+
+
+def _run_items_validate(account_mode: str | None, sink: ResultSink | None = None) -> List[Dict[str, Any]]:
+    """itemValidate по всем товарам; с sink итоги уходят в него, а возвращается пустой список."""
     cfg = ApiConfig.from_env(account=account_mode)
     json_folder = get_json_folder_for_account(account_mode)
     html_folder = get_html_folder_for_account(account_mode)
     server_items = load_all_items(json_folder=json_folder)
 
     results: List[Dict[str, Any]] = []
-    for raw in server_items:
-        norm = normalize_item(raw)
+    for norm in normalize_items_cached(server_items, compact=True):
         api_description = _resolve_description_for_api(norm, html_folder=html_folder)
         payload = _build_item_payload_from_norm(norm, api_description)
         xml_body = build_item_validate(
@@ -1918,17 +2373,20 @@ def items_validate(account: str | None = Query(default=None)) -> List[Dict[str,
         try:
             response_xml = send_request(xml_body, config=cfg)
         except Exception as exc:
-            results.append(
+            _collect_result(
+                results,
+                sink,
                 {
                     "reference_id": norm["reference_id"],
                     "error": str(exc),
-                }
+                },
+                success=False,
             )
             continue
         resp = parse_item_insert_response(response_xml)
         resp["reference_id"] = norm["reference_id"]
         resp["account"] = account_mode
-        results.append(resp)
+        _collect_result(results, sink, resp)
     return results
 
 
@@ -1938,6 +2396,8 @@ async def _run_items_upload(
     account: str | None = None,
     workers: int = 0,
     progress_cb: Callable[[Dict[str, Any]], None] | None = None,
+    checkpoint: JobCheckpoint | None = None,
+    sink: ResultSink | None = None,
 ) -> List[Dict[str, Any]]:
     """
     РђСЃРёРЅС…СЂРѕРЅРЅР°СЏ Р·Р°РіСЂСѓР·РєР° Р’РЎР•РҐ С‚РѕРІР°СЂРѕРІ РёР· JSON РІ Hood.
@@ -1957,21 +2417,29 @@ async def _run_items_upload(
         raise HTTPException(status_code=400, detail=str(exc))
     except FileNotFoundError:
         raise HTTPException(status_code=404, detail=f"JSON file not found: {source_file}")
-    all_norms: List[Dict[str, Any]] = [normalize_item(raw) for raw in server_items]
+    all_norms: List[NormalizedItem] = normalize_items_cached(server_items, compact=True)
 
     # РџРѕРєР° РїРѕ СѓРјРѕР»С‡Р°РЅРёСЋ РіСЂСѓР·РёРј С‚РѕР»СЊРєРѕ РїРµСЂРІС‹Р№ С‚РѕРІР°СЂ (limit=1).
     # Р”Р»СЏ РјР°СЃСЃРѕРІРѕР№ Р·Р°РіСЂСѓР·РєРё РјРѕР¶РЅРѕ Р±СѓРґРµС‚ РїСЂРѕСЃС‚Рѕ РІС‹Р·РІР°С‚СЊ /items/upload?limit=1000.
     if limit <= 0:
-        to_upload: List[Dict[str, Any]] = all_norms
+        to_upload: List[NormalizedItem] = all_norms
         logger.info(f"Start upload {len(to_upload)} items to Hood (all items)")
     else:
         to_upload = all_norms[:limit]
         logger.info(f"Start upload {len(to_upload)} items to Hood (limit={limit})")
+    resumed_done = 0
+    if checkpoint is not None and checkpoint.done_keys:
+        # Resumed job: items already uploaded by an earlier run of this job are not sent again.
+        before = len(to_upload)
+        to_upload = [norm for norm in to_upload if str(norm["reference_id"]) not in checkpoint.done_keys]
+        resumed_done = before - len(to_upload)
+        logger.info(f"Resume upload: {resumed_done} items already done, {len(to_upload)} left")
 
     max_parallel = int(workers or 0)
     if max_parallel <= 0:
         max_parallel = int(getattr(settings, "MAX_PARALLEL_UPLOADS", 5) or 5)
     max_parallel = max(1, min(max_parallel, 50))
+    adaptive = get_concurrency_limiter(cfg)
     semaphore = asyncio.Semaphore(max_parallel)
     results: List[Dict[str, Any]] = []
     processed_count = 0
@@ -1987,36 +2455,21 @@ async def _run_items_upload(
                 "processed_items": 0,
                 "success": 0,
                 "failed": 0,
+                "resumed_done": resumed_done,
                 "workers": max_parallel,
+                "concurrency": current_limit(adaptive, max_parallel),
             }
         )
 
-    async def worker(norm: Dict[str, Any]) -> None:
+    def payload_for(norm: NormalizedItem) -> Dict[str, Any]:
+        api_description = _resolve_description_for_api(norm, html_folder=html_folder)
+        return _build_item_payload_from_norm(norm, api_description)
+
+    async def worker(norm: NormalizedItem, xml_body: str) -> None:
         nonlocal processed_count, success_count, failed_count
-        async with semaphore:
-            api_description = _resolve_description_for_api(norm, html_folder=html_folder)
-            payload = _build_item_payload_from_norm(norm, api_description)
-            xml_body = build_item_insert(
-                reference_id=payload["reference_id"],
-                title=payload["title"],
-                description=payload["description"],
-                price=payload["price"],
-                quantity=payload["quantity"],
-                category_id=payload["categoryID"],
-                condition=payload["condition"],
-                item_mode=payload["itemMode"],
-                pay_options=payload["pay_options"],
-                ship_methods=payload["ship_methods"],
-                image_urls=payload["image_urls"],
-                product_properties=payload["product_properties"],
-                ean=payload["ean"],
-                mpn=payload["mpn"],
-                item_number=payload["item_number"],
-                country=payload["country"],
-                config=cfg,
-            )
+        async with (adaptive.async_slot() if adaptive is not None else semaphore):
             try:
-                response_xml = await asyncio.to_thread(send_request, xml_body, cfg)
+                response_xml = await hood_client.send(xml_body, cfg)
                 resp = parse_item_insert_response(response_xml)
                 resp["reference_id"] = norm["reference_id"]
                 resp["account"] = account_mode
@@ -2037,6 +2490,7 @@ async def _run_items_upload(
                     )
                 else:
                     logger.warning(f"вњ— {norm['reference_id']} РЅРµ Р·Р°РіСЂСѓР¶РµРЅ: {resp.get('item_message', 'unknown error')}")
+                _remember_inserted_in_mirror(cfg, resp, norm.get("item_number"))
             except Exception as exc:
                 resp = {
                     "reference_id": norm["reference_id"],
@@ -2046,7 +2500,17 @@ async def _run_items_upload(
                 }
                 logger.error(f"вњ— РћС€РёР±РєР° Р·Р°РіСЂСѓР·РєРё С‚РѕРІР°СЂР° {norm['reference_id']}: {exc}")
 
-            results.append(resp)
+            if sink is not None:
+                # Job run: the full response goes to the job's details log instead of memory.
+                sink.add(dict(resp, source_file=source_file))
+            else:
+                results.append(resp)
+            if checkpoint is not None:
+                checkpoint.record(
+                    str(norm["reference_id"]),
+                    bool(resp.get("success")),
+                    {k: resp[k] for k in ("item_id", "error", "item_message") if resp.get(k)},
+                )
             processed_count += 1
             if resp.get("success"):
                 success_count += 1
@@ -2064,6 +2528,7 @@ async def _run_items_upload(
                         "last_reference_id": norm["reference_id"],
                         "last_success": bool(resp.get("success")),
                         "last_error": resp.get("error") or resp.get("item_message"),
+                        "concurrency": current_limit(adaptive, max_parallel),
                     }
                 )
             
@@ -2071,20 +2536,41 @@ async def _run_items_upload(
             if processed_count % 10 == 0 or processed_count == total_count:
                 logger.info(f"РџСЂРѕРіСЂРµСЃСЃ: {processed_count}/{total_count} С‚РѕРІР°СЂРѕРІ РѕР±СЂР°Р±РѕС‚Р°РЅРѕ ({processed_count * 100 // total_count}%)")
 
-    tasks = [worker(it) for it in to_upload]
-    if tasks:
-        await asyncio.gather(*tasks)
+    sink_start = sink.mark() if sink is not None else 0
+    max_connections = adaptive.max_limit if adaptive is not None else max_parallel
+    # itemInsert bodies are rendered by the prep pipeline (process pool) off the event loop, batch by batch;
+    # at most two sends per connection wait for a slot, the rest stays in the bounded prep queue.
+    prepared = PrepPipeline(to_upload, render_insert_bodies, cfg, payload_of=payload_for)
+    pending: set[asyncio.Task] = set()
+    try:
+        async with AsyncHoodClient(cfg, max_connections=max_connections) as hood_client:
+            while (batch := await asyncio.to_thread(prepared.next_batch)) is not None:
+                for norm, xml_body in batch:
+                    if len(pending) >= max_connections * 2:
+                        done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                        for task in done:
+                            task.result()
+                    pending.add(asyncio.create_task(worker(norm, xml_body)))
+            if pending:
+                await asyncio.gather(*pending)
+    finally:
+        prepared.close()
+        for task in pending:
+            task.cancel()
 
     # РЎРѕР±РёСЂР°РµРј РІСЃРµ С‚РѕРІР°СЂС‹, РєРѕС‚РѕСЂС‹Рµ РЅРµ СѓРґР°Р»РѕСЃСЊ Р·Р°РіСЂСѓР·РёС‚СЊ, Рё СЃРѕС…СЂР°РЅСЏРµРј
     # ?????? ? ??????? ?????? Hood (status, errors, item_message, reference_id ? ?.?.)
-    failed_items: List[Dict[str, Any]] = [r for r in results if not r.get("success")]
+    if sink is not None:
+        failed_items: List[Dict[str, Any]] = list(sink.iter_records(only_failed=True, start=sink_start))
+    else:
+        failed_items = [r for r in results if not r.get("success")]
 
     FAILED_ITEMS_PATH.parent.mkdir(parents=True, exist_ok=True)
     FAILED_ITEMS_PATH.write_text(json.dumps(failed_items, ensure_ascii=False, indent=2), encoding="utf-8")
 
     logger.info(
-        f"Р—Р°РіСЂСѓР·РєР° Р·Р°РІРµСЂС€РµРЅР°. РЈСЃРїРµС€РЅРѕ: {len(results) - len(failed_items)}, "
-        f"СЃ РѕС€РёР±РєР°РјРё: {len(failed_items)}. Р¤Р°Р№Р» СЃ РѕС€РёР±РѕС‡РЅС‹РјРё С‚РѕРІР°СЂР°РјРё: {FAILED_ITEMS_PATH}"
+        f"Р—Р°РіСЂСѓР·РєР° Р·Р°РІРµСЂС€РµРЅР°. РЈСЃРїРµС€РЅРѕ: {success_count}, "
+        f"СЃ РѕС€РёР±РєР°РјРё: {failed_count}. Р¤Р°Р№Р» СЃ РѕС€РёР±РѕС‡РЅС‹РјРё С‚РѕРІР°СЂР°РјРё: {FAILED_ITEMS_PATH}"
     )
     if progress_cb is not None:
         progress_cb(
@@ -2094,6 +2580,7 @@ async def _run_items_upload(
                 "processed_items": total_count,
                 "success": success_count,
                 "failed": failed_count,
+                "concurrency": current_limit(adaptive, max_parallel),
             }
         )
     return results
@@ -2134,7 +2621,12 @@ def delete_item_by_item_number(item_number: str, account: str | None = Query(def
 def delete_items_by_item_number(
     item_numbers: List[str] = Body(..., embed=True),
     account: str | None = Query(default=None),
+    stream: str | None = Query(default=None),
 ) -> Dict[str, Any]:
+    """
+    Удаление по списку itemNumber пачками по 200 (неоднозначные номера — повторно по itemID).
+    stream=ndjson — итог каждой пачки отдаётся строкой сразу после ответа Hood, последней строкой — сводка.
+    """
     normalized: List[str] = []
     seen: set[str] = set()
     for raw in item_numbers:
@@ -2148,6 +2640,16 @@ def delete_items_by_item_number(
         raise HTTPException(status_code=400, detail="item_numbers is empty")
 
     account_mode = _account_mode(account)
+    if _stream_mode(stream):
+        return ndjson_stream_response(lambda sink: _run_delete_by_item_numbers(normalized, account_mode, sink=sink))
+    return _run_delete_by_item_numbers(normalized, account_mode)
+
+
+def _run_delete_by_item_numbers(
+    normalized: List[str],
+    account_mode: str | None,
+    sink: ResultSink | None = None,
+) -> Dict[str, Any]:
     cfg = ApiConfig.from_env(account=account_mode)
     cache: Dict[str, Any] = {}
     details: List[Dict[str, Any]] = []
@@ -2172,7 +2674,8 @@ def delete_items_by_item_number(
             }
         parsed["method"] = "itemNumber"
         parsed["requested_item_numbers"] = chunk
-        details.append(parsed)
+        _collect_result(details, sink, parsed)
+        _forget_deleted_in_mirror(cfg, parsed, chunk)
 
         item_results = parsed.get("items") or []
         if item_results:
@@ -2200,24 +2703,29 @@ def delete_items_by_item_number(
             if recovered_ambiguous:
                 deleted += recovered_ambiguous
                 failed = max(failed - recovered_ambiguous, 0)
-            details.append(
+            _collect_result(
+                details,
+                sink,
                 {
                     "method": "itemID",
                     "reason": "ambiguous_after_itemNumber_delete",
                     "requested_item_numbers": ambiguous_numbers,
                     "recovered": recovered_ambiguous,
                     "details": ambiguous_details,
-                }
+                },
+                success=recovered_ambiguous == len(ambiguous_numbers),
             )
 
-    return {
+    result: Dict[str, Any] = {
         "account": account_mode,
         "requested": len(normalized),
         "deleted": deleted,
         "failed": failed,
         "item_numbers": normalized,
-        "details": details,
     }
+    if sink is None:
+        result["details"] = details
+    return result
 
 
 def _run_delete_by_source_file(
@@ -2241,8 +2749,7 @@ def _run_delete_by_source_file(
     seen: set[str] = set()
     skipped_missing = 0
 
-    for raw in source_items:
-        norm = normalize_item(raw)
+    for norm in normalize_items_cached(source_items, compact=True):
         item_number = str(norm.get("item_number") or norm.get("ean") or "").strip()
         if not item_number:
             skipped_missing += 1
@@ -2324,6 +2831,7 @@ def _run_delete_by_source_file(
         parsed["method"] = "itemNumber"
         parsed["requested_item_numbers"] = chunk
         details.append(parsed)
+        _forget_deleted_in_mirror(cfg, parsed, chunk)
 
         item_results = parsed.get("items") or []
         if item_results:
@@ -2622,31 +3130,37 @@ def _run_delete_all_job(job_id: str, account: str | None, item_status: str, dele
     def progress_cb(progress: Dict[str, Any]) -> None:
         _set_delete_job(job_id, {"progress": progress, "last_update_at": _utc_now_iso()})
 
+    sink = ResultSink("delete", job_id)
     try:
         result = _run_delete_all_items_from_hood(
             item_status=item_status,
             delete_batch_size=delete_batch_size,
             account=account,
             progress_cb=progress_cb,
+            sink=sink,
         )
     except Exception as exc:
+        sink.close()
         _set_delete_job(
             job_id,
             {
                 "status": "failed",
                 "finished_at": _utc_now_iso(),
                 "error": str(exc),
+                "details_log": sink.summary(),
                 "progress": {"phase": "failed"},
             },
         )
         return
 
+    sink.close()
     _set_delete_job(
         job_id,
         {
             "status": "completed",
             "finished_at": _utc_now_iso(),
             "result": result,
+            "details_log": sink.summary(),
             "progress": {
                 "phase": "completed",
                 "requested": result.get("requested", 0),
@@ -2773,8 +3287,7 @@ def _enqueue_delete_all_job(
 
 @router.get("/delete_async/{job_id}")
 def delete_job_status(job_id: str) -> Dict[str, Any]:
-    with DELETE_JOBS_LOCK:
-        job = DELETE_JOBS.get(job_id)
+    job = get_job("delete", job_id)
     if not job:
         raise HTTPException(status_code=404, detail="Delete job not found")
     return job
@@ -2785,6 +3298,7 @@ def _run_delete_all_items_from_hood(
     delete_batch_size: int = Query(default=200, ge=1, le=500),
     account: str | None = Query(default=None),
     progress_cb: Callable[[Dict[str, Any]], None] | None = None,
+    sink: ResultSink | None = None,
 ) -> Dict[str, Any]:
     account_mode = _account_mode(account)
     cfg = ApiConfig.from_env(account=account_mode)
@@ -2803,6 +3317,7 @@ def _run_delete_all_items_from_hood(
     missing_item_id_by_status: Dict[str, int] = {status_name: 0 for status_name in statuses}
     deleted_by_status: Dict[str, int] = {status_name: 0 for status_name in statuses}
     failed_by_status: Dict[str, int] = {status_name: 0 for status_name in statuses}
+    mirror_unconfirmed_by_status: Dict[str, int] = {status_name: 0 for status_name in statuses}
     responses: List[Dict[str, Any]] = []
     total_requested = 0
     total_deleted = 0
@@ -2812,275 +3327,269 @@ def _run_delete_all_items_from_hood(
     processed_batches = 0
     total_batches_all = 0
     delete_workers = max(1, min(int(os.environ.get("HOOD_DELETE_ALL_WORKERS", "4")), 16))
+    adaptive = get_concurrency_limiter(cfg)
     max_status_passes = max(1, int(os.environ.get("HOOD_DELETE_ALL_MAX_STATUS_PASSES", "200")))
+    seeded_from_mirror: Dict[str, int] = {}
 
-    def _load_status_items_until_no_auctions(status_name: str) -> tuple[List[Dict[str, Any]], bool]:
-        items: List[Dict[str, Any]] = []
-        start_at = 1
-        while True:
-            xml_body = build_item_list(
-                item_status=status_name,
-                start_at=start_at,
-                group_size=500,
-                start_date=None,
-                end_date=None,
-                config=cfg,
-            )
-            try:
-                response_xml = send_request(xml_body, config=cfg)
-            except Exception as exc:
-                raise HTTPException(status_code=502, detail=str(exc))
-
-            page = parse_item_list_response(response_xml)
-            errors = page.get("errors") or []
-            if errors:
-                no_auctions = any("no auctions found" in str(err).strip().lower() for err in errors)
-                if no_auctions:
-                    return items, True
-                raise HTTPException(
-                    status_code=502,
-                    detail={"message": page.get("message"), "errors": errors},
-                )
+    def _delete_batch(batch_num: int, chunk: List[str]) -> Dict[str, Any]:
+        xml_delete = build_item_delete(
+            items=[{"itemID": item_id} for item_id in chunk],
+            config=cfg,
+        )
+        try:
+            delete_resp_xml = send_request(xml_delete, config=cfg)
+            resp = parse_item_delete_response(delete_resp_xml)
+            return {
+                "batch_num": batch_num,
+                "chunk_size": len(chunk),
+                "chunk": chunk,
+                "response": resp,
+                "error": None,
+            }
+        except Exception as exc:
+            return {
+                "batch_num": batch_num,
+                "chunk_size": len(chunk),
+                "chunk": chunk,
+                "response": None,
+                "error": str(exc),
+            }
 
-            page_items = page.get("items", [])
-            items.extend(page_items)
-            total_records = int(page.get("total_records") or 0)
-
-            if not page_items:
-                return items, False
-            if total_records and len(items) >= total_records:
-                return items, False
-
-            effective_group_size = int(page.get("group_size") or 0)
-            step = effective_group_size if effective_group_size > 0 else len(page_items)
-            if len(page_items) < step:
-                return items, False
-            start_at += step
-
-    for status_index, status_name in enumerate(statuses, start=1):
-        status_pass = 0
-        while True:
-            status_pass += 1
-            if status_pass > max_status_passes:
-                raise HTTPException(
-                    status_code=502,
-                    detail=(
-                        f"Delete all guard reached for status '{status_name}' "
-                        f"after {max_status_passes} passes without 'No auctions found.'"
-                    ),
-                )
+    pool_size = adaptive.max_limit if adaptive is not None else delete_workers
+    max_in_flight = pool_size * 2
+    # Стадии конвейера: листинг itemList и удаление батчами идут одновременно.
+    listing: Dict[str, Any] = {}
+    in_flight: Dict[Future, Tuple[str, int, int]] = {}
 
-            status_items, exhausted_by_no_auctions = _load_status_items_until_no_auctions(status_name)
-            found_in_item_list_by_status[status_name] += len(status_items)
-            logger.info(
-                "Delete all status pass: status=%s, pass=%s, found_in_item_list=%s, exhausted_by_no_auctions=%s, status_index=%s/%s",
+    def _report(phase: str, status_name: str | None = None, status_index: int = 0, status_pass: int = 0) -> None:
+        if progress_cb is None:
+            return
+        progress_cb(
+            {
+                "phase": phase,
+                "status": status_name,
+                "status_index": status_index,
+                "status_count": len(statuses),
+                "status_pass": status_pass,
+                "requested": total_requested,
+                "processed": min(processed_items, total_requested),
+                "deleted": total_deleted,
+                "failed": total_failed,
+                "total_batches": total_batches_all,
+                "processed_batches": processed_batches,
+                "concurrency": current_limit(adaptive, pool_size),
+                "listing": dict(listing),
+                "deleting": {
+                    "in_flight_batches": len(in_flight),
+                    "processed_batches": processed_batches,
+                    "total_batches": total_batches_all,
+                },
+            }
+        )
+
+    def _count_failed(status_name: str, status_pass: int, count: int) -> None:
+        nonlocal total_failed
+        if status_pass == 1 and status_name in seeded_from_mirror:
+            # itemIDs from the mirror may already be gone in Hood; the next itemList pass retries real leftovers.
+            mirror_unconfirmed_by_status[status_name] += count
+            return
+        total_failed += count
+        failed_by_status[status_name] += count
+
+    def _record_batch(batch_result: Dict[str, Any], status_name: str, status_pass: int) -> None:
+        """Учитывает результат одного itemDelete."""
+        nonlocal processed_batches, processed_items, total_deleted
+        batch_num = int(batch_result["batch_num"])
+        chunk = batch_result["chunk"]
+        chunk_size = int(batch_result["chunk_size"])
+        error_text = batch_result.get("error")
+        seeded = status_pass == 1 and status_name in seeded_from_mirror
+
+        processed_batches += 1
+        processed_items += chunk_size
+
+        if error_text:
+            _count_failed(status_name, status_pass, chunk_size)
+            logger.error(
+                "Delete all batch failed: status=%s, pass=%s, batch=%s, requested=%s, error=%s",
                 status_name,
                 status_pass,
-                len(status_items),
-                exhausted_by_no_auctions,
-                status_index,
-                len(statuses),
+                batch_num,
+                chunk_size,
+                error_text,
             )
-
-            status_item_ids: List[str] = []
-            status_missing_item_id = 0
-            status_seen: set[str] = set()
-            for item in status_items:
-                item_id = str(item.get("itemID") or "").strip()
-                if not item_id:
-                    status_missing_item_id += 1
-                    continue
-                if item_id in status_seen:
-                    continue
-                status_seen.add(item_id)
-                status_item_ids.append(item_id)
-
-            missing_item_id_by_status[status_name] += status_missing_item_id
-            total_missing_item_id += status_missing_item_id
-            requested_by_status[status_name] += len(status_item_ids)
-            total_requested += len(status_item_ids)
-
-            if progress_cb is not None:
-                progress_cb(
+            _collect_details(
+                responses,
+                sink,
+                [
                     {
-                        "phase": "prepared",
-                        "status": status_name,
-                        "status_index": status_index,
-                        "status_count": len(statuses),
-                        "status_pass": status_pass,
-                        "requested": total_requested,
-                        "processed": processed_items,
-                        "deleted": total_deleted,
-                        "failed": total_failed,
-                        "total_batches": total_batches_all,
-                        "processed_batches": processed_batches,
+                        "success": False,
+                        "status_scope": status_name,
+                        "seeded_from_mirror": seeded,
+                        "error": error_text,
+                        "requested_item_ids": chunk,
                     }
-                )
+                ],
+            )
+            return
 
-            # Move to the next status only after explicit "No auctions found."
-            if exhausted_by_no_auctions and not status_item_ids:
-                break
-            if not status_item_ids:
-                continue
-
-            total_batches_status = (len(status_item_ids) + delete_batch_size - 1) // delete_batch_size
-            total_batches_all += total_batches_status
-            chunks: List[tuple[int, List[str]]] = []
-            for i in range(0, len(status_item_ids), delete_batch_size):
-                chunk = status_item_ids[i : i + delete_batch_size]
-                batch_num = (i // delete_batch_size) + 1
-                chunks.append((batch_num, chunk))
-
-            def _delete_batch(batch_num: int, chunk: List[str]) -> Dict[str, Any]:
-                xml_delete = build_item_delete(
-                    items=[{"itemID": item_id} for item_id in chunk],
-                    config=cfg,
-                )
-                try:
-                    delete_resp_xml = send_request(xml_delete, config=cfg)
-                    resp = parse_item_delete_response(delete_resp_xml)
-                    return {
-                        "batch_num": batch_num,
-                        "chunk_size": len(chunk),
-                        "chunk": chunk,
-                        "response": resp,
-                        "error": None,
-                    }
-                except Exception as exc:
-                    return {
-                        "batch_num": batch_num,
-                        "chunk_size": len(chunk),
-                        "chunk": chunk,
-                        "response": None,
-                        "error": str(exc),
-                    }
+        resp = batch_result["response"] or {}
+        if isinstance(resp, dict):
+            resp["status_scope"] = status_name
+            resp["seeded_from_mirror"] = seeded
+        _collect_details(responses, sink, [resp])
+        _forget_deleted_in_mirror(cfg, resp, requested_item_ids=chunk)
 
-            worker_count = min(delete_workers, max(total_batches_status, 1))
+        item_results = resp.get("items", [])
+        if item_results:
+            batch_deleted = sum(1 for x in item_results if str(x.get("status") or "").lower() == "success")
+            batch_failed = sum(1 for x in item_results if str(x.get("status") or "").lower() == "failed")
+            unresolved = max(chunk_size - batch_deleted - batch_failed, 0)
+            total_deleted += batch_deleted
+            deleted_by_status[status_name] += batch_deleted
+            _count_failed(status_name, status_pass, batch_failed + unresolved)
+            logger.info(
+                "Delete all batch done: status=%s, pass=%s, batch=%s, requested=%s, deleted=%s, failed=%s, unresolved=%s",
+                status_name,
+                status_pass,
+                batch_num,
+                chunk_size,
+                batch_deleted,
+                batch_failed,
+                unresolved,
+            )
+            return
+        if resp.get("success"):
+            total_deleted += chunk_size
+            deleted_by_status[status_name] += chunk_size
             logger.info(
-                "Delete all status workers: status=%s, pass=%s, workers=%s, total_batches=%s, delete_batch_size=%s",
+                "Delete all batch done: status=%s, pass=%s, batch=%s, requested=%s, deleted=%s, failed=0",
                 status_name,
                 status_pass,
-                worker_count,
-                total_batches_status,
-                delete_batch_size,
+                batch_num,
+                chunk_size,
+                chunk_size,
             )
+            return
+        _count_failed(status_name, status_pass, chunk_size)
+        logger.warning(
+            "Delete all batch done: status=%s, pass=%s, batch=%s, requested=%s, deleted=0, failed=%s",
+            status_name,
+            status_pass,
+            batch_num,
+            chunk_size,
+            chunk_size,
+        )
 
-            with ThreadPoolExecutor(max_workers=worker_count) as executor:
-                futures = [executor.submit(_delete_batch, batch_num, chunk) for batch_num, chunk in chunks]
-                for future in as_completed(futures):
-                    batch_result = future.result()
-                    batch_num = int(batch_result["batch_num"])
-                    chunk = batch_result["chunk"]
-                    chunk_size = int(batch_result["chunk_size"])
-                    error_text = batch_result.get("error")
+    def _drain(block: bool) -> None:
+        """Забирает завершённые батчи; block=True — ждёт хотя бы один."""
+        if not in_flight:
+            return
+        done, _ = wait(list(in_flight), timeout=None if block else 0, return_when=FIRST_COMPLETED)
+        for future in done:
+            status_name, status_index, status_pass = in_flight.pop(future)
+            _record_batch(future.result(), status_name, status_pass)
+            _report("deleting", status_name, status_index, status_pass)
+
+    with ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix="hood-delete-all") as executor:
+
+        def _submit(chunk: List[str], status_name: str, status_index: int, status_pass: int) -> None:
+            nonlocal total_batches_all
+            # Backpressure: листинг не убегает дальше, чем на max_in_flight батчей.
+            while len(in_flight) >= max_in_flight:
+                _drain(block=True)
+            total_batches_all += 1
+            future = executor.submit(run_in_slot, adaptive, _delete_batch, total_batches_all, chunk)
+            in_flight[future] = (status_name, status_index, status_pass)
+
+        for status_index, status_name in enumerate(statuses, start=1):
+            status_pass = 0
+            while True:
+                status_pass += 1
+                if status_pass > max_status_passes:
+                    raise HTTPException(
+                        status_code=502,
+                        detail=(
+                            f"Delete all guard reached for status '{status_name}' "
+                            f"after {max_status_passes} passes without 'No auctions found.'"
+                        ),
+                    )
 
-                    processed_batches += 1
-                    processed_items += chunk_size
+                pass_seen: set[str] = set()
+                pending_ids: List[str] = []
+                pass_found = 0
+                exhausted_by_no_auctions = False
+                listing.clear()
+                listing.update({"status": status_name, "pass": status_pass, "pages": 0, "listed": 0, "done": False})
+
+                def _accept(page_items: List[Dict[str, Any]]) -> None:
+                    nonlocal pass_found, total_missing_item_id, total_requested
+                    for item in page_items:
+                        pass_found += 1
+                        item_id = str(item.get("itemID") or "").strip()
+                        if not item_id:
+                            missing_item_id_by_status[status_name] += 1
+                            total_missing_item_id += 1
+                            continue
+                        if item_id in pass_seen:
+                            continue
+                        pass_seen.add(item_id)
+                        pending_ids.append(item_id)
+                        requested_by_status[status_name] += 1
+                        total_requested += 1
+                    listing["pages"] += 1
+                    listing["listed"] = len(pass_seen)
+
+                def _flush(partial: bool) -> None:
+                    while len(pending_ids) >= delete_batch_size or (partial and pending_ids):
+                        chunk = pending_ids[:delete_batch_size]
+                        del pending_ids[:delete_batch_size]
+                        _submit(chunk, status_name, status_index, status_pass)
+
+                # Первый проход берёт itemID из локального зеркала без обхода itemList;
+                # дальше — itemList до "No auctions found.".
+                mirror_ids = mirror_item_ids(cfg, status_name) if status_pass == 1 else None
+                if mirror_ids:
+                    seeded_from_mirror[status_name] = len(mirror_ids)
+                    for i in range(0, len(mirror_ids), 500):
+                        _accept([{"itemID": item_id} for item_id in mirror_ids[i : i + 500]])
+                        _flush(partial=False)
+                        _report("listing", status_name, status_index, status_pass)
+                else:
+                    # Страницы идут с конца списка, поэтому удаление уже прочитанных
+                    # не сдвигает ещё не прочитанные и батчи можно отправлять сразу.
+                    scan: Dict[str, Any] = {}
+                    for page_items in iter_hood_items_tail_first(
+                        cfg, item_status=status_name, group_size=500, scan_state=scan
+                    ):
+                        _accept(page_items)
+                        _flush(partial=False)
+                        _drain(block=False)
+                        _report("listing", status_name, status_index, status_pass)
+                    exhausted_by_no_auctions = bool(scan.get("no_auctions"))
+                    found_in_item_list_by_status[status_name] += pass_found
+
+                _flush(partial=True)
+                listing["done"] = True
+                _report("listing", status_name, status_index, status_pass)
+                # Следующий проход начинается, только когда удаления текущего применены.
+                while in_flight:
+                    _drain(block=True)
 
-                    if error_text:
-                        total_failed += chunk_size
-                        failed_by_status[status_name] += chunk_size
-                        logger.error(
-                            "Delete all batch failed: status=%s, pass=%s, batch=%s/%s, requested=%s, error=%s",
-                            status_name,
-                            status_pass,
-                            batch_num,
-                            total_batches_status,
-                            chunk_size,
-                            error_text,
-                        )
-                        responses.append(
-                            {
-                                "success": False,
-                                "status_scope": status_name,
-                                "error": error_text,
-                                "requested_item_ids": chunk,
-                            }
-                        )
-                        if progress_cb is not None:
-                            progress_cb(
-                                {
-                                    "phase": "deleting",
-                                    "status": status_name,
-                                    "status_index": status_index,
-                                    "status_count": len(statuses),
-                                    "status_pass": status_pass,
-                                    "requested": total_requested,
-                                    "processed": min(processed_items, total_requested),
-                                    "deleted": total_deleted,
-                                    "failed": total_failed,
-                                    "total_batches": total_batches_all,
-                                    "processed_batches": processed_batches,
-                                }
-                            )
-                        continue
-
-                    resp = batch_result["response"] or {}
-                    if isinstance(resp, dict):
-                        resp["status_scope"] = status_name
-                    responses.append(resp)
-
-                    item_results = resp.get("items", [])
-                    if item_results:
-                        batch_deleted = sum(1 for x in item_results if str(x.get("status") or "").lower() == "success")
-                        batch_failed = sum(1 for x in item_results if str(x.get("status") or "").lower() == "failed")
-                        unresolved = max(chunk_size - batch_deleted - batch_failed, 0)
-                        total_deleted += batch_deleted
-                        total_failed += batch_failed + unresolved
-                        deleted_by_status[status_name] += batch_deleted
-                        failed_by_status[status_name] += batch_failed + unresolved
-                        logger.info(
-                            "Delete all batch done: status=%s, pass=%s, batch=%s/%s, requested=%s, deleted=%s, failed=%s, unresolved=%s",
-                            status_name,
-                            status_pass,
-                            batch_num,
-                            total_batches_status,
-                            chunk_size,
-                            batch_deleted,
-                            batch_failed,
-                            unresolved,
-                        )
-                    elif resp.get("success"):
-                        total_deleted += chunk_size
-                        deleted_by_status[status_name] += chunk_size
-                        logger.info(
-                            "Delete all batch done: status=%s, pass=%s, batch=%s/%s, requested=%s, deleted=%s, failed=0",
-                            status_name,
-                            status_pass,
-                            batch_num,
-                            total_batches_status,
-                            chunk_size,
-                            chunk_size,
-                        )
-                    else:
-                        total_failed += chunk_size
-                        failed_by_status[status_name] += chunk_size
-                        logger.warning(
-                            "Delete all batch done: status=%s, pass=%s, batch=%s/%s, requested=%s, deleted=0, failed=%s",
-                            status_name,
-                            status_pass,
-                            batch_num,
-                            total_batches_status,
-                            chunk_size,
-                            chunk_size,
-                        )
+                logger.info(
+                    "Delete all status pass: status=%s, pass=%s, found_in_item_list=%s, exhausted_by_no_auctions=%s, status_index=%s/%s",
+                    status_name,
+                    status_pass,
+                    pass_found,
+                    exhausted_by_no_auctions,
+                    status_index,
+                    len(statuses),
+                )
 
-                    if progress_cb is not None:
-                        progress_cb(
-                            {
-                                "phase": "deleting",
-                                "status": status_name,
-                                "status_index": status_index,
-                                "status_count": len(statuses),
-                                "status_pass": status_pass,
-                                "requested": total_requested,
-                                "processed": min(processed_items, total_requested),
-                                "deleted": total_deleted,
-                                "failed": total_failed,
-                                "total_batches": total_batches_all,
-                                "processed_batches": processed_batches,
-                            }
-                        )
+                # Move to the next status only after explicit "No auctions found."
+                if exhausted_by_no_auctions and not pass_seen:
+                    clear_hood_status(cfg, status_name)
+                    break
 
     logger.info(
         "Delete all done: item_status=%s, requested=%s, deleted=%s, failed=%s, missing_item_id=%s",
@@ -3109,6 +3618,8 @@ def _run_delete_all_items_from_hood(
         "account": account_mode,
         "found_in_item_list": sum(found_in_item_list_by_status.values()),
         "found_in_item_list_by_status": found_in_item_list_by_status,
+        "seeded_from_mirror_by_status": seeded_from_mirror,
+        "mirror_unconfirmed_by_status": mirror_unconfirmed_by_status,
         "missing_item_id": total_missing_item_id,
         "missing_item_id_by_status": missing_item_id_by_status,
         "requested": total_requested,
@@ -3117,7 +3628,7 @@ def _run_delete_all_items_from_hood(
         "deleted_by_status": deleted_by_status,
         "failed": total_failed,
         "failed_by_status": failed_by_status,
-        "details": responses,
+        "details": sink.failures_sample() if sink is not None else responses,
     }
 
 
@@ -3138,13 +3649,21 @@ def delete_all_items_from_hood(
     )
 
 
-@router.post("/update_prices")
-def update_prices(account: str | None = Query(default=None)) -> Dict[str, Any]:
+def _run_update_prices(
+    account: str | None,
+    mode: str = "full",
+    workers: int = 1,
+    progress_cb: Callable[[Dict[str, Any]], None] | None = None,
+    sink: ResultSink | None = None,
+) -> Dict[str, Any]:
     """
     РњР°СЃСЃРѕРІРѕРµ РѕР±РЅРѕРІР»РµРЅРёРµ С†РµРЅ РїРѕ EAN РёР· CSV (PRICE_SHEET_PATH).
     Р”Р»СЏ РІСЃРµС… С‚РѕРІР°СЂРѕРІ СЃРµСЂРІРµСЂР° РёС‰РµРј EAN РІ РїСЂР°Р№СЃвЂ‘Р»РёСЃС‚Рµ Рё РІС‹Р·С‹РІР°РµРј itemUpdate РїРѕ itemID.
+    mode=price — только цена/количество (build_item_price_update) и только для товаров,
+    чья цена изменилась с последней успешной отправки; описания HTML не читаются.
     """
     account_mode = _account_mode(account)
+    mode = resolve_update_mode(mode, allowed=PRICE_UPDATE_MODES)
     cfg = ApiConfig.from_env(account=account_mode)
     price_sheet_path = get_price_sheet_for_account(account_mode)
     json_folder = get_json_folder_for_account(account_mode)
@@ -3153,36 +3672,191 @@ def update_prices(account: str | None = Query(default=None)) -> Dict[str, Any]:
     server_items = load_all_items(json_folder=json_folder)
 
     updates: List[Dict[str, Any]] = []
-    for raw in server_items:
-        norm = normalize_item(raw)
+    for norm in normalize_items_cached(server_items, compact=True):
         ean = norm.get("ean")
         if not ean or ean not in prices:
             continue
         new_price = prices[ean]
-        api_description = _resolve_description_for_api(norm, html_folder=html_folder)
-        payload = _build_item_payload_from_norm(norm, api_description)
+        if mode == "price":
+            payload = {"quantity": norm.get("quantity")}
+        else:
+            api_description = _resolve_description_for_api(norm, html_folder=html_folder)
+            payload = _build_item_payload_from_norm(norm, api_description)
         payload["item_number"] = str(norm.get("item_number") or ean)
         payload["price"] = str(new_price)
         updates.append(payload)
 
     if not updates:
-        return {"updated": 0, "details": [], "message": "РќРµС‚ С‚РѕРІР°СЂРѕРІ РґР»СЏ РѕР±РЅРѕРІР»РµРЅРёСЏ С†РµРЅ"}
+        return {
+            "account": account_mode,
+            "mode": mode,
+            "prepared": 0,
+            "unchanged": 0,
+            "sent": 0,
+            "updated": 0,
+            "failed": 0,
+            "workers": workers,
+            "concurrency": current_limit(get_concurrency_limiter(cfg), workers),
+            "details": [],
+            "message": "РќРµС‚ С‚РѕРІР°СЂРѕРІ РґР»СЏ РѕР±РЅРѕРІР»РµРЅРёСЏ С†РµРЅ",
+        }
+
+    prepared_count = len(updates)
+    if mode == "price":
+        updates, unchanged = split_unchanged_prices(cfg, updates)
+        fingerprints: Dict[str, str] = {}
+        build_xml = build_item_price_update
+    else:
+        updates, unchanged, fingerprints = split_unchanged_payloads(cfg, updates, mode)
+        build_xml = build_item_update
 
     # itemUpdate РїСЂРёРЅРёРјР°РµС‚ РґРѕ 5 С‚РѕРІР°СЂРѕРІ Р·Р° СЂР°Р· вЂ” Р±СЊС‘Рј РЅР° С‡Р°РЅРєРё
     chunks = [updates[i : i + 5] for i in range(0, len(updates), 5)]
-    all_responses: List[Dict[str, Any]] = []
-    duplicate_cleanup_cache: Dict[str, Any] = {}
+    if progress_cb is not None:
+        progress_cb(
+            {
+                "phase": "prepared",
+                "mode": mode,
+                "prepared": prepared_count,
+                "unchanged": len(unchanged),
+                "total_chunks": len(chunks),
+                "total_items": len(updates),
+                "processed_chunks": 0,
+                "processed_items": 0,
+                "updated": 0,
+                "failed": 0,
+                "workers": workers,
+            }
+        )
 
-    for chunk in chunks:
-        chunk_result = _send_update_chunk_with_duplicate_cleanup(chunk=chunk, cfg=cfg, cache=duplicate_cleanup_cache)
-        all_responses.extend(chunk_result["details"])
+    chunk_run = _run_update_chunks(
+        chunks, cfg, workers, progress_cb=progress_cb, build_xml=build_xml, sink=sink, fingerprints=fingerprints
+    )
+
+    if progress_cb is not None:
+        progress_cb(
+            {
+                "phase": "completed",
+                "result_summary": {
+                    "updated": chunk_run["updated"],
+                    "failed": chunk_run["failed"],
+                    "unchanged": len(unchanged),
+                },
+            }
+        )
+    return {
+        "account": account_mode,
+        "mode": mode,
+        "prepared": prepared_count,
+        "unchanged": len(unchanged),
+        "sent": len(updates),
+        "updated": chunk_run["updated"],
+        "failed": chunk_run["failed"],
+        "workers": workers,
+        "concurrency": chunk_run["concurrency"],
+        "details": chunk_run["details"],
+    }
+
+
+@router.post("/update_prices")
+def update_prices(
+    account: str | None = Query(default=None),
+    mode: str = Query(default="full"),
+    workers: int = Query(default=1, ge=1, le=10),
+) -> Dict[str, Any]:
+    """Синхронное обновление цен; для больших прайсов — /update_prices_async."""
+    mode = _update_mode(mode, allowed=PRICE_UPDATE_MODES)
+    try:
+        return _run_update_prices(account=account, mode=mode, workers=workers)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    except FileNotFoundError as exc:
+        raise HTTPException(status_code=404, detail=str(exc))
+
+
+def _run_update_prices_job(job_id: str, account: str | None, mode: str, workers: int) -> None:
+    _set_update_job(
+        job_id,
+        {
+            "status": "running",
+            "started_at": _utc_now_iso(),
+        },
+    )
+
+    def progress_cb(progress: Dict[str, Any]) -> None:
+        _set_update_job(job_id, {"progress": progress, "last_update_at": _utc_now_iso()})
 
+    sink = ResultSink("update", job_id)
+    try:
+        result = _run_update_prices(account=account, mode=mode, workers=workers, progress_cb=progress_cb, sink=sink)
+    except Exception as exc:
+        sink.close()
+        _set_update_job(
+            job_id,
+            {
+                "status": "failed",
+                "finished_at": _utc_now_iso(),
+                "error": str(exc),
+                "details_log": sink.summary(),
+                "progress": {"phase": "failed"},
+            },
+        )
+        return
+
+    sink.close()
+    _set_update_job(
+        job_id,
+        {
+            "status": "completed",
+            "finished_at": _utc_now_iso(),
+            "result": result,
+            "details_log": sink.summary(),
+            "progress": {
+                "phase": "completed",
+                "total_items": result.get("sent", 0),
+                "processed_items": result.get("sent", 0),
+                "updated": result.get("updated", 0),
+                "failed": result.get("failed", 0),
+                "unchanged": result.get("unchanged", 0),
+            },
+        },
+    )
+
+
+@router.post("/update_prices_async")
+def update_prices_async(
+    background_tasks: BackgroundTasks,
+    account: str | None = Query(default=None),
+    mode: str = Query(default="full"),
+    workers: int = Query(default=4, ge=1, le=10),
+) -> Dict[str, Any]:
+    _account_mode(account)
+    mode = _update_mode(mode, allowed=PRICE_UPDATE_MODES)
+    job_id = uuid4().hex
+    _set_update_job(
+        job_id,
+        {
+            "job_id": job_id,
+            "status": "queued",
+            "created_at": _utc_now_iso(),
+            "account": account,
+            "kind": "update_prices",
+            "mode": mode,
+            "workers": workers,
+        },
+    )
+    background_tasks.add_task(_run_update_prices_job, job_id, account, mode, workers)
     return {
-        "updated": len(updates),
-        "details": all_responses,
+        "job_id": job_id,
+        "status": "queued",
+        "status_url": f"/api/items/update_prices_async/{job_id}",
     }
 
 
+@router.get("/update_prices_async/{job_id}")
+def update_prices_async_status(job_id: str) -> Dict[str, Any]:
+    return items_update_async_status(job_id)
+
 
 class UploadMissingRequest(BaseModel):
     item_ids: List[int]
@@ -3232,93 +3906,132 @@ def upload_missing_selected(
 def upload_all_missing(
     account: str | None = Query(default=None),
     limit: int = Query(default=0, ge=0),
+    stream: str | None = Query(default=None),
 ) -> Dict[str, Any]:
+    """
+    Загружает в Hood товары из JSON, которых там ещё нет (limit=0 — все).
+    stream=ndjson — итог каждого товара отдаётся строкой по мере загрузки, последней строкой — сводка.
+    """
     account_mode = _account_mode(account)
+    if _stream_mode(stream):
+        return ndjson_stream_response(lambda sink: _run_upload_all_missing(account_mode, limit, sink=sink))
+    return _run_upload_all_missing(account_mode, limit)
+
+
+def _run_upload_all_missing(account_mode: str | None, limit: int, sink: ResultSink | None = None) -> Dict[str, Any]:
     cfg = ApiConfig.from_env(account=account_mode)
     json_folder = get_json_folder_for_account(account_mode)
     all_items = load_all_items(json_folder=json_folder)
     available = len(all_items)
     server_items = all_items if limit <= 0 else all_items[:limit]
     checked = len(server_items)
+    # С зеркалом проверка — поиск по индексу по всем статусам (как itemDetail); без него — itemDetail на каждый товар.
+    hood_numbers: set[str] | None = None
+    if ensure_hood_mirror(cfg) is not None:
+        hood_numbers = set()
+        for status_name in snapshot_statuses():
+            hood_numbers.update(hood_item_number_to_ids(cfg, item_status=status_name))
 
     results: List[Dict[str, Any]] = []
-    for raw in server_items:
+    for raw, norm in zip(server_items, normalize_items_cached(server_items, compact=True)):
         item_id_local = str(raw.get("ID") or raw.get("id") or "").strip()
-        norm = normalize_item(raw)
         item_number = str(norm.get("item_number") or norm.get("ean") or "").strip()
         if not item_number:
-            results.append(
+            _collect_result(
+                results,
+                sink,
                 {
                     "item_id_local": item_id_local or None,
                     "status": "skipped",
                     "reason": "missing_item_number",
-                }
+                },
+                success=False,
             )
             continue
 
-        exists, should_upload, check_error = _exists_in_hood(item_number, cfg)
+        if hood_numbers is not None:
+            exists, should_upload, check_error = item_number in hood_numbers, True, None
+        else:
+            exists, should_upload, check_error = _exists_in_hood(item_number, cfg)
         if exists:
             continue
 
         if not should_upload:
-            results.append(
+            _collect_result(
+                results,
+                sink,
                 {
                     "item_id_local": item_id_local or None,
                     "item_number": item_number,
                     "status": "error",
                     "error": check_error or "item check failed",
-                }
+                },
+                success=False,
             )
             continue
 
         if not item_id_local:
-            results.append(
+            _collect_result(
+                results,
+                sink,
                 {
                     "item_id_local": None,
                     "item_number": item_number,
                     "status": "error",
                     "error": "local item ID missing",
-                }
+                },
+                success=False,
             )
             continue
 
         try:
             resp = _upload_one_by_id(item_id=item_id_local, account=account_mode)
         except HTTPException as exc:
-            results.append(
+            _collect_result(
+                results,
+                sink,
                 {
                     "item_id_local": item_id_local,
                     "item_number": item_number,
                     "status": "upload_error",
                     "error": str(exc.detail or exc),
-                }
+                },
+                success=False,
             )
             continue
         except Exception as exc:
-            results.append(
+            _collect_result(
+                results,
+                sink,
                 {
                     "item_id_local": item_id_local,
                     "item_number": item_number,
                     "status": "upload_error",
                     "error": str(exc),
-                }
+                },
+                success=False,
             )
             continue
 
-        results.append(
+        _collect_result(
+            results,
+            sink,
             {
                 "item_id_local": item_id_local,
                 "item_number": item_number,
                 "status": "uploaded",
                 "response": resp,
-            }
+            },
+            success=True,
         )
 
-    return {
+    result: Dict[str, Any] = {
         "account": account_mode,
         "available": available,
         "checked": checked,
         "limit": limit,
-        "processed": len(results),
-        "results": results,
+        "processed": sink.success + sink.failed if sink is not None else len(results),
     }
+    if sink is None:
+        result["results"] = results
+    return result
@@ -0,0 +1,209 @@
+"""
+Отпечатки отправленных в Hood payload itemUpdate и последние отправленные цены (по itemNumber).
+Режим mode=delta пропускает товары, у которых payload не изменился с последнего успешного обновления,
+mode=price (update_prices) — товары, у которых не изменились цена и количество.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
+from app.config import settings
+from hood_api.config import ApiConfig
+
+UPDATE_MODES = ("full", "delta")
+PRICE_UPDATE_MODES = ("full", "delta", "price")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS update_fingerprints (
+    account TEXT NOT NULL,
+    item_number TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    PRIMARY KEY (account, item_number)
+);
+CREATE TABLE IF NOT EXISTS last_prices (
+    account TEXT NOT NULL,
+    item_number TEXT NOT NULL,
+    price TEXT NOT NULL,
+    quantity INTEGER,
+    updated_at TEXT NOT NULL,
+    PRIMARY KEY (account, item_number)
+);
+"""
+
+_STORE: "FingerprintStore | None" = None
+_STORE_LOCK = threading.Lock()
+
+
+def payload_fingerprint(payload: Dict[str, Any]) -> str:
+    """
+    Стабильный хэш payload: порядок ключей не влияет. Компактные productProperties (пары name, value)
+    хэшируются как прежние словари — отпечаток не зависит от формы нормализованного товара.
+    """
+    props = payload.get("product_properties")
+    if props and not isinstance(props[0], dict):
+        payload = dict(payload, product_properties=[{"name": name, "value": value} for name, value in props])
+    encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def resolve_update_mode(mode: str | None, allowed: Tuple[str, ...] = UPDATE_MODES) -> str:
+    value = str(mode or "full").strip().lower()
+    if value not in allowed:
+        raise ValueError(f"mode must be one of: {', '.join(allowed)}")
+    return value
+
+
+def _price_key(payload: Dict[str, Any]) -> Tuple[str, int | None]:
+    price = str(payload.get("price") or "0").strip()
+    try:
+        price = f"{float(price.replace(',', '.')):.2f}"
+    except ValueError:
+        pass
+    quantity = payload.get("quantity")
+    return price, int(quantity) if quantity is not None else None
+
+
+class FingerprintStore:
+    def __init__(self, db_path: str) -> None:
+        self.db_path = db_path
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _select(self, sql: str, account: str, item_numbers: Iterable[str]) -> List[tuple]:
+        numbers = list(item_numbers)
+        rows: List[tuple] = []
+        with self._connect() as conn:
+            # SQLite ограничивает число параметров в запросе.
+            for i in range(0, len(numbers), 500):
+                chunk = numbers[i : i + 500]
+                marks = ",".join("?" for _ in chunk)
+                rows.extend(conn.execute(sql.format(marks=marks), (account, *chunk)).fetchall())
+        return rows
+
+    def get_many(self, account: str, item_numbers: Iterable[str]) -> Dict[str, str]:
+        rows = self._select(
+            "SELECT item_number, fingerprint FROM update_fingerprints WHERE account = ? AND item_number IN ({marks})",
+            account,
+            item_numbers,
+        )
+        return {number: fingerprint for number, fingerprint in rows}
+
+    def get_prices(self, account: str, item_numbers: Iterable[str]) -> Dict[str, Tuple[str, int | None]]:
+        rows = self._select(
+            "SELECT item_number, price, quantity FROM last_prices WHERE account = ? AND item_number IN ({marks})",
+            account,
+            item_numbers,
+        )
+        return {number: (price, quantity) for number, price, quantity in rows}
+
+    def put_prices(self, account: str, prices: Dict[str, Tuple[str, int | None]]) -> None:
+        if not prices:
+            return
+        now = datetime.now(timezone.utc).isoformat()
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT INTO last_prices (account, item_number, price, quantity, updated_at) "
+                "VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (account, item_number) DO UPDATE SET "
+                "price = excluded.price, quantity = excluded.quantity, updated_at = excluded.updated_at",
+                [(account, number, price, quantity, now) for number, (price, quantity) in prices.items()],
+            )
+
+    def put_many(self, account: str, fingerprints: Dict[str, str]) -> None:
+        if not fingerprints:
+            return
+        now = datetime.now(timezone.utc).isoformat()
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT INTO update_fingerprints (account, item_number, fingerprint, updated_at) "
+                "VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (account, item_number) DO UPDATE SET "
+                "fingerprint = excluded.fingerprint, updated_at = excluded.updated_at",
+                [(account, number, fingerprint, now) for number, fingerprint in fingerprints.items()],
+            )
+
+
+def get_fingerprint_store() -> FingerprintStore:
+    global _STORE
+    with _STORE_LOCK:
+        if _STORE is None:
+            _STORE = FingerprintStore(str(Path(settings.STATE_FOLDER) / "update_fingerprints.sqlite3"))
+        return _STORE
+
+
+def _account_key(cfg: ApiConfig) -> str:
+    return str(cfg.user or "").strip().lower()
+
+
+def split_unchanged_payloads(
+    cfg: ApiConfig,
+    payloads: List[Dict[str, Any]],
+    mode: str,
+) -> Tuple[List[Dict[str, Any]], List[str], Dict[str, str]]:
+    """
+    Считает отпечатки payload (ключ — payload["item_number"]).
+    В режиме delta отбрасывает неизменившиеся; возвращает (к отправке, пропущенные itemNumber, отпечатки).
+    """
+    fingerprints = {str(p["item_number"]): payload_fingerprint(p) for p in payloads}
+    if mode != "delta" or not payloads:
+        return payloads, [], fingerprints
+    stored = get_fingerprint_store().get_many(_account_key(cfg), fingerprints.keys())
+    to_send: List[Dict[str, Any]] = []
+    unchanged: List[str] = []
+    for payload in payloads:
+        number = str(payload["item_number"])
+        if stored.get(number) == fingerprints[number]:
+            unchanged.append(number)
+        else:
+            to_send.append(payload)
+    return to_send, unchanged, fingerprints
+
+
+def record_fingerprints(cfg: ApiConfig, fingerprints: Dict[str, str], updated_item_numbers: Iterable[str]) -> None:
+    """Запоминает отпечатки только успешно обновлённых товаров."""
+    accepted = {n: fingerprints[n] for n in updated_item_numbers if n in fingerprints}
+    get_fingerprint_store().put_many(_account_key(cfg), accepted)
+
+
+def split_unchanged_prices(
+    cfg: ApiConfig,
+    payloads: List[Dict[str, Any]],
+) -> Tuple[List[Dict[str, Any]], List[str]]:
+    """Оставляет только товары, у которых цена или количество отличаются от последних отправленных."""
+    if not payloads:
+        return payloads, []
+    stored = get_fingerprint_store().get_prices(_account_key(cfg), [str(p["item_number"]) for p in payloads])
+    to_send: List[Dict[str, Any]] = []
+    unchanged: List[str] = []
+    for payload in payloads:
+        number = str(payload["item_number"])
+        if stored.get(number) == _price_key(payload):
+            unchanged.append(number)
+        else:
+            to_send.append(payload)
+    return to_send, unchanged
+
+
+def record_prices(cfg: ApiConfig, payloads: List[Dict[str, Any]], updated_item_numbers: Iterable[str]) -> None:
+    """Запоминает цену/количество успешно обновлённых товаров (после полного или ценового itemUpdate)."""
+    updated = set(updated_item_numbers)
+    prices = {str(p["item_number"]): _price_key(p) for p in payloads if str(p["item_number"]) in updated}
+    get_fingerprint_store().put_prices(_account_key(cfg), prices)
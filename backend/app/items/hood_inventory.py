@@ -0,0 +1,231 @@
+"""
+Чтение инвентаря Hood через itemList (постранично).
+Первая страница сообщает totalRecords и фактический groupSize, после чего смещения остальных страниц
+известны заранее: их запрашиваем параллельно (до HOOD_ITEM_LIST_PREFETCH запросов в полёте)
+и отдаём строго по порядку. Без totalRecords — последовательно, как раньше.
+"""
+
+import os
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from itertools import islice
+from typing import Any, Callable, Deque, Dict, Iterator, List, Tuple
+
+from fastapi import HTTPException
+
+from hood_api.api.parsers import iter_item_list_response
+from hood_api.builders import build_item_list
+from hood_api.client import send_request
+from hood_api.concurrency import AdaptiveConcurrencyLimiter, get_concurrency_limiter, run_in_slot
+from hood_api.config import ApiConfig
+
+
+def _page_limiter(cfg: ApiConfig) -> AdaptiveConcurrencyLimiter | None:
+    """
+    Лимитер для запросов страниц. Если текущий поток уже держит слот (обход вызван из воркера
+    update/delete), страницы, в том числе из потоков предзагрузки, идут под этим слотом:
+    ожидание новых слотов при лимите, занятом самими воркерами, заблокировало бы обход навсегда.
+    """
+    adaptive = get_concurrency_limiter(cfg)
+    if adaptive is not None and adaptive.held():
+        return None
+    return adaptive
+
+
+def fetch_item_list_page(
+    cfg: ApiConfig,
+    item_status: str,
+    start_at: int,
+    group_size: int,
+    start_date: str | None,
+    end_date: str | None,
+) -> Tuple[List[Dict[str, Any]] | None, Dict[str, Any]]:
+    """Одна страница itemList: (товары, сводка). None вместо товаров — "No auctions found"."""
+    xml_body = build_item_list(
+        item_status=item_status,
+        start_at=start_at,
+        group_size=group_size,
+        start_date=start_date,
+        end_date=end_date,
+        config=cfg,
+    )
+    try:
+        response_xml = send_request(xml_body, config=cfg)
+    except Exception as exc:
+        raise HTTPException(status_code=502, detail=str(exc))
+
+    page: Dict[str, Any] = {}
+    page_items = list(iter_item_list_response(response_xml, page))
+    del response_xml
+    errors = page.get("errors") or []
+    if errors and any("no auctions found" in str(err).strip().lower() for err in errors):
+        return None, page
+    if errors:
+        raise HTTPException(
+            status_code=502,
+            detail={"message": page.get("message"), "errors": errors},
+        )
+    return page_items, page
+
+
+def iter_all_hood_items(
+    cfg: ApiConfig,
+    item_status: str = "running",
+    group_size: int = 500,
+    progress_cb: Callable[[Dict[str, Any]], None] | None = None,
+    start_date: str | None = None,
+    end_date: str | None = None,
+    scan_state: Dict[str, Any] | None = None,
+) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Товары статуса страницами itemList (start_date/end_date в формате DD/MM/YYYY сужают выборку по dateRange).
+    В памяти только текущая страница и уже запрошенные следующие; ответы разбираются потоково.
+    Ответ "No auctions found" означает конец списка, а не ошибку (scan_state["no_auctions"] = True).
+    """
+    prefetch = max(1, min(int(os.environ.get("HOOD_ITEM_LIST_PREFETCH", "4")), 16))
+    adaptive = _page_limiter(cfg)
+
+    def fetch(offset: int) -> Tuple[List[Dict[str, Any]] | None, Dict[str, Any]]:
+        return run_in_slot(
+            adaptive, fetch_item_list_page, cfg, item_status, offset, group_size, start_date, end_date
+        )
+
+    executor: ThreadPoolExecutor | None = None
+    pending: Deque[Tuple[int, Future]] = deque()
+    next_offset = 0
+    fetched = 0
+    start_at = 1
+    page_items, page = fetch(start_at)
+
+    try:
+        while True:
+            if page_items is None:
+                if scan_state is not None:
+                    scan_state["no_auctions"] = True
+                return
+
+            fetched += len(page_items)
+            total_records = int(page.get("total_records") or 0)
+            if progress_cb is not None:
+                progress_cb(
+                    {
+                        "phase": "loading_items",
+                        "fetched_items": fetched,
+                        "total_items": total_records if total_records > 0 else None,
+                        "start_at": int(page.get("start_at") or start_at),
+                        "group_size": int(page.get("group_size") or len(page_items) or group_size),
+                        "prefetch": len(pending),
+                    }
+                )
+
+            if not page_items:
+                return
+            yield page_items
+
+            if total_records and fetched >= total_records:
+                return
+            # Hood can cap groupSize in response; use the effective page size for pagination.
+            effective_group_size = int(page.get("group_size") or 0)
+            step = effective_group_size if effective_group_size > 0 else len(page_items)
+            if len(page_items) < step:
+                return
+
+            start_at += step
+            if prefetch > 1 and total_records:
+                if executor is None:
+                    executor = ThreadPoolExecutor(max_workers=prefetch, thread_name_prefix="hood-item-list")
+                next_offset = max(next_offset, start_at)
+                while len(pending) < prefetch and next_offset <= total_records:
+                    pending.append((next_offset, executor.submit(fetch, next_offset)))
+                    next_offset += step
+
+            if pending and pending[0][0] == start_at:
+                page_items, page = pending.popleft()[1].result()
+            else:
+                # Смещения разошлись с запланированными (Hood сменил groupSize) — дальше по одной странице.
+                while pending:
+                    pending.popleft()[1].cancel()
+                next_offset = 0
+                page_items, page = fetch(start_at)
+    finally:
+        for _, future in pending:
+            future.cancel()
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+def iter_hood_items_tail_first(
+    cfg: ApiConfig,
+    item_status: str = "running",
+    group_size: int = 500,
+    scan_state: Dict[str, Any] | None = None,
+) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Страницы itemList в порядке, безопасном для удаления по ходу обхода: после первой страницы
+    (она даёт totalRecords) остальные идут с конца списка к началу, а первая отдаётся последней.
+    Удаление уже отданных товаров сдвигает только позиции за ними, поэтому ещё не прочитанные страницы
+    не съезжают. Страницы с конца запрашиваются заранее (HOOD_ITEM_LIST_PREFETCH).
+    Без totalRecords весь список сначала читается обычным обходом и только потом отдаётся.
+    """
+    prefetch = max(1, min(int(os.environ.get("HOOD_ITEM_LIST_PREFETCH", "4")), 16))
+    adaptive = _page_limiter(cfg)
+
+    def fetch(offset: int, size: int) -> Tuple[List[Dict[str, Any]] | None, Dict[str, Any]]:
+        return run_in_slot(adaptive, fetch_item_list_page, cfg, item_status, offset, size, None, None)
+
+    head_items, head = fetch(1, group_size)
+    if head_items is None:
+        if scan_state is not None:
+            scan_state["no_auctions"] = True
+        return
+    total_records = int(head.get("total_records") or 0)
+    step = int(head.get("group_size") or 0) or len(head_items)
+    if not head_items or len(head_items) < step:
+        if head_items:
+            yield head_items
+        return
+    if not total_records:
+        pages = list(iter_all_hood_items(cfg, item_status=item_status, group_size=group_size, scan_state=scan_state))
+        yield from reversed(pages)
+        return
+
+    ranges: List[Tuple[int, int]] = []
+    end = total_records
+    while end > step:
+        start = max(step + 1, end - step + 1)
+        ranges.append((start, end - start + 1))
+        end = start - 1
+
+    pending: Deque[Future] = deque()
+    with ThreadPoolExecutor(max_workers=prefetch, thread_name_prefix="hood-item-list") as executor:
+        try:
+            queued = iter(ranges)
+            for offset, size in islice(queued, prefetch):
+                pending.append(executor.submit(fetch, offset, size))
+            while pending:
+                page_items, _ = pending.popleft().result()
+                next_range = next(queued, None)
+                if next_range is not None:
+                    pending.append(executor.submit(fetch, *next_range))
+                # "No auctions found" на странице с конца: список успел сократиться.
+                if page_items:
+                    yield page_items
+        finally:
+            for future in pending:
+                future.cancel()
+    yield head_items
+
+
+def load_all_hood_items(
+    cfg: ApiConfig,
+    item_status: str = "running",
+    group_size: int = 500,
+    progress_cb: Callable[[Dict[str, Any]], None] | None = None,
+    start_date: str | None = None,
+    end_date: str | None = None,
+) -> List[Dict[str, Any]]:
+    """Все товары статуса одним списком (см. iter_all_hood_items)."""
+    items: List[Dict[str, Any]] = []
+    for page in iter_all_hood_items(cfg, item_status, group_size, progress_cb, start_date, end_date):
+        items.extend(page)
+    return items
@@ -0,0 +1,467 @@
+"""
+Локальное зеркало инвентаря Hood в SQLite: itemID, itemNumber, referenceID, статус, last_seen.
+Полное обновление — постраничный itemList, дальше инкрементально через dateRange itemList; dateRange не сообщает
+об удалённых товарах, поэтому после инкремента число товаров сверяется с totalRecords и при расхождении
+зеркало перечитывается полностью. Товары, загруженные приложением, попадают в зеркало сразу (remember_hood_items).
+Поиск по itemNumber/referenceID идёт по индексам вместо обхода всего инвентаря.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List
+
+from app.config import settings
+from app.items.hood_inventory import fetch_item_list_page, iter_all_hood_items, load_all_hood_items
+from app.logger import get_logger
+from hood_api.config import ApiConfig
+
+logger = get_logger("items")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS hood_items (
+    account TEXT NOT NULL,
+    item_id TEXT NOT NULL,
+    item_number TEXT,
+    reference_id TEXT,
+    status TEXT NOT NULL,
+    last_seen TEXT NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (account, item_id)
+);
+CREATE INDEX IF NOT EXISTS idx_hood_items_number ON hood_items (account, item_number);
+CREATE INDEX IF NOT EXISTS idx_hood_items_reference ON hood_items (account, reference_id);
+CREATE INDEX IF NOT EXISTS idx_hood_items_status ON hood_items (account, status);
+CREATE TABLE IF NOT EXISTS hood_sync_state (
+    account TEXT NOT NULL,
+    status TEXT NOT NULL,
+    last_full_sync TEXT,
+    last_sync TEXT,
+    PRIMARY KEY (account, status)
+);
+"""
+
+_UPSERT_SQL = (
+    "INSERT INTO hood_items (account, item_id, item_number, reference_id, status, last_seen, data) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?) "
+    "ON CONFLICT (account, item_id) DO UPDATE SET item_number = excluded.item_number, "
+    "reference_id = excluded.reference_id, status = excluded.status, "
+    "last_seen = excluded.last_seen, data = excluded.data"
+)
+
+_MIRROR: "HoodMirror | None" = None
+_MIRROR_LOCK = threading.Lock()
+_REFRESH_LOCKS: Dict[tuple[str, str], threading.Lock] = {}
+# (account, status) -> totalRecords минус строки зеркала сразу после полного обновления
+# (товары без itemID в зеркало не попадают); сверка после инкремента ждёт ту же разницу.
+_FULL_SYNC_DRIFT: Dict[tuple[str, str], int] = {}
+
+
+def _utc_now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _parse_ts(value: str | None) -> datetime | None:
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return None
+
+
+def _account_key(cfg: ApiConfig) -> str:
+    return str(cfg.user or "").strip().lower()
+
+
+class HoodMirror:
+    """Хранилище зеркала; одно SQLite-соединение на вызов, безопасно для потоков задач."""
+
+    def __init__(self, db_path: str) -> None:
+        self.db_path = db_path
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _rows(account: str, status: str, items: Iterable[Dict[str, Any]], seen_at: str) -> List[tuple]:
+        rows = []
+        for it in items:
+            item_id = str(it.get("itemID") or "").strip()
+            if not item_id:
+                continue
+            rows.append(
+                (
+                    account,
+                    item_id,
+                    str(it.get("itemNumber") or "").strip() or None,
+                    str(it.get("referenceID") or "").strip() or None,
+                    status,
+                    seen_at,
+                    json.dumps(it, ensure_ascii=False),
+                )
+            )
+        return rows
+
+    def upsert_items(self, account: str, status: str, items: Iterable[Dict[str, Any]], full: bool = False) -> int:
+        """
+        Записывает товары одного статуса. full=True — это полный список статуса:
+        всё, что не встретилось, удаляется из зеркала.
+        """
+        return self.upsert_pages(account, status, [items], full=full)
+
+    def upsert_pages(
+        self,
+        account: str,
+        status: str,
+        pages: Iterable[Iterable[Dict[str, Any]]],
+        full: bool = False,
+    ) -> int:
+        """
+        Как upsert_items, но товары приходят страницами (iter_all_hood_items): каждая страница пишется
+        своей транзакцией, весь список в памяти не собирается. Удаление невстреченных (full) и отметка
+        синхронизации — только после последней страницы; если обход прервался, зеркало лишь дополнено.
+        """
+        seen_at = _utc_now().isoformat()
+        stored = 0
+        for page in pages:
+            rows = self._rows(account, status, page, seen_at)
+            with self._connect() as conn:
+                conn.executemany(_UPSERT_SQL, rows)
+            stored += len(rows)
+        with self._connect() as conn:
+            if full:
+                conn.execute(
+                    "DELETE FROM hood_items WHERE account = ? AND status = ? AND last_seen < ?",
+                    (account, status, seen_at),
+                )
+            conn.execute(
+                "INSERT INTO hood_sync_state (account, status, last_full_sync, last_sync) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (account, status) DO UPDATE SET last_sync = excluded.last_sync"
+                + (", last_full_sync = excluded.last_full_sync" if full else ""),
+                (account, status, seen_at if full else None, seen_at),
+            )
+        return stored
+
+    def remember_items(self, account: str, status: str, items: Iterable[Dict[str, Any]]) -> int:
+        """Дописывает отдельные товары (например, только что загруженные), отметку синхронизации не трогает."""
+        rows = self._rows(account, status, items, _utc_now().isoformat())
+        if rows:
+            with self._connect() as conn:
+                conn.executemany(_UPSERT_SQL, rows)
+        return len(rows)
+
+    def count(self, account: str, status: str) -> int:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT COUNT(*) FROM hood_items WHERE account = ? AND status = ?",
+                (account, status),
+            ).fetchone()
+        return int(row[0])
+
+    def forget_item_ids(self, account: str, item_ids: Iterable[str]) -> None:
+        ids = [(account, str(x)) for x in item_ids if str(x or "").strip()]
+        if not ids:
+            return
+        with self._connect() as conn:
+            conn.executemany("DELETE FROM hood_items WHERE account = ? AND item_id = ?", ids)
+
+    def forget_item_numbers(self, account: str, item_numbers: Iterable[str]) -> None:
+        numbers = [(account, str(x).strip()) for x in item_numbers if str(x or "").strip()]
+        if not numbers:
+            return
+        with self._connect() as conn:
+            conn.executemany("DELETE FROM hood_items WHERE account = ? AND item_number = ?", numbers)
+
+    def clear_status(self, account: str, status: str) -> None:
+        with self._connect() as conn:
+            conn.execute("DELETE FROM hood_items WHERE account = ? AND status = ?", (account, status))
+
+    def sync_state(self, account: str, status: str) -> Dict[str, datetime | None]:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT last_full_sync, last_sync FROM hood_sync_state WHERE account = ? AND status = ?",
+                (account, status),
+            ).fetchone()
+        if row is None:
+            return {"last_full_sync": None, "last_sync": None}
+        return {"last_full_sync": _parse_ts(row[0]), "last_sync": _parse_ts(row[1])}
+
+    def items(self, account: str, statuses: List[str]) -> List[Dict[str, Any]]:
+        marks = ",".join("?" for _ in statuses)
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT data FROM hood_items WHERE account = ? AND status IN ({marks}) ORDER BY rowid",
+                (account, *statuses),
+            ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def item_ids(self, account: str, status: str) -> List[str]:
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT item_id FROM hood_items WHERE account = ? AND status = ? ORDER BY rowid",
+                (account, status),
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def item_number_to_ids(self, account: str, statuses: List[str]) -> Dict[str, List[str]]:
+        marks = ",".join("?" for _ in statuses)
+        mapping: Dict[str, List[str]] = {}
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT item_number, item_id FROM hood_items "
+                f"WHERE account = ? AND status IN ({marks}) AND item_number IS NOT NULL ORDER BY rowid",
+                (account, *statuses),
+            ).fetchall()
+        for item_number, item_id in rows:
+            mapping.setdefault(item_number, []).append(item_id)
+        return mapping
+
+    def find_by_reference(self, account: str, reference_id: str, statuses: List[str]) -> List[Dict[str, Any]]:
+        marks = ",".join("?" for _ in statuses)
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT data FROM hood_items WHERE account = ? AND reference_id = ? AND status IN ({marks})",
+                (account, reference_id, *statuses),
+            ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def stats(self, account: str) -> Dict[str, Any]:
+        with self._connect() as conn:
+            counts = conn.execute(
+                "SELECT status, COUNT(*) FROM hood_items WHERE account = ? GROUP BY status",
+                (account,),
+            ).fetchall()
+            sync_rows = conn.execute(
+                "SELECT status, last_full_sync, last_sync FROM hood_sync_state WHERE account = ?",
+                (account,),
+            ).fetchall()
+        return {
+            "db_path": self.db_path,
+            "items_by_status": {status: count for status, count in counts},
+            "sync": {
+                status: {"last_full_sync": last_full, "last_sync": last_sync}
+                for status, last_full, last_sync in sync_rows
+            },
+        }
+
+
+def get_hood_mirror() -> HoodMirror | None:
+    """Общее зеркало процесса; HOOD_MIRROR_ENABLED=0 отключает его (всё читается из Hood напрямую)."""
+    global _MIRROR
+    if os.environ.get("HOOD_MIRROR_ENABLED", "1").strip().lower() not in ("1", "true", "yes"):
+        return None
+    with _MIRROR_LOCK:
+        if _MIRROR is None:
+            _MIRROR = HoodMirror(str(Path(settings.STATE_FOLDER) / "hood_mirror.sqlite3"))
+        return _MIRROR
+
+
+def _refresh_lock(account: str, status: str) -> threading.Lock:
+    with _MIRROR_LOCK:
+        return _REFRESH_LOCKS.setdefault((account, status), threading.Lock())
+
+
+def _hood_total_records(cfg: ApiConfig, item_status: str) -> int | None:
+    """totalRecords статуса одной короткой страницей itemList; None — Hood его не сообщил."""
+    page_items, page = fetch_item_list_page(cfg, item_status, 1, 1, None, None)
+    if page_items is None:
+        return 0
+    total = int(page.get("total_records") or 0)
+    return total if total > 0 else None
+
+
+def refresh_hood_mirror(
+    cfg: ApiConfig,
+    item_status: str = "running",
+    full: bool | None = None,
+    progress_cb: Callable[[Dict[str, Any]], None] | None = None,
+) -> Dict[str, Any]:
+    """
+    Обновляет зеркало для одного статуса.
+    full=None: полный проход, если его не было или он старше HOOD_MIRROR_FULL_REFRESH_HOURS,
+    иначе только товары из dateRange с момента последней синхронизации; если после этого число товаров
+    не сходится с totalRecords (товары удалены вне приложения), сразу выполняется полный проход.
+    """
+    mirror = get_hood_mirror()
+    if mirror is None:
+        return {"enabled": False}
+    account = _account_key(cfg)
+    with _refresh_lock(account, item_status):
+        state = mirror.sync_state(account, item_status)
+        now = _utc_now()
+        if full is None:
+            full_max_age = timedelta(hours=float(os.environ.get("HOOD_MIRROR_FULL_REFRESH_HOURS", "24")))
+            full = state["last_full_sync"] is None or now - state["last_full_sync"] > full_max_age
+
+        if full:
+            pages = iter_all_hood_items(cfg=cfg, item_status=item_status, group_size=500, progress_cb=progress_cb)
+            start_date = end_date = None
+        else:
+            # dateRange в Hood — по дням, поэтому берём с запасом назад.
+            overlap_days = int(os.environ.get("HOOD_MIRROR_INCREMENTAL_OVERLAP_DAYS", "1"))
+            since = (state["last_sync"] or now) - timedelta(days=overlap_days)
+            start_date = since.strftime("%d/%m/%Y")
+            end_date = now.strftime("%d/%m/%Y")
+            pages = iter_all_hood_items(
+                cfg=cfg,
+                item_status=item_status,
+                group_size=500,
+                progress_cb=progress_cb,
+                start_date=start_date,
+                end_date=end_date,
+            )
+        stored = mirror.upsert_pages(account, item_status, pages, full=full)
+        total = _hood_total_records(cfg, item_status)
+        drift_key = (account, item_status)
+        expected_drift = _FULL_SYNC_DRIFT.get(drift_key, 0)
+        if not full and total is not None and total - mirror.count(account, item_status) != expected_drift:
+            logger.info(
+                "Hood mirror out of sync: account=%s, status=%s, hood_total=%s, mirror=%s; full refresh",
+                account,
+                item_status,
+                total,
+                mirror.count(account, item_status),
+            )
+            full = True
+            start_date = end_date = None
+            pages = iter_all_hood_items(cfg=cfg, item_status=item_status, group_size=500, progress_cb=progress_cb)
+            stored = mirror.upsert_pages(account, item_status, pages, full=True)
+            total = _hood_total_records(cfg, item_status)
+        if full and total is not None:
+            _FULL_SYNC_DRIFT[drift_key] = total - mirror.count(account, item_status)
+
+    logger.info(
+        "Hood mirror refresh: account=%s, status=%s, mode=%s, items=%s, date_range=%s..%s",
+        account,
+        item_status,
+        "full" if full else "incremental",
+        stored,
+        start_date,
+        end_date,
+    )
+    return {
+        "enabled": True,
+        "item_status": item_status,
+        "mode": "full" if full else "incremental",
+        "items": stored,
+        "start_date": start_date,
+        "end_date": end_date,
+    }
+
+
+def ensure_hood_mirror(
+    cfg: ApiConfig,
+    item_status: str = "running",
+    progress_cb: Callable[[Dict[str, Any]], None] | None = None,
+) -> HoodMirror | None:
+    """
+    Возвращает зеркало, обновлённое не раньше HOOD_MIRROR_MAX_AGE_SECONDS назад,
+    или None, если зеркало отключено.
+    """
+    mirror = get_hood_mirror()
+    if mirror is None:
+        return None
+    state = mirror.sync_state(_account_key(cfg), item_status)
+    max_age = timedelta(seconds=float(os.environ.get("HOOD_MIRROR_MAX_AGE_SECONDS", "300")))
+    if state["last_sync"] is None or _utc_now() - state["last_sync"] > max_age:
+        refresh_hood_mirror(cfg, item_status=item_status, progress_cb=progress_cb)
+    return mirror
+
+
+def current_hood_items(
+    cfg: ApiConfig,
+    item_status: str = "running",
+    progress_cb: Callable[[Dict[str, Any]], None] | None = None,
+) -> List[Dict[str, Any]]:
+    """Товары статуса из зеркала, а без зеркала — полный проход itemList."""
+    mirror = ensure_hood_mirror(cfg, item_status=item_status, progress_cb=progress_cb)
+    if mirror is None:
+        return load_all_hood_items(cfg=cfg, item_status=item_status, group_size=500, progress_cb=progress_cb)
+    return mirror.items(_account_key(cfg), [item_status])
+
+
+def hood_item_number_to_ids(cfg: ApiConfig, item_status: str = "running") -> Dict[str, List[str]]:
+    mirror = ensure_hood_mirror(cfg, item_status=item_status)
+    if mirror is None:
+        mapping: Dict[str, List[str]] = {}
+        for page in iter_all_hood_items(cfg=cfg, item_status=item_status, group_size=500):
+            for it in page:
+                item_number = str(it.get("itemNumber") or "").strip()
+                item_id = str(it.get("itemID") or "").strip()
+                if not item_number or not item_id:
+                    continue
+                ids = mapping.setdefault(item_number, [])
+                if item_id not in ids:
+                    ids.append(item_id)
+        return mapping
+    return mirror.item_number_to_ids(_account_key(cfg), [item_status])
+
+
+def find_hood_items_by_reference(
+    cfg: ApiConfig,
+    reference_id: str,
+    item_status: str = "running",
+) -> List[Dict[str, Any]] | None:
+    """Поиск по referenceID через индекс зеркала; None — зеркало отключено."""
+    mirror = ensure_hood_mirror(cfg, item_status=item_status)
+    if mirror is None:
+        return None
+    return mirror.find_by_reference(_account_key(cfg), reference_id, [item_status])
+
+
+def mirror_item_ids(cfg: ApiConfig, item_status: str) -> List[str] | None:
+    """itemID статуса из (свежего) зеркала; None — зеркало отключено."""
+    mirror = ensure_hood_mirror(cfg, item_status=item_status)
+    if mirror is None:
+        return None
+    return mirror.item_ids(_account_key(cfg), item_status)
+
+
+def remember_hood_items(cfg: ApiConfig, items: Iterable[Dict[str, Any]], item_status: str = "running") -> None:
+    """Только что загруженные товары (itemID, itemNumber, referenceID) — в зеркало, не дожидаясь обновления."""
+    mirror = get_hood_mirror()
+    if mirror is not None:
+        mirror.remember_items(_account_key(cfg), item_status, items)
+
+
+def clear_hood_status(cfg: ApiConfig, item_status: str) -> None:
+    """Hood подтвердил, что товаров статуса нет ("No auctions found")."""
+    mirror = get_hood_mirror()
+    if mirror is not None:
+        mirror.clear_status(_account_key(cfg), item_status)
+
+
+def forget_hood_items(
+    cfg: ApiConfig,
+    item_ids: Iterable[str] = (),
+    item_numbers: Iterable[str] = (),
+) -> None:
+    """Убирает удалённые товары из зеркала сразу, не дожидаясь полного обновления."""
+    mirror = get_hood_mirror()
+    if mirror is None:
+        return
+    mirror.forget_item_ids(_account_key(cfg), item_ids)
+    mirror.forget_item_numbers(_account_key(cfg), item_numbers)
+
+
+def hood_mirror_stats(cfg: ApiConfig) -> Dict[str, Any]:
+    mirror = get_hood_mirror()
+    if mirror is None:
+        return {"enabled": False}
+    return {"enabled": True, "account_user": _account_key(cfg), **mirror.stats(_account_key(cfg))}
@@ -0,0 +1,144 @@
+"""
+Поток событий фоновых задач для SSE (/items/jobs/events, /items/jobs/{kind}/{job_id}/events).
+set_job() публикует сюда каждое изменение задачи; подписчик держит только последнее состояние каждой задачи
+и отдаёт его не чаще раза в JOB_EVENTS_MIN_INTERVAL_SECONDS (частые progress_cb схлопываются).
+События живут в пределах процесса: задачи другого воркера uvicorn видны через перечитывание хранилища
+на каждом keepalive (JOB_EVENTS_HEARTBEAT_SECONDS).
+"""
+
+import asyncio
+import json
+import os
+import threading
+from typing import Any, AsyncIterator, Callable, Dict, List, Tuple
+
+TERMINAL_STATUSES = ("completed", "failed")
+
+_SUBSCRIBERS: List["_Subscriber"] = []
+_SUBSCRIBERS_LOCK = threading.Lock()
+
+
+def job_event(kind: str, job: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Событие задачи: всё, кроме result (его клиент забирает один раз из статуса задачи).
+    Тип задачи из хранилища — в store_kind, собственный kind задачи (update_prices и т.п.) не затирается.
+    """
+    event = {key: value for key, value in job.items() if key != "result"}
+    event["store_kind"] = kind
+    event["has_result"] = job.get("result") is not None
+    return event
+
+
+class _Subscriber:
+    def __init__(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        kind: str | None,
+        job_id: str | None,
+        account: str | None,
+    ) -> None:
+        self.loop = loop
+        self.kind = kind
+        self.job_id = job_id
+        self.account = account
+        self.wakeup = asyncio.Event()
+        self._pending: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._signalled = False
+        self._lock = threading.Lock()
+
+    def matches(self, kind: str, job_id: str, job: Dict[str, Any]) -> bool:
+        return (
+            (self.kind is None or self.kind == kind)
+            and (self.job_id is None or self.job_id == job_id)
+            and (self.account is None or self.account == job.get("account"))
+        )
+
+    def offer(self, kind: str, job_id: str, event: Dict[str, Any]) -> None:
+        with self._lock:
+            self._pending[(kind, job_id)] = event
+            if self._signalled:
+                return
+            self._signalled = True
+        try:
+            self.loop.call_soon_threadsafe(self.wakeup.set)
+        except RuntimeError:
+            # Цикл клиента уже закрыт; подписка снимется в finally потока.
+            pass
+
+    def drain(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            events = list(self._pending.values())
+            self._pending.clear()
+            self._signalled = False
+            self.wakeup.clear()
+        return events
+
+
+def publish_job_event(kind: str, job_id: str, job: Dict[str, Any]) -> None:
+    with _SUBSCRIBERS_LOCK:
+        subscribers = [sub for sub in _SUBSCRIBERS if sub.matches(kind, job_id, job)]
+    if not subscribers:
+        return
+    event = job_event(kind, job)
+    for sub in subscribers:
+        sub.offer(kind, job_id, event)
+
+
+def _format_sse(event: Dict[str, Any]) -> str:
+    data = json.dumps(event, ensure_ascii=False, default=str)
+    return f"event: job\ndata: {data}\n\n"
+
+
+def _event_version(event: Dict[str, Any]) -> tuple:
+    return event.get("status"), event.get("last_update_at"), event.get("finished_at"), event.get("resumed_at")
+
+
+async def job_event_stream(
+    kind: str | None = None,
+    job_id: str | None = None,
+    account: str | None = None,
+    reload: Callable[[], List[Dict[str, Any]]] | None = None,
+    until_done: bool = False,
+) -> AsyncIterator[str]:
+    """
+    SSE-поток задач по фильтру. reload() возвращает текущие события из хранилища: ими поток открывается
+    и они же перечитываются на keepalive. until_done — закрыть поток после completed/failed (поток одной задачи).
+    """
+    min_interval = float(os.environ.get("JOB_EVENTS_MIN_INTERVAL_SECONDS", "0.5"))
+    heartbeat = float(os.environ.get("JOB_EVENTS_HEARTBEAT_SECONDS", "15"))
+    sub = _Subscriber(asyncio.get_running_loop(), kind, job_id, account)
+    with _SUBSCRIBERS_LOCK:
+        _SUBSCRIBERS.append(sub)
+    sent: Dict[Tuple[str, str], tuple] = {}
+
+    def fresh(events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        out = []
+        for event in events:
+            key = (str(event.get("store_kind")), str(event.get("job_id")))
+            version = _event_version(event)
+            if sent.get(key) != version:
+                sent[key] = version
+                out.append(event)
+        return out
+
+    try:
+        events = await asyncio.to_thread(reload) if reload is not None else []
+        while True:
+            for event in fresh(events):
+                yield _format_sse(event)
+                if until_done and event.get("status") in TERMINAL_STATUSES:
+                    return
+            try:
+                await asyncio.wait_for(sub.wakeup.wait(), timeout=heartbeat)
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                events = await asyncio.to_thread(reload) if reload is not None else []
+                continue
+            # Даём накопиться следующим progress_cb: клиент получит только последнее состояние.
+            await asyncio.sleep(min_interval)
+            events = sub.drain()
+    finally:
+        with _SUBSCRIBERS_LOCK:
+            if sub in _SUBSCRIBERS:
+                _SUBSCRIBERS.remove(sub)
+
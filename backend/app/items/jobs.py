@@ -0,0 +1,355 @@
+"""
+Хранилище фоновых задач (update/upload/delete/split): метаданные, снимок progress и result.
+По умолчанию SQLite в STATE_FOLDER — задачи переживают рестарт и видны всем воркерам uvicorn.
+JOB_STORE=memory — прежнее поведение (словарь в процессе), JOB_STORE=package.module:Class — своё
+хранилище с тем же интерфейсом (наследник JobStore). Прогресс (patch только из progress/last_update_at)
+пишется в SQLite не чаще раза в JOB_PROGRESS_FLUSH_SECONDS на задачу; до записи он виден get()/list() этого процесса.
+Задачи старше JOB_TTL_HOURS удаляются вместе с чекпоинтами (checkpoints.py)
+и файлами итогов (result_sink.py).
+"""
+
+import importlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List
+
+from app.config import settings
+from app.items.checkpoints import evict_expired_checkpoints
+from app.items.job_events import publish_job_event
+from app.items.result_sink import evict_expired_results
+
+JOB_KINDS = ("update", "upload", "delete", "split")
+
+# patch только из этих ключей — тик progress_cb, его можно отложить.
+_PROGRESS_KEYS = frozenset(("progress", "last_update_at"))
+_TERMINAL_STATUSES = ("completed", "failed")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    status TEXT,
+    account TEXT,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_kind_updated ON jobs (kind, updated_at);
+CREATE INDEX IF NOT EXISTS jobs_updated ON jobs (updated_at);
+"""
+
+_STORE: "JobStore | None" = None
+_STORE_LOCK = threading.Lock()
+
+
+def _utc_now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _ttl_seconds() -> float:
+    return float(os.environ.get("JOB_TTL_HOURS", "72")) * 3600
+
+
+class JobStore(ABC):
+    """
+    Интерфейс хранилища задач. update() сливает patch с текущим состоянием и возвращает результат.
+    list() кладёт kind хранилища в store_kind: поле kind самой задачи (update_all, update_prices, ...) не трогается.
+    """
+
+    @abstractmethod
+    def get(self, kind: str, job_id: str) -> Dict[str, Any] | None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def update(self, kind: str, job_id: str, patch: Dict[str, Any]) -> Dict[str, Any]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def list(
+        self,
+        kind: str | None = None,
+        status: str | None = None,
+        account: str | None = None,
+        limit: int = 50,
+        offset: int = 0,
+    ) -> List[Dict[str, Any]]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def delete(self, kind: str, job_id: str) -> bool:
+        raise NotImplementedError
+
+    @abstractmethod
+    def evict_expired(self) -> int:
+        raise NotImplementedError
+
+
+class MemoryJobStore(JobStore):
+    """Задачи в памяти процесса (без персистентности); TTL работает так же."""
+
+    def __init__(self) -> None:
+        self._jobs: Dict[tuple[str, str], Dict[str, Any]] = {}
+        self._updated: Dict[tuple[str, str], float] = {}
+        self._lock = threading.Lock()
+
+    def get(self, kind: str, job_id: str) -> Dict[str, Any] | None:
+        with self._lock:
+            job = self._jobs.get((kind, job_id))
+            return dict(job) if job is not None else None
+
+    def update(self, kind: str, job_id: str, patch: Dict[str, Any]) -> Dict[str, Any]:
+        with self._lock:
+            current = self._jobs.get((kind, job_id), {})
+            current.update(patch)
+            self._jobs[(kind, job_id)] = current
+            self._updated[(kind, job_id)] = time.time()
+            return dict(current)
+
+    def list(
+        self,
+        kind: str | None = None,
+        status: str | None = None,
+        account: str | None = None,
+        limit: int = 50,
+        offset: int = 0,
+    ) -> List[Dict[str, Any]]:
+        with self._lock:
+            keys = sorted(self._jobs, key=lambda key: self._updated[key], reverse=True)
+            jobs = [
+                dict(self._jobs[key], store_kind=key[0])
+                for key in keys
+                if (kind is None or key[0] == kind)
+                and (status is None or self._jobs[key].get("status") == status)
+                and (account is None or self._jobs[key].get("account") == account)
+            ]
+        return jobs[offset : offset + limit]
+
+    def delete(self, kind: str, job_id: str) -> bool:
+        with self._lock:
+            self._updated.pop((kind, job_id), None)
+            return self._jobs.pop((kind, job_id), None) is not None
+
+    def evict_expired(self) -> int:
+        cutoff = time.time() - _ttl_seconds()
+        with self._lock:
+            expired = [key for key, updated in self._updated.items() if updated < cutoff]
+            for key in expired:
+                self._jobs.pop(key, None)
+                self._updated.pop(key, None)
+        return len(expired)
+
+
+class SqliteJobStore(JobStore):
+    """
+    Задачи в SQLite; одно соединение на вызов, patch сливается внутри транзакции.
+    Тики progress между записями копятся в _pending и уходят в базу вместе со следующей записью.
+    """
+
+    def __init__(self, db_path: str) -> None:
+        self.db_path = db_path
+        self.progress_interval = float(os.environ.get("JOB_PROGRESS_FLUSH_SECONDS", "1"))
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+        self._state_lock = threading.Lock()
+        # Последнее записанное этим процессом состояние незавершённых задач и ещё не записанный progress.
+        self._latest: Dict[tuple[str, str], Dict[str, Any]] = {}
+        self._pending: Dict[tuple[str, str], Dict[str, Any]] = {}
+        self._written_at: Dict[tuple[str, str], float] = {}
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            yield conn
+        finally:
+            conn.close()
+
+    def _with_pending(self, kind: str, job_id: str, job: Dict[str, Any]) -> Dict[str, Any]:
+        with self._state_lock:
+            pending = self._pending.get((kind, job_id))
+            return {**job, **pending} if pending else job
+
+    def _forget(self, key: tuple[str, str]) -> None:
+        with self._state_lock:
+            self._latest.pop(key, None)
+            self._pending.pop(key, None)
+            self._written_at.pop(key, None)
+
+    def get(self, kind: str, job_id: str) -> Dict[str, Any] | None:
+        with self._connect() as conn:
+            row = conn.execute("SELECT data FROM jobs WHERE kind = ? AND job_id = ?", (kind, job_id)).fetchone()
+        return self._with_pending(kind, job_id, json.loads(row[0])) if row else None
+
+    def update(self, kind: str, job_id: str, patch: Dict[str, Any]) -> Dict[str, Any]:
+        key = (kind, job_id)
+        with self._state_lock:
+            latest = self._latest.get(key)
+            if (
+                latest is not None
+                and patch
+                and _PROGRESS_KEYS.issuperset(patch)
+                and time.monotonic() - self._written_at.get(key, 0.0) < self.progress_interval
+            ):
+                self._pending.setdefault(key, {}).update(patch)
+                latest.update(patch)
+                return dict(latest)
+            pending = self._pending.pop(key, None)
+        if pending:
+            patch = {**pending, **patch}
+
+        current = self._write(kind, job_id, patch)
+        with self._state_lock:
+            if current.get("status") in _TERMINAL_STATUSES:
+                self._latest.pop(key, None)
+                self._written_at.pop(key, None)
+            else:
+                self._latest[key] = dict(current)
+                self._written_at[key] = time.monotonic()
+        return current
+
+    def _write(self, kind: str, job_id: str, patch: Dict[str, Any]) -> Dict[str, Any]:
+        now = _utc_now()
+        with self._connect() as conn:
+            # BEGIN IMMEDIATE: чтение и запись patch не перемешиваются с другими процессами.
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute(
+                    "SELECT data FROM jobs WHERE kind = ? AND job_id = ?", (kind, job_id)
+                ).fetchone()
+                current = json.loads(row[0]) if row else {}
+                current.update(patch)
+                conn.execute(
+                    "INSERT INTO jobs (job_id, kind, status, account, created_at, updated_at, data) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT (job_id) DO UPDATE SET status = excluded.status, account = excluded.account, "
+                    "updated_at = excluded.updated_at, data = excluded.data",
+                    (
+                        job_id,
+                        kind,
+                        current.get("status"),
+                        current.get("account"),
+                        str(current.get("created_at") or now),
+                        now,
+                        json.dumps(current, ensure_ascii=False, default=str),
+                    ),
+                )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        return current
+
+    def list(
+        self,
+        kind: str | None = None,
+        status: str | None = None,
+        account: str | None = None,
+        limit: int = 50,
+        offset: int = 0,
+    ) -> List[Dict[str, Any]]:
+        where: List[str] = []
+        params: List[Any] = []
+        for column, value in (("kind", kind), ("status", status), ("account", account)):
+            if value is not None:
+                where.append(f"{column} = ?")
+                params.append(value)
+        sql = "SELECT kind, job_id, data FROM jobs"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY updated_at DESC LIMIT ? OFFSET ?"
+        with self._connect() as conn:
+            rows = conn.execute(sql, (*params, int(limit), int(offset))).fetchall()
+        return [
+            dict(self._with_pending(row_kind, job_id, json.loads(data)), store_kind=row_kind)
+            for row_kind, job_id, data in rows
+        ]
+
+    def delete(self, kind: str, job_id: str) -> bool:
+        self._forget((kind, job_id))
+        with self._connect() as conn:
+            cur = conn.execute("DELETE FROM jobs WHERE kind = ? AND job_id = ?", (kind, job_id))
+        return cur.rowcount > 0
+
+    def evict_expired(self) -> int:
+        cutoff = (datetime.now(timezone.utc) - timedelta(seconds=_ttl_seconds())).isoformat()
+        stale_before = time.monotonic() - _ttl_seconds()
+        with self._state_lock:
+            # Задачи, так и не дошедшие до completed/failed (процесс упал посреди работы).
+            for key in [key for key, written in self._written_at.items() if written < stale_before]:
+                self._latest.pop(key, None)
+                self._pending.pop(key, None)
+                self._written_at.pop(key, None)
+        with self._connect() as conn:
+            cur = conn.execute("DELETE FROM jobs WHERE updated_at < ?", (cutoff,))
+        return cur.rowcount
+
+
+def _create_store() -> JobStore:
+    backend = os.environ.get("JOB_STORE", "sqlite").strip()
+    if backend.lower() == "memory":
+        return MemoryJobStore()
+    if backend.lower() in ("", "sqlite"):
+        return SqliteJobStore(str(Path(settings.STATE_FOLDER) / "jobs.sqlite3"))
+    module_name, _, class_name = backend.partition(":")
+    if not class_name:
+        raise ValueError("JOB_STORE must be 'sqlite', 'memory' or 'package.module:ClassName'")
+    return getattr(importlib.import_module(module_name), class_name)()
+
+
+def get_job_store() -> JobStore:
+    global _STORE
+    with _STORE_LOCK:
+        if _STORE is None:
+            _STORE = _create_store()
+        return _STORE
+
+
+_LAST_EVICTION = 0.0
+_EVICTION_INTERVAL_SECONDS = 600
+
+
+def evict_expired_jobs(force: bool = False) -> int:
+    """Удаляет задачи, не обновлявшиеся дольше JOB_TTL_HOURS (не чаще раза в 10 минут без force)."""
+    global _LAST_EVICTION
+    now = time.monotonic()
+    with _STORE_LOCK:
+        if not force and now - _LAST_EVICTION < _EVICTION_INTERVAL_SECONDS:
+            return 0
+        _LAST_EVICTION = now
+    evict_expired_checkpoints(_ttl_seconds())
+    evict_expired_results(_ttl_seconds())
+    return get_job_store().evict_expired()
+
+
+def set_job(kind: str, job_id: str, patch: Dict[str, Any]) -> Dict[str, Any]:
+    job = get_job_store().update(kind, job_id, patch)
+    publish_job_event(kind, job_id, job)
+    if "created_at" in patch:
+        # Новая задача — удобный момент почистить старые.
+        evict_expired_jobs()
+    return job
+
+
+def get_job(kind: str, job_id: str) -> Dict[str, Any] | None:
+    return get_job_store().get(kind, job_id)
+
+
+def list_jobs(
+    kind: str | None = None,
+    status: str | None = None,
+    account: str | None = None,
+    limit: int = 50,
+    offset: int = 0,
+) -> List[Dict[str, Any]]:
+    evict_expired_jobs()
+    return get_job_store().list(kind=kind, status=status, account=account, limit=limit, offset=offset)
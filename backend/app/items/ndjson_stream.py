@@ -0,0 +1,132 @@
+"""
+Потоковые ответы stream=ndjson для больших синхронных операций (/items/update, /items/validate,
+/items/upload_all_missing, /items/delete/by-item-number).
+Операция выполняется в отдельном потоке и пишет итоги в StreamSink; каждая запись сразу уходит клиенту строкой
+{"type": "result", "result": ...}, в конце — {"type": "summary", "summary": ...} или {"type": "error", ...}.
+Очередь между потоком и клиентом ограничена: медленный клиент притормаживает операцию, а не копит память.
+"""
+
+import asyncio
+import json
+import queue
+import threading
+from typing import Any, AsyncIterator, Callable, Dict
+
+from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
+
+from app.items.result_sink import ResultSink
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+_DONE = object()
+
+
+class StreamCancelled(Exception):
+    """Клиент отключился — операция прерывается на следующей записи."""
+
+
+class StreamSink(ResultSink):
+    """ResultSink без файла: записи уходят в поток ответа, счётчики и выборка неудач — как у ResultSink."""
+
+    def __init__(self, emit: Callable[[str], None]) -> None:
+        super().__init__("stream", "ndjson")
+        self._emit = emit
+
+    def _write(self, line: str) -> None:
+        self._emit('{"type": "result", "result": ' + line + "}\n")
+
+    def summary(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "records": self.success + self.failed,
+                "success_records": self.success,
+                "failed_records": self.failed,
+            }
+
+    def close(self) -> None:
+        return None
+
+
+def resolve_stream_mode(stream: str | None) -> bool:
+    """True — ответ потоком NDJSON; пустое значение — обычный JSON-ответ."""
+    value = str(stream or "").strip().lower()
+    if value not in ("", "ndjson"):
+        raise ValueError("stream must be 'ndjson'")
+    return value == "ndjson"
+
+
+def _line(payload: Dict[str, Any]) -> str:
+    return json.dumps(payload, ensure_ascii=False, default=str) + "\n"
+
+
+def ndjson_stream_response(run: Callable[[StreamSink], Dict[str, Any]], max_pending: int = 256) -> StreamingResponse:
+    """
+    run(sink) выполняется в фоновом потоке; то, что он вернёт, становится строкой summary.
+    HTTPException/ValueError после начала потока превращаются в строку error (статус уже отправлен).
+    """
+    lines: "queue.Queue[Any]" = queue.Queue(maxsize=max_pending)
+    cancelled = threading.Event()
+
+    def emit(line: str) -> None:
+        while True:
+            if cancelled.is_set():
+                raise StreamCancelled()
+            try:
+                lines.put(line, timeout=0.5)
+                return
+            except queue.Full:
+                continue
+
+    def worker() -> None:
+        sink = StreamSink(emit)
+        try:
+            summary = run(sink)
+            emit(_line({"type": "summary", "summary": {**summary, "stream": sink.summary()}}))
+        except StreamCancelled:
+            return
+        except HTTPException as exc:
+            _emit_error(exc.status_code, exc.detail)
+        except ValueError as exc:
+            _emit_error(400, str(exc))
+        except Exception as exc:
+            _emit_error(500, str(exc))
+        finally:
+            if not cancelled.is_set():
+                emit_final()
+
+    def _emit_error(status_code: int, detail: Any) -> None:
+        try:
+            emit(_line({"type": "error", "status_code": status_code, "detail": detail}))
+        except StreamCancelled:
+            pass
+
+    def emit_final() -> None:
+        try:
+            emit(_DONE)
+        except StreamCancelled:
+            pass
+
+    def poll() -> Any:
+        # Короткий таймаут: при отключении клиента поток пула не висит на пустой очереди.
+        try:
+            return lines.get(timeout=0.5)
+        except queue.Empty:
+            return None
+
+    async def body() -> AsyncIterator[str]:
+        thread = threading.Thread(target=worker, name="ndjson-stream", daemon=True)
+        thread.start()
+        try:
+            while True:
+                line = await asyncio.to_thread(poll)
+                if line is None:
+                    continue
+                if line is _DONE:
+                    return
+                yield line
+        finally:
+            # Клиент отключился (или поток дочитан): операция остановится на следующей записи.
+            cancelled.set()
+
+    return StreamingResponse(body(), media_type=NDJSON_MEDIA_TYPE, headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
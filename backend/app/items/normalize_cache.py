@@ -0,0 +1,144 @@
+"""
+Кэш normalize_item для товаров из JSON-каталога: ключ — (исходный файл, ID товара), запись действительна,
+пока у файла тот же (mtime, размер). Неизменённые файлы между запросами и задачами заново не нормализуются.
+Размер ограничен NORMALIZE_CACHE_SIZE записями (LRU, 0 — кэш выключен); счётчики — normalize_cache_stats.
+В кэше лежат компактные NormalizedItem (неизменяемые): compact=True отдаёт их как есть, иначе — новый словарь.
+"""
+
+import dataclasses
+import os
+import threading
+from collections import Counter, OrderedDict
+from typing import Any, Dict, Iterable, List, Tuple
+
+from app.items.utils import NormalizedItem, normalize_items
+
+_Signature = Tuple[int, int]
+_Key = Tuple[str, str]
+
+
+def _source_signature(source_file: str) -> _Signature | None:
+    try:
+        stat = os.stat(source_file)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _cache_key(raw: Dict[str, Any]) -> _Key | None:
+    source_file = raw.get("__source_file__")
+    item_id = raw.get("ID") or raw.get("id")
+    if not source_file or item_id is None or item_id == "":
+        return None
+    return str(source_file), str(item_id)
+
+
+class NormalizeCache:
+    def __init__(self, max_items: int) -> None:
+        self.max_items = max(0, int(max_items))
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[_Key, Tuple[_Signature, Dict[str, Any], NormalizedItem]]" = OrderedDict()
+        self._counters: Counter = Counter()
+
+    def _lookup_locked(self, key: _Key, signature: _Signature, raw: Dict[str, Any]) -> NormalizedItem | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            self._counters["misses"] += 1
+            return None
+        cached_signature, cached_raw, norm = entry
+        # Тот же файл, но запись могла прийти изменённой копией — тогда считаем заново.
+        if cached_signature != signature or (cached_raw is not raw and cached_raw != raw):
+            self._counters["stale"] += 1
+            return None
+        self._entries.move_to_end(key)
+        self._counters["hits"] += 1
+        return norm
+
+    def _remember_locked(self, key: _Key, signature: _Signature, raw: Dict[str, Any], norm: NormalizedItem) -> None:
+        self._entries[key] = (signature, raw, norm)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_items:
+            self._entries.popitem(last=False)
+            self._counters["evictions"] += 1
+
+    def normalize_many(self, items: Iterable[Dict[str, Any]], compact: bool = False) -> List[Any]:
+        items = list(items)
+        if self.max_items <= 0:
+            return normalize_items(items, compact=compact)
+
+        # Файл проверяется один раз на вызов, и не под блокировкой.
+        signatures: Dict[str, _Signature | None] = {}
+        keys: List[_Key | None] = []
+        for raw in items:
+            key = _cache_key(raw)
+            if key is not None and key[0] not in signatures:
+                signatures[key[0]] = _source_signature(key[0])
+            keys.append(key)
+
+        hits: Dict[int, NormalizedItem] = {}
+        pending: List[Tuple[int, _Key | None, _Signature | None]] = []
+        with self._lock:
+            for pos, (raw, key) in enumerate(zip(items, keys)):
+                signature = signatures.get(key[0]) if key is not None else None
+                if key is None or signature is None:
+                    self._counters["uncacheable"] += 1
+                    pending.append((pos, None, None))
+                    continue
+                norm = self._lookup_locked(key, signature, raw)
+                if norm is None:
+                    pending.append((pos, key, signature))
+                else:
+                    # Равная, но другая копия записи: в результате — ссылка на запись вызывающего.
+                    hits[pos] = norm if norm.raw is raw else dataclasses.replace(norm, raw=raw)
+
+        if pending:
+            fresh = normalize_items((items[pos] for pos, _, _ in pending), compact=True)
+            with self._lock:
+                for (pos, key, signature), norm in zip(pending, fresh):
+                    if key is not None and signature is not None:
+                        self._remember_locked(key, signature, items[pos], norm)
+                    hits[pos] = norm
+        if compact:
+            return [hits[pos] for pos in range(len(items))]
+        return [hits[pos].to_dict() for pos in range(len(items))]
+
+    def normalize(self, raw: Dict[str, Any], compact: bool = False) -> Any:
+        return self.normalize_many([raw], compact=compact)[0]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            counters = dict(self._counters)
+            size = len(self._entries)
+        lookups = counters.get("hits", 0) + counters.get("misses", 0) + counters.get("stale", 0)
+        return {
+            "size": size,
+            "max_items": self.max_items,
+            "hit_rate": round(counters.get("hits", 0) / lookups, 4) if lookups else None,
+            **counters,
+        }
+
+
+_CACHE: NormalizeCache | None = None
+_CACHE_LOCK = threading.Lock()
+
+
+def get_normalize_cache() -> NormalizeCache:
+    global _CACHE
+    with _CACHE_LOCK:
+        if _CACHE is None:
+            _CACHE = NormalizeCache(int(os.environ.get("NORMALIZE_CACHE_SIZE", "50000")))
+        return _CACHE
+
+
+def normalize_item_cached(raw: Dict[str, Any], compact: bool = False) -> Dict[str, Any] | NormalizedItem:
+    """normalize_item через кэш (записи без __source_file__ или ID нормализуются каждый раз)."""
+    return get_normalize_cache().normalize(raw, compact=compact)
+
+
+def normalize_items_cached(items: Iterable[Dict[str, Any]], compact: bool = False) -> List[Any]:
+    """normalize_items через кэш: промахи нормализуются одной пачкой, файл проверяется один раз на вызов."""
+    return get_normalize_cache().normalize_many(items, compact=compact)
+
+
+def normalize_cache_stats() -> Dict[str, Any]:
+    return get_normalize_cache().stats()
@@ -0,0 +1,228 @@
+"""
+Подготовка XML-тел для upload/update вне потока задачи. Рендеринг build_item_insert / build_item_update
+(чистый CPU под GIL) уходит в пул из HOOD_PREP_PROCESSES процессов пачками по HOOD_PREP_CHUNK_SIZE товаров —
+товары не сериализуются по одному. Готовые пачки по порядку ложатся в ограниченную очередь (HOOD_PREP_QUEUE пачек),
+которую разбирают I/O-воркеры: следующие пачки рендерятся, пока предыдущие отправляются в Hood.
+HOOD_PREP_PROCESSES=0 или запуск в одну пачку — рендеринг в фоновом потоке, очередь та же.
+Описание и payload собираются в этом процессе: здесь кэш HTML-описаний и отпечатки mode=delta.
+"""
+
+import multiprocessing
+import os
+import queue
+import threading
+from collections import Counter
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Generic, List, Sequence, Tuple, TypeVar
+
+from hood_api.builders import build_item_insert, build_item_update
+from hood_api.config import ApiConfig
+
+T = TypeVar("T")
+
+_DONE = object()
+
+
+def prep_processes() -> int:
+    value = os.environ.get("HOOD_PREP_PROCESSES", "auto").strip().lower()
+    if value in ("", "auto"):
+        # Одно ядро оставляем потоку задачи и event loop.
+        return max(0, min(4, (os.cpu_count() or 1) - 1))
+    return max(0, int(value))
+
+
+def prep_chunk_size(per_unit: int = 1) -> int:
+    """Размер пачки в единицах очереди: per_unit — товаров в единице (чанк itemUpdate — 5)."""
+    size = max(1, int(os.environ.get("HOOD_PREP_CHUNK_SIZE", "50")))
+    return max(1, size // max(1, per_unit))
+
+
+def prep_queue_size() -> int:
+    return max(1, int(os.environ.get("HOOD_PREP_QUEUE", "8")))
+
+
+def render_insert_bodies(payloads: List[Dict[str, Any]], config: ApiConfig) -> List[str]:
+    """itemInsert для каждого payload из _build_item_payload_from_norm."""
+    return [
+        build_item_insert(
+            reference_id=payload["reference_id"],
+            title=payload["title"],
+            description=payload["description"],
+            price=payload["price"],
+            quantity=payload["quantity"],
+            category_id=payload["categoryID"],
+            condition=payload["condition"],
+            item_mode=payload["itemMode"],
+            pay_options=payload["pay_options"],
+            ship_methods=payload["ship_methods"],
+            image_urls=payload["image_urls"],
+            product_properties=payload["product_properties"],
+            ean=payload["ean"],
+            mpn=payload["mpn"],
+            item_number=payload["item_number"],
+            country=payload["country"],
+            config=config,
+        )
+        for payload in payloads
+    ]
+
+
+def render_update_bodies(
+    chunks: List[List[Dict[str, Any]]],
+    config: ApiConfig,
+    build_xml: Callable[..., str] = build_item_update,
+) -> List[str]:
+    """Один запрос build_xml (itemUpdate или только цены) на каждый чанк payload'ов."""
+    return [build_xml(items=chunk, config=config) for chunk in chunks]
+
+
+_EXECUTOR: ProcessPoolExecutor | None = None
+_EXECUTOR_LOCK = threading.Lock()
+_COUNTERS: Counter = Counter()
+
+
+def _count(name: str) -> None:
+    with _EXECUTOR_LOCK:
+        _COUNTERS[name] += 1
+
+
+def _get_executor(processes: int) -> ProcessPoolExecutor:
+    global _EXECUTOR
+    with _EXECUTOR_LOCK:
+        if _EXECUTOR is None:
+            # spawn, а не fork: сервер многопоточный, копия чужих блокировок в дочернем процессе опасна.
+            _EXECUTOR = ProcessPoolExecutor(max_workers=processes, mp_context=multiprocessing.get_context("spawn"))
+        return _EXECUTOR
+
+
+def _drop_executor(broken: ProcessPoolExecutor) -> None:
+    global _EXECUTOR
+    with _EXECUTOR_LOCK:
+        if _EXECUTOR is broken:
+            _EXECUTOR = None
+            _COUNTERS["pool_restarts"] += 1
+    broken.shutdown(wait=False, cancel_futures=True)
+
+
+def prep_pipeline_stats() -> Dict[str, Any]:
+    with _EXECUTOR_LOCK:
+        counters = dict(_COUNTERS)
+        running = _EXECUTOR is not None
+    return {
+        "processes": prep_processes(),
+        "pool_running": running,
+        "chunk_size": prep_chunk_size(),
+        "queue": prep_queue_size(),
+        **counters,
+    }
+
+
+class PrepPipeline(Generic[T]):
+    """
+    Фоновая подготовка XML-тел для items по порядку. next_batch() отдаёт [(item, body), ...] очередной пачки
+    или None в конце; ошибка подготовки поднимается в next_batch(). close() останавливает подготовку
+    и отменяет ещё не начатые пачки (обязательно, если очередь дочитана не до конца).
+    payload_of(item) — то, что уходит в render (по умолчанию сам item); render(payloads, config) должен быть
+    функцией уровня модуля (или partial от неё), чтобы его можно было передать в процесс пула.
+    """
+
+    def __init__(
+        self,
+        items: Sequence[T],
+        render: Callable[[List[Any], ApiConfig], List[str]],
+        config: ApiConfig,
+        payload_of: Callable[[T], Any] | None = None,
+        chunk_size: int | None = None,
+    ) -> None:
+        self._items = items
+        self._render = render
+        self._config = config
+        self._payload_of = payload_of
+        self._chunk_size = chunk_size or prep_chunk_size()
+        processes = prep_processes() if len(items) > self._chunk_size else 0
+        self._executor = _get_executor(processes) if processes > 0 else None
+        self._batches: "queue.Queue[Any]" = queue.Queue(maxsize=prep_queue_size())
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._produce, name="hood-prep", daemon=True)
+        self._thread.start()
+
+    def _put(self, entry: Any) -> bool:
+        while not self._stop.is_set():
+            try:
+                self._batches.put(entry, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _submit(self, payloads: List[Any]) -> Future | List[str]:
+        executor = self._executor
+        if executor is not None:
+            try:
+                return executor.submit(self._render, payloads, self._config)
+            except (BrokenProcessPool, RuntimeError):
+                _drop_executor(executor)
+                self._executor = None
+        _count("chunks_inline")
+        return self._render(payloads, self._config)
+
+    def _produce(self) -> None:
+        try:
+            for start in range(0, len(self._items), self._chunk_size):
+                if self._stop.is_set():
+                    return
+                part = self._items[start : start + self._chunk_size]
+                payloads = [self._payload_of(item) for item in part] if self._payload_of is not None else list(part)
+                if not self._put((part, payloads, self._submit(payloads))):
+                    return
+        except BaseException as exc:
+            self._put(exc)
+            return
+        self._put(_DONE)
+
+    def _bodies(self, payloads: List[Any], result: Future | List[str]) -> List[str]:
+        if not isinstance(result, Future):
+            return result
+        try:
+            bodies = result.result()
+        except BrokenProcessPool:
+            # Процесс пула упал (OOM и т.п.): пачку рендерим здесь, следующая задача поднимет новый пул.
+            if self._executor is not None:
+                _drop_executor(self._executor)
+                self._executor = None
+            _count("chunks_inline")
+            return self._render(payloads, self._config)
+        _count("chunks_pool")
+        return bodies
+
+    def next_batch(self) -> List[Tuple[T, str]] | None:
+        while True:
+            if self._stop.is_set():
+                return None
+            try:
+                entry = self._batches.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            if entry is _DONE:
+                return None
+            if isinstance(entry, BaseException):
+                raise entry
+            part, payloads, result = entry
+            return list(zip(part, self._bodies(payloads, result)))
+
+    def close(self) -> None:
+        self._stop.set()
+        while True:
+            try:
+                entry = self._batches.get_nowait()
+            except queue.Empty:
+                break
+            if isinstance(entry, tuple) and isinstance(entry[2], Future):
+                entry[2].cancel()
+
+    def __enter__(self) -> "PrepPipeline[T]":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
@@ -0,0 +1,163 @@
+"""
+Итоги фоновых задач по товарам/батчам. В памяти — только счётчики и первые JOB_RESULT_FAILURE_SAMPLE
+неудач; полные записи построчно пишутся в NDJSON в STATE_FOLDER/job_results и отдаются постранично
+(/items/jobs/{kind}/{job_id}/details). Файлы удаляются вместе с задачами (JOB_TTL_HOURS).
+"""
+
+import json
+import os
+import threading
+import time
+from itertools import islice
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, TextIO
+
+from app.config import settings
+
+
+def _results_dir() -> Path:
+    return Path(settings.STATE_FOLDER) / "job_results"
+
+
+def result_file(kind: str, job_id: str) -> Path:
+    # job_id приходит из URL: оставляем только безопасные символы.
+    safe_id = "".join(ch for ch in str(job_id) if ch.isalnum() or ch in "-_")
+    return _results_dir() / f"{kind}_{safe_id}.ndjson"
+
+
+class ResultSink:
+    """Приёмник итогов одной задачи: add() пишет запись в файл и обновляет счётчики."""
+
+    def __init__(self, kind: str, job_id: str, sample_size: int | None = None) -> None:
+        self.kind = kind
+        self.job_id = job_id
+        self.path = result_file(kind, job_id)
+        if sample_size is None:
+            sample_size = int(os.environ.get("JOB_RESULT_FAILURE_SAMPLE", "100"))
+        self.sample_size = max(0, sample_size)
+        self.success = 0
+        self.failed = 0
+        self._failures: List[Dict[str, Any]] = []
+        self._fh: TextIO | None = None
+        self._lock = threading.Lock()
+
+    def add(self, record: Dict[str, Any], success: bool | None = None) -> None:
+        ok = bool(record.get("success")) if success is None else success
+        line = json.dumps(record, ensure_ascii=False, default=str)
+        with self._lock:
+            self._write(line)
+            if ok:
+                self.success += 1
+            else:
+                self.failed += 1
+                if len(self._failures) < self.sample_size:
+                    self._failures.append(record)
+
+    def _write(self, line: str) -> None:
+        if self._fh is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            # Дописываем: продолженная (resume) задача пишет в тот же файл.
+            self._fh = self.path.open("a", encoding="utf-8")
+        self._fh.write(line + "\n")
+
+    def add_many(self, records: Iterable[Dict[str, Any]]) -> None:
+        for record in records:
+            self.add(record)
+
+    def failures_sample(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return list(self._failures)
+
+    def mark(self) -> int:
+        """Текущий конец файла: iter_records(start=mark) вернёт только записи, добавленные после."""
+        with self._lock:
+            if self._fh is not None:
+                self._fh.flush()
+        try:
+            return self.path.stat().st_size
+        except OSError:
+            return 0
+
+    def iter_records(self, only_failed: bool = False, start: int = 0) -> Iterator[Dict[str, Any]]:
+        with self._lock:
+            if self._fh is not None:
+                self._fh.flush()
+        yield from iter_result_records(self.kind, self.job_id, only_failed=only_failed, start=start)
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Счётчики записей, а не товаров: у update одна запись — ответ на чанк itemUpdate (до 5 товаров),
+        число товаров — в updated/failed итога задачи.
+        """
+        with self._lock:
+            return {
+                "records": self.success + self.failed,
+                "success_records": self.success,
+                "failed_records": self.failed,
+                "failures_sample": len(self._failures),
+                "file": self.path.name,
+                "url": f"/api/items/jobs/{self.kind}/{self.job_id}/details",
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            if self._fh is not None:
+                self._fh.close()
+                self._fh = None
+
+
+def iter_result_records(
+    kind: str,
+    job_id: str,
+    only_failed: bool = False,
+    start: int = 0,
+) -> Iterator[Dict[str, Any]]:
+    path = result_file(kind, job_id)
+    if not path.exists():
+        return
+    with path.open("rb") as fh:
+        fh.seek(start)
+        for line in fh:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if only_failed and record.get("success"):
+                continue
+            yield record
+
+
+def read_result_page(
+    kind: str,
+    job_id: str,
+    offset: int = 0,
+    limit: int = 100,
+    only_failed: bool = False,
+) -> Dict[str, Any] | None:
+    """Страница записей задачи (None — файла нет). Читается только до offset + limit + 1 записи."""
+    if not result_file(kind, job_id).exists():
+        return None
+    page = list(islice(iter_result_records(kind, job_id, only_failed=only_failed), offset, offset + limit + 1))
+    has_more = len(page) > limit
+    return {
+        "items": page[:limit],
+        "offset": offset,
+        "limit": limit,
+        "only_failed": only_failed,
+        "next_offset": offset + limit if has_more else None,
+    }
+
+
+def evict_expired_results(ttl_seconds: float) -> int:
+    folder = _results_dir()
+    if not folder.is_dir():
+        return 0
+    cutoff = time.time() - ttl_seconds
+    removed = 0
+    for path in folder.glob("*.ndjson"):
+        try:
+            if path.stat().st_mtime < cutoff:
+                path.unlink()
+                removed += 1
+        except OSError:
+            continue
+    return removed
@@ -1,9 +1,21 @@
+import hashlib
 import json
+import os
+import threading
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Tuple
 
 from app.config import settings
 
+# Catalog keys that get an in-memory index: name -> how to read the value from a raw item.
+_INDEX_KEYS = {
+    "item_id": lambda raw: raw.get("ID"),
+    "ean": lambda raw: raw.get("EAN") or raw.get("ean"),
+    "item_number": lambda raw: raw.get("item_number") or raw.get("ItemNumber"),
+    "reference_id": lambda raw: raw.get("reference_id"),
+}
+
 
 def _attach_source(obj: Dict[str, Any], file: Path) -> Dict[str, Any]:
     item = dict(obj)
@@ -27,6 +39,69 @@ def _load_items_from_file_path(file: Path) -> List[Dict[str, Any]]:
     return []
 
 
+class _CatalogFile:
+    """
+    One parsed JSON file plus its indexes (value -> first position in the file).
+    Valid while the file keeps the same (mtime, size) signature.
+    """
+
+    __slots__ = ("signature", "items", "indexes")
+
+    def __init__(self, signature: Tuple[int, int] | None, items: List[Dict[str, Any]]) -> None:
+        self.signature = signature
+        self.items = items
+        self.indexes: Dict[str, Dict[str, int]] = {name: {} for name in _INDEX_KEYS}
+        for pos, raw in enumerate(items):
+            for name, getter in _INDEX_KEYS.items():
+                value = str(getter(raw) or "").strip()
+                if value:
+                    self.indexes[name].setdefault(value, pos)
+
+
+_CATALOG: Dict[str, _CatalogFile] = {}
+_CATALOG_LOCK = threading.Lock()
+
+
+def _file_signature(file: Path) -> Tuple[int, int] | None:
+    try:
+        stat = file.stat()
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _catalog_file(file: Path) -> _CatalogFile:
+    """
+    Returns the cached parse of a JSON file, re-reading it only when mtime or size changed.
+    Cached item dicts are shared between callers and must be copied before modification.
+    """
+    key = str(file)
+    signature = _file_signature(file)
+    with _CATALOG_LOCK:
+        entry = _CATALOG.get(key)
+    if entry is not None and signature is not None and entry.signature == signature:
+        return entry
+
+    entry = _CatalogFile(signature, _load_items_from_file_path(file))
+    with _CATALOG_LOCK:
+        _CATALOG[key] = entry
+    return entry
+
+
+def _catalog_files(json_folder: str | None = None) -> List[_CatalogFile]:
+    folder = _get_json_folder(json_folder=json_folder)
+    files = sorted(folder.glob("*.json"), reverse=True)
+    entries = [_catalog_file(file) for file in files]
+
+    # Forget files that were removed from this folder.
+    present = {str(file) for file in files}
+    prefix = str(folder)
+    with _CATALOG_LOCK:
+        for key in [k for k in _CATALOG if str(Path(k).parent) == prefix and k not in present]:
+            del _CATALOG[key]
+    return entries
+
+
 def _get_json_folder(json_folder: str | None = None) -> Path:
     folder_raw = (json_folder or settings.JSON_FOLDER).strip()
     if not folder_raw:
@@ -54,37 +129,141 @@ def resolve_source_file(source_file: str, json_folder: str | None = None) -> Pat
     return file
 
 
+_FILES_METADATA_LOCK = threading.Lock()
+
+
+def _files_metadata_path(folder: Path) -> Path:
+    digest = hashlib.sha1(str(folder.resolve()).encode("utf-8")).hexdigest()[:16]
+    return Path(settings.STATE_FOLDER) / "json_files" / f"{digest}.json"
+
+
+def _read_files_metadata(path: Path) -> Dict[str, Dict[str, Any]]:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _write_files_metadata(path: Path, metadata: Dict[str, Dict[str, Any]]) -> None:
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(metadata, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, path)
+    except OSError as e:
+        print(f"Error writing {path}: {e}")
+
+
+def _describe_file(file: Path, signature: Tuple[int, int]) -> Dict[str, Any]:
+    """Parses a JSON file once to record its item count, ID range and content hash."""
+    try:
+        content = file.read_bytes()
+        data = json.loads(content.decode("utf-8"))
+    except Exception as e:
+        print(f"Error reading {file}: {e}")
+        content, data = b"", None
+
+    if isinstance(data, list):
+        items = [it for it in data if isinstance(it, dict)]
+    elif isinstance(data, dict):
+        items = [data]
+    else:
+        items = []
+    numeric_ids = [int(str(it.get("ID")).strip()) for it in items if str(it.get("ID", "")).strip().isdigit()]
+
+    return {
+        "file_name": file.name,
+        "size": signature[1],
+        "mtime_ns": signature[0],
+        "modified_at": datetime.fromtimestamp(signature[0] / 1e9, tz=timezone.utc).isoformat(),
+        "item_count": len(items),
+        "min_id": min(numeric_ids) if numeric_ids else None,
+        "max_id": max(numeric_ids) if numeric_ids else None,
+        "sha1": hashlib.sha1(content).hexdigest() if content else None,
+    }
+
+
 def list_json_source_files(json_folder: str | None = None) -> List[Dict[str, Any]]:
+    """
+    Lists JSON files with item counts.
+    Metadata is persisted under STATE_FOLDER; only files whose mtime or size changed are re-parsed.
+    """
     folder = _get_json_folder(json_folder=json_folder)
     files = sorted(folder.glob("*.json"), reverse=True)
-    result: List[Dict[str, Any]] = []
-    for file in files:
-        result.append(
-            {
-                "file_name": file.name,
-                "item_count": len(_load_items_from_file_path(file)),
-            }
-        )
-    return result
+    metadata_path = _files_metadata_path(folder)
+    with _FILES_METADATA_LOCK:
+        cached = _read_files_metadata(metadata_path)
+        metadata: Dict[str, Dict[str, Any]] = {}
+        changed = False
+        for file in files:
+            signature = _file_signature(file)
+            if signature is None:
+                continue
+            entry = cached.get(file.name)
+            if entry is None or entry.get("mtime_ns") != signature[0] or entry.get("size") != signature[1]:
+                entry = _describe_file(file, signature)
+                changed = True
+            metadata[file.name] = entry
+        if changed or len(metadata) != len(cached):
+            _write_files_metadata(metadata_path, metadata)
+
+    return [metadata[file.name] for file in files if file.name in metadata]
 
 
 def load_items_from_source_file(source_file: str, json_folder: str | None = None) -> List[Dict[str, Any]]:
     file = resolve_source_file(source_file, json_folder=json_folder)
-    return _load_items_from_file_path(file)
+    return list(_catalog_file(file).items)
 
 
 def load_all_items(json_folder: str | None = None) -> List[Dict[str, Any]]:
     """
     Loads all items from all JSON files in JSON_FOLDER.
+    Files are parsed once and served from the catalog cache until they change on disk.
     """
     items: List[Dict[str, Any]] = []
-    folder = _get_json_folder(json_folder=json_folder)
-    files = sorted(folder.glob("*.json"), reverse=True)
-    for file in files:
-        items.extend(_load_items_from_file_path(file))
+    for entry in _catalog_files(json_folder=json_folder):
+        items.extend(entry.items)
     return items
 
 
+def find_item(
+    json_folder: str | None = None,
+    source_file: str | None = None,
+    item_id: str | None = None,
+    ean: str | None = None,
+    item_number: str | None = None,
+    reference_id: str | None = None,
+) -> Dict[str, Any] | None:
+    """
+    Index lookup over the catalog: returns the first item (in load_all_items order)
+    matching any of the given keys, or None.
+    """
+    criteria = [
+        (name, str(value).strip())
+        for name, value in (
+            ("item_id", item_id),
+            ("ean", ean),
+            ("item_number", item_number),
+            ("reference_id", reference_id),
+        )
+        if str(value or "").strip()
+    ]
+    if not criteria:
+        return None
+
+    entries = (
+        [_catalog_file(resolve_source_file(source_file, json_folder=json_folder))]
+        if source_file
+        else _catalog_files(json_folder=json_folder)
+    )
+    for entry in entries:
+        positions = [entry.indexes[name][value] for name, value in criteria if value in entry.indexes[name]]
+        if positions:
+            return entry.items[min(positions)]
+    return None
+
+
 def delete_item_from_source(raw_item: Dict[str, Any]) -> None:
     """
     Deletes an item from its original JSON file.
@@ -1,5 +1,6 @@
 import re
-from typing import Any, Dict
+from dataclasses import dataclass, fields
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
 
 
 # Ровно тот же список категорий, что и в твоём скрипте
@@ -156,61 +157,362 @@ CATEGORY_KEYWORDS = {
 }
 
 
+_UMLAUTS = str.maketrans({"ä": "ae", "ö": "oe", "ü": "ue", "ß": "ss"})
+_NON_ALNUM_RE = re.compile(r"[^a-z0-9]+")
+# Общие слова в названиях категорий («Sonstige») при подборе не учитываются.
+_GENERIC_CATEGORY_WORDS = frozenset({"sonstige", "sonstiges"})
+
+
 def _normalize_text(text: str) -> str:
-    t = str(text or "").lower()
-    repl = {
-        "ä": "ae",
-        "ö": "oe",
-        "ü": "ue",
-        "ß": "ss",
-    }
-    for src, dst in repl.items():
-        t = t.replace(src, dst)
-    t = re.sub(r"[^a-z0-9]+", " ", t)
-    return re.sub(r"\s+", " ", t).strip()
+    t = str(text or "").lower().translate(_UMLAUTS)
+    # Пробелы тоже не буквы/цифры: одна замена сразу схлопывает их в один.
+    return _NON_ALNUM_RE.sub(" ", t).strip()
 
 
-def closest_category(item_name: str, description: str = "") -> str:
-    """
-    Берём ближайшую категорию из твоего списка,
-    как в примере скрипта.
-    """
-    haystack = _normalize_text(f"{item_name} {description}")
-    if not haystack:
-        return CATEGORIES[0]["category_id"]
+class CategoryClassifier:
+    """
+    Подбор категории по названию+описанию, подготовленный один раз: токены названий категорий
+    и ключевые слова уже нормализованы и сведены в таблицу «подстрока -> (категория, вес)».
+    Для товара нормализуется только его текст, а каждая уникальная подстрока ищется в нём один раз.
+    Совпадение — по подстроке (не по целому слову), как и раньше, поэтому категории те же.
+    """
+
+    def __init__(self, categories: List[Dict[str, str]], keywords: Dict[str, set]) -> None:
+        self.default_id = categories[0]["category_id"]
+        self._ids = tuple(c["category_id"] for c in categories)
+        weights: Dict[str, Dict[int, int]] = {}
+        fallback: List[Tuple[str, Tuple[str, ...]]] = []
+        for idx, c in enumerate(categories):
+            cid = c["category_id"]
+            words = tuple(
+                tok for tok in _normalize_text(str(c["category_name"]).strip()).split() if tok not in _GENERIC_CATEGORY_WORDS
+            )
+            # Токен названия — +1 за каждое вхождение в список, ключевое слово — +2.
+            for tok in words:
+                hits = weights.setdefault(tok, {})
+                hits[idx] = hits.get(idx, 0) + 1
+            for kw in keywords.get(cid, set()):
+                hits = weights.setdefault(_normalize_text(kw), {})
+                hits[idx] = hits.get(idx, 0) + 2
+            fallback.append((cid, words))
+        self._patterns = tuple((pattern, tuple(hits.items())) for pattern, hits in weights.items())
+        self._fallback = tuple(fallback)
+
+    def classify(self, item_name: str, description: str = "") -> str:
+        haystack = _normalize_text(f"{item_name} {description}")
+        if not haystack:
+            return self.default_id
 
-    best_category_id = ""
-    best_score = 0
+        scores = [0] * len(self._ids)
+        for pattern, hits in self._patterns:
+            if pattern in haystack:
+                for idx, weight in hits:
+                    scores[idx] += weight
+        best_score = max(scores)
+        if best_score > 0:
+            # При равенстве побеждает категория, стоящая в списке раньше.
+            return self._ids[scores.index(best_score)]
 
-    for c in CATEGORIES:
-        cid = c["category_id"]
-        cname = str(c["category_name"]).strip()
-        score = 0
+        item_lower = _normalize_text(item_name)
+        for cid, words in self._fallback:
+            if words and any(word in item_lower for word in words):
+                return cid
+        # fallback — первая категория из списка
+        return self.default_id
 
-        name_tokens = [tok for tok in _normalize_text(cname).split() if tok and tok not in {"sonstige", "sonstiges"}]
-        score += sum(1 for tok in name_tokens if tok in haystack)
+    def classify_many(self, texts: Iterable[Tuple[str, str]]) -> List[str]:
+        """Категории для пар (название, описание); повторяющиеся пары считаются один раз."""
+        seen: Dict[Tuple[str, str], str] = {}
+        out: List[str] = []
+        for item_name, description in texts:
+            key = (str(item_name), str(description))
+            category_id = seen.get(key)
+            if category_id is None:
+                category_id = seen[key] = self.classify(*key)
+            out.append(category_id)
+        return out
 
-        for kw in CATEGORY_KEYWORDS.get(cid, set()):
-            if _normalize_text(kw) in haystack:
-                score += 2
 
-        if score > best_score:
-            best_score = score
-            best_category_id = cid
+_CATEGORY_CLASSIFIER = CategoryClassifier(CATEGORIES, CATEGORY_KEYWORDS)
 
-    if best_score > 0 and best_category_id:
-        return best_category_id
 
-    item_lower = _normalize_text(item_name)
-    for c in CATEGORIES:
-        words = [w for w in _normalize_text(c["category_name"]).split() if w not in {"sonstige", "sonstiges"}]
-        if words and any(word in item_lower for word in words):
-            return c["category_id"]
-    # fallback — первая категория из списка
-    return CATEGORIES[0]["category_id"]
+def closest_category(item_name: str, description: str = "") -> str:
+    """
+    Берём ближайшую категорию из твоего списка,
+    как в примере скрипта.
+    """
+    return _CATEGORY_CLASSIFIER.classify(item_name, description)
+
+
+def closest_categories(texts: Iterable[Tuple[str, str]]) -> List[str]:
+    """closest_category для пачки пар (название, описание)."""
+    return _CATEGORY_CLASSIFIER.classify_many(texts)
+
+
+# Допустимые CategoryID — множество строится один раз, а не на каждый товар.
+_VALID_CATEGORY_IDS = frozenset(c["category_id"] for c in CATEGORIES)
+
+# Ключи-синонимы полей в порядке приоритета.
+_ITEM_NAME_KEYS = ("Artikelbeschreibung", "Name", "TITLE", "title", "item_name")
+_DESCRIPTION_KEYS = ("Description", "DESC", "description")
+_QUANTITY_KEYS = ("Menge", "Anzahl der Einheiten", "Quantity", "quantity", "qty")
+_EAN_KEYS = ("EAN", "ean", "GTIN / EAN", "GTIN / EAN:")
+_MPN_KEYS = ("Herstellernummer", "Hersteller Nr.", "Hersteller Nr.:", "MPN")
+_ITEM_NUMBER_KEYS = ("item_number", "ItemNumber")
+_COUNTRY_KEYS = ("Country", "country", "country_code", "Herkunftsland")
+_ZUSTAND_KEYS = ("Zustand", "Zustand:")
+
+_DESCRIPTION_SUFFIX = (
+    "\n\nAusführliche Produktbeschreibung folgt. "
+    "Alle wichtigen Details entnehmen Sie bitte den Artikelbildern und technischen Daten."
+)
+
+# Планы по наборам ключей; фидов немного, поэтому кэш просто сбрасывается при переполнении.
+_SCHEMA_PLAN_CACHE_SIZE = 256
+_SCHEMA_PLANS: Dict[Tuple[Any, ...], "_SchemaPlan"] = {}
+
+
+def _is_property_key(key: str) -> bool:
+    if not key or key in PROPERTY_EXCLUDE_EXACT:
+        return False
+    if key.startswith("__"):
+        return False
+    return not key.startswith(PROPERTY_EXCLUDE_PREFIXES)
+
+
+def _normalize_property_name(key: str) -> str:
+    key = str(key).strip()
+    key = PROPERTY_NAME_ALIASES.get(key, key)
+    if key.endswith(":"):
+        key = key[:-1].strip()
+    return key
+
+
+def _normalize_property_value(value: Any) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, list):
+        return ", ".join(str(v).strip() for v in value if str(v).strip())
+    if isinstance(value, str):
+        return str(value).strip()
+    return ""
+
+
+@dataclass(frozen=True, slots=True)
+class NormalizedItem:
+    """
+    Компактная форма normalize_item (compact=True) для больших списков товаров в задачах:
+    без словаря на каждый товар, productProperties — кортеж пар (name, value), image_urls — кортеж.
+    Читается как словарь (item["ean"], item.get("mpn")), в builders передаётся как есть;
+    to_dict() — прежний словарь (например, для JSON-ответа).
+    """
+
+    reference_id: str
+    item_name: str
+    description: str
+    price: str
+    quantity: int
+    category_id: str
+    condition: str
+    item_mode: str
+    ean: Any
+    mpn: str
+    item_number: str
+    country: str
+    product_properties: Tuple[Tuple[str, str], ...]
+    image_urls: Tuple[str, ...]
+    raw: Dict[str, Any]
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in _NORMALIZED_FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __contains__(self, key: object) -> bool:
+        return key in _NORMALIZED_FIELDS
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key) if key in _NORMALIZED_FIELDS else default
+
+    def keys(self) -> Iterator[str]:
+        return iter(_NORMALIZED_FIELDS)
+
+    def to_dict(self) -> Dict[str, Any]:
+        out = {name: getattr(self, name) for name in _NORMALIZED_FIELDS}
+        out["product_properties"] = [{"name": name, "value": value} for name, value in self.product_properties]
+        out["image_urls"] = list(self.image_urls)
+        return out
+
+
+_NORMALIZED_FIELDS = tuple(f.name for f in fields(NormalizedItem))
+
+
+class _SchemaPlan:
+    """
+    План нормализации для одного набора ключей (все товары одного фида устроены одинаково):
+    какие из ключей-синонимов вообще есть в записи и какие ключи идут в productProperties под каким именем.
+    Значения по-прежнему читаются из каждой записи, поэтому результат тот же, что у построчного разбора.
+    """
+
+    __slots__ = (
+        "item_name_keys",
+        "description_keys",
+        "quantity_keys",
+        "ean_keys",
+        "mpn_keys",
+        "item_number_keys",
+        "country_keys",
+        "zustand_keys",
+        "properties",
+        "unique_property_names",
+    )
+
+    def __init__(self, keys: Tuple[Any, ...]) -> None:
+        present = set(keys)
+        self.item_name_keys = tuple(k for k in _ITEM_NAME_KEYS if k in present)
+        self.description_keys = tuple(k for k in _DESCRIPTION_KEYS if k in present)
+        self.quantity_keys = tuple(k for k in _QUANTITY_KEYS if k in present)
+        self.ean_keys = tuple(k for k in _EAN_KEYS if k in present)
+        self.mpn_keys = tuple(k for k in _MPN_KEYS if k in present)
+        self.item_number_keys = tuple(k for k in _ITEM_NUMBER_KEYS if k in present)
+        self.country_keys = tuple(k for k in _COUNTRY_KEYS if k in present)
+        self.zustand_keys = tuple(k for k in _ZUSTAND_KEYS if k in present)
+
+        properties: List[Tuple[Any, str]] = []
+        for key in keys:
+            if not _is_property_key(str(key)):
+                continue
+            prop_name = _normalize_property_name(str(key))
+            if prop_name:
+                properties.append((key, prop_name))
+        self.properties = tuple(properties)
+        # Имена уникальны — дубли при сборке можно не отслеживать.
+        self.unique_property_names = len({name for _, name in properties}) == len(properties)
+
+    def apply(self, raw: Dict[str, Any]) -> NormalizedItem:
+        internal_id = raw.get("ID") or raw.get("id")
+        reference_id = raw.get("reference_id") or (f"ART{internal_id}" if internal_id is not None else None)
+
+        item_name = _first_truthy(raw, self.item_name_keys) or (
+            f"Item {internal_id}" if internal_id is not None else ""
+        )
+
+        # Описание: избегаем плейсхолдера "<-StammBeschreibung->"
+        desc_raw = _first_truthy(raw, self.description_keys) or ""
+        if not desc_raw or "<-StammBeschreibung->" in str(desc_raw):
+            desc_raw = str(item_name)
+        description = str(desc_raw).strip()
+        # Подстрахуемся по длине описания (требование Hood: описание не слишком короткое)
+        if len(description) < 80:
+            description = description + _DESCRIPTION_SUFFIX
+
+        # Цена: как в твоём скрипте — напрямую из Startpreis,
+        # без дополнительного форматирования/передёргивания.
+        price_str = str(raw.get("Startpreis", "0.00"))
+
+        # Количество: сначала Menge / "Anzahl der Einheiten", потом прочие поля
+        quantity = _first_truthy(raw, self.quantity_keys) or 1
+        try:
+            quantity_int = int(quantity)
+        except (TypeError, ValueError):
+            quantity_int = 1
+
+        original_category = str(raw.get("CategoryID", ""))
+
+        # In many feeds, the "main" image is stored in PictureURL.
+        images: List[str] = []
+        seen_images = set()
+        pictureurls = raw.get("pictureurls")
+        candidates = [raw.get("PictureURL")]
+        if isinstance(pictureurls, list):
+            candidates.extend(pictureurls)
+        for url in candidates:
+            value = str(url or "").strip()
+            if not value or value in seen_images:
+                continue
+            seen_images.add(value)
+            images.append(value)
+
+        # CategoryID должна быть валидной по справочнику Hood.
+        # Если исходная категория невалидна/пустая, подбираем по названию+описанию.
+        if original_category and original_category in _VALID_CATEGORY_IDS:
+            category = original_category
+        else:
+            category = closest_category(str(item_name), str(description))
+
+        ean = _first_present(raw, self.ean_keys)
+        mpn = _first_present(raw, self.mpn_keys) or (f"JVM{ean}" if ean else "")
+        item_number = _first_present(raw, self.item_number_keys) or (str(ean) if ean else "")
+        country = _first_present(raw, self.country_keys) or ""
+        zustand = _first_present(raw, self.zustand_keys)
+        if not zustand and str(raw.get("ConditionID", "")).strip() == "1000":
+            zustand = "Neu"
+
+        # productProperties: отправляем все характеристики конкретного товара,
+        # кроме служебных/технических полей.
+        product_properties: List[Tuple[str, str]] = []
+        if self.unique_property_names:
+            for key, prop_name in self.properties:
+                value = _normalize_property_value(raw[key])
+                if value:
+                    product_properties.append((prop_name, value))
+        else:
+            seen_names = set()
+            for key, prop_name in self.properties:
+                if prop_name in seen_names:
+                    continue
+                value = _normalize_property_value(raw[key])
+                if value:
+                    product_properties.append((prop_name, value))
+                    seen_names.add(prop_name)
+
+        # Как в примере: жёстко "new" и "shopProduct"
+        return NormalizedItem(
+            reference_id=reference_id or "",
+            item_name=str(item_name),
+            description=str(description),
+            price=price_str,
+            quantity=quantity_int,
+            category_id=str(category),
+            condition="new",
+            item_mode="shopProduct",
+            ean=ean,
+            mpn=str(mpn).strip(),
+            item_number=str(item_number).strip(),
+            country=str(country).strip(),
+            product_properties=tuple(product_properties),
+            image_urls=tuple(images),
+            raw=raw,
+        )
+
+
+def _first_truthy(raw: Dict[str, Any], keys: Tuple[str, ...]) -> Any:
+    for key in keys:
+        value = raw.get(key)
+        if value:
+            return value
+    return None
 
 
-def normalize_item(raw: Dict[str, Any]) -> Dict[str, Any]:
+def _first_present(raw: Dict[str, Any], keys: Tuple[str, ...]) -> Any:
+    for key in keys:
+        value = raw.get(key)
+        if value not in (None, ""):
+            return value
+    return None
+
+
+def _schema_plan(keys: Tuple[Any, ...]) -> _SchemaPlan:
+    plan = _SCHEMA_PLANS.get(keys)
+    if plan is None:
+        if len(_SCHEMA_PLANS) >= _SCHEMA_PLAN_CACHE_SIZE:
+            _SCHEMA_PLANS.clear()
+        # Гонка потоков безвредна: в худшем случае план построится дважды.
+        plan = _SCHEMA_PLANS[keys] = _SchemaPlan(keys)
+    return plan
+
+
+def normalize_item(raw: Dict[str, Any], compact: bool = False) -> Dict[str, Any] | NormalizedItem:
     """
     Приводит запись товара из JSON к единому формату для работы с Hood API.
 
@@ -223,168 +525,26 @@ def normalize_item(raw: Dict[str, Any]) -> Dict[str, Any]:
       - Price / price        — цена
       - Quantity / qty       — количество
       - CategoryID / category_id — категория
-    """
-    internal_id = raw.get("ID") or raw.get("id")
-    reference_id = raw.get("reference_id") or (f"ART{internal_id}" if internal_id is not None else None)
-
-    # ????????
-    item_name = (
-        raw.get("Artikelbeschreibung")
-        or raw.get("Name")
-        or raw.get("TITLE")
-        or raw.get("title")
-        or raw.get("item_name")
-        or (f"Item {internal_id}" if internal_id is not None else "")
-    )
-
-    # Описание: избегаем плейсхолдера "<-StammBeschreibung->"
-    desc_raw = (
-        raw.get("Description")
-        or raw.get("DESC")
-        or raw.get("description")
-        or ""
-    )
-    if not desc_raw or "<-StammBeschreibung->" in str(desc_raw):
-        desc_raw = str(item_name)
-    description = str(desc_raw).strip()
-    # Подстрахуемся по длине описания (требование Hood: описание не слишком короткое)
-    if len(description) < 80:
-        description = (
-            description
-            + "\n\nAusführliche Produktbeschreibung folgt. "
-              "Alle wichtigen Details entnehmen Sie bitte den Artikelbildern und technischen Daten."
-        )
-
-    # Цена: как в твоём скрипте — напрямую из Startpreis,
-    # без дополнительного форматирования/передёргивания.
-    price = raw.get("Startpreis", "0.00")
-    price_str = str(price)
-
-    # Количество: сначала Menge / "Anzahl der Einheiten", потом прочие поля
-    quantity = (
-        raw.get("Menge")
-        or raw.get("Anzahl der Einheiten")
-        or raw.get("Quantity")
-        or raw.get("quantity")
-        or raw.get("qty")
-        or 1
-    )
-    try:
-        quantity_int = int(quantity)
-    except (TypeError, ValueError):
-        quantity_int = 1
 
-    original_category = str(raw.get("CategoryID", ""))
-
-    # Как в примере: жёстко "new" и "shopProduct"
-    condition = "new"
-    item_mode = "shopProduct"
+    compact=True — вернуть NormalizedItem вместо словаря.
+    """
+    item = _schema_plan(tuple(raw)).apply(raw)
+    return item if compact else item.to_dict()
 
-    # ???????????: ?????????? pictureurls (??????) ??? PictureURL (????)
-    images = []
-    seen_images = set()
-
-    def add_image(url: Any) -> None:
-        value = str(url or "").strip()
-        if not value or value in seen_images:
-            return
-        seen_images.add(value)
-        images.append(value)
-
-    # In many feeds, the "main" image is stored in PictureURL.
-    add_image(raw.get("PictureURL"))
-
-    pictureurls = raw.get("pictureurls")
-    if isinstance(pictureurls, list):
-        for u in pictureurls:
-            add_image(u)
-
-    # CategoryID должна быть валидной по справочнику Hood.
-    # Если исходная категория невалидна/пустая, подбираем по названию+описанию.
-    valid_ids = {c["category_id"] for c in CATEGORIES}
-    if original_category and original_category in valid_ids:
-        category = original_category
-    else:
-        category = closest_category(str(item_name), str(description))
-
-    def first_present(*keys: str) -> Any:
-        for key in keys:
-            if key in raw and raw.get(key) not in (None, ""):
-                return raw.get(key)
-        return None
-
-    ean = first_present("EAN", "ean", "GTIN / EAN", "GTIN / EAN:")
-    mpn = (
-        first_present("Herstellernummer", "Hersteller Nr.", "Hersteller Nr.:", "MPN")
-        or (f"JVM{ean}" if ean else "")
-    )
-    item_number = first_present("item_number", "ItemNumber") or (str(ean) if ean else "")
-    country = first_present("Country", "country", "country_code", "Herkunftsland") or ""
-    zustand = first_present("Zustand", "Zustand:")
-    if not zustand and str(raw.get("ConditionID", "")).strip() == "1000":
-        zustand = "Neu"
-
-    # productProperties: отправляем все характеристики конкретного товара,
-    # кроме служебных/технических полей.
-    def is_property_key(key: str) -> bool:
-        if not key or key in PROPERTY_EXCLUDE_EXACT:
-            return False
-        if key.startswith("__"):
-            return False
-        return not any(key.startswith(prefix) for prefix in PROPERTY_EXCLUDE_PREFIXES)
-
-    def normalize_property_name(key: str) -> str:
-        key = str(key).strip()
-        key = PROPERTY_NAME_ALIASES.get(key, key)
-        if key.endswith(":"):
-            key = key[:-1].strip()
-        return key
-
-    def normalize_property_value(value: Any) -> str:
-        if value is None:
-            return ""
-        if isinstance(value, list):
-            return ", ".join(str(v).strip() for v in value if str(v).strip())
-        if isinstance(value, str):
-            return str(value).strip()
-        return ""
 
-    property_key_pairs = []
-    for raw_key, raw_value in raw.items():
-        raw_key = str(raw_key)
-        if not is_property_key(raw_key):
-            continue
-        value = normalize_property_value(raw_value)
-        if not value:
-            continue
-        prop_name = normalize_property_name(raw_key)
-        if not prop_name:
-            continue
-        property_key_pairs.append((prop_name, value))
-    product_properties = []
-    seen_names = set()
-    for prop_name, value in property_key_pairs:
-        if prop_name in seen_names:
-            continue
-        if not value:
-            continue
-        product_properties.append({"name": prop_name, "value": value})
-        seen_names.add(prop_name)
-
-    return {
-        "reference_id": reference_id or "",
-        "item_name": str(item_name),
-        "description": str(description),
-        "price": price_str,
-        "quantity": quantity_int,
-        "category_id": str(category),
-        "condition": str(condition),
-        "item_mode": str(item_mode),
-        "ean": ean,
-        "mpn": str(mpn).strip(),
-        "item_number": str(item_number).strip(),
-        "country": str(country).strip(),
-        "product_properties": product_properties,
-        "image_urls": images,
-        "raw": raw,
-    }
+def normalize_items(items: Iterable[Dict[str, Any]], compact: bool = False) -> List[Any]:
+    """
+    То же, что [normalize_item(raw, compact) for raw in items], но план по набору ключей берётся один раз
+    на серию записей с одинаковыми ключами (обычно — на весь файл), а не ищется для каждой записи.
+    """
+    out: List[Any] = []
+    last_keys: Tuple[Any, ...] | None = None
+    plan: _SchemaPlan | None = None
+    for raw in items:
+        keys = tuple(raw)
+        if plan is None or keys != last_keys:
+            plan = _schema_plan(keys)
+            last_keys = keys
+        item = plan.apply(raw)
+        out.append(item if compact else item.to_dict())
+    return out
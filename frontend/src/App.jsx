@@ -29,7 +29,7 @@ export default function App() {
   const [activeUpdateJobId, setActiveUpdateJobId] = useState("");
   const [connectionOk, setConnectionOk] = useState(false);
   const [uploadedSplitLists, setUploadedSplitLists] = useState({ uploaded: [], notUploaded: [] });
-  const updatePollTimerRef = useRef(null);
+  const jobStreamRef = useRef(null);
   const [status, setStatus] = useState({
     type: "idle",
     title: "Ready",
@@ -71,13 +71,60 @@ export default function App() {
     return `${urlWithAccount}${separator}source_file=${encodeURIComponent(sourceFile)}`;
   }
 
-  function stopUpdatePolling() {
-    if (updatePollTimerRef.current) {
-      clearInterval(updatePollTimerRef.current);
-      updatePollTimerRef.current = null;
+  function stopJobStream() {
+    if (jobStreamRef.current) {
+      jobStreamRef.current.close();
+      jobStreamRef.current = null;
     }
   }
 
+  async function fetchJobStatus(url, label) {
+    try {
+      const res = await fetch(url);
+      const text = await res.text();
+      const data = parseResponseBody(text);
+      const body = typeof data === "string" ? data : pretty(data);
+      setRawOutput([`GET ${url}`, `HTTP ${res.status}`, "", body].join("\n"));
+      setLastActionAt(Date.now());
+      if (!res.ok) {
+        setUiStatus("error", label, `Status check failed: HTTP ${res.status}`);
+        return null;
+      }
+      return data;
+    } catch (e) {
+      setUiStatus("error", label, String(e));
+      return null;
+    }
+  }
+
+  // Progress is pushed over SSE (coalesced by the backend); the full job with its result is fetched once at the end.
+  function watchJob(kind, jobId, statusUrl, label, showJob) {
+    stopJobStream();
+    const eventsUrl = `${endpoints.jobs}/${kind}/${encodeURIComponent(jobId)}/events`;
+    const source = new EventSource(eventsUrl);
+    jobStreamRef.current = source;
+    source.addEventListener("job", async (event) => {
+      const data = parseResponseBody(event.data);
+      const statusValue = String(data?.status || "");
+      if (statusValue === "completed" || statusValue === "failed") {
+        stopJobStream();
+        const job = await fetchJobStatus(withAccount(statusUrl), label);
+        if (job) showJob(job);
+        return;
+      }
+      setRawOutput([`SSE ${eventsUrl}`, "", pretty(data)].join("\n"));
+      setLastActionAt(Date.now());
+      showJob(data);
+    });
+    source.onerror = () => {
+      // EventSource reconnects by itself; CLOSED means the stream was rejected (e.g. job not found).
+      if (source.readyState === EventSource.CLOSED) {
+        setUiStatus("error", label, "Job progress stream closed.");
+        stopJobStream();
+      }
+    };
+  }
+
   function toSplitListItem(rawItem) {
     if (!rawItem || typeof rawItem !== "object") {
       return {
@@ -122,285 +169,209 @@ export default function App() {
     return `${label}: ${items.length}\n\n${lines.join("\n")}`;
   }
 
-  async function pollUpdateJob(jobId, statusBase = endpoints.updateAsync, label = "Async update", processName = "update_async") {
-    const url = withAccount(`${statusBase}/${encodeURIComponent(jobId)}`);
-    try {
-      const res = await fetch(url);
-      const text = await res.text();
-      const data = parseResponseBody(text);
-      const body = typeof data === "string" ? data : pretty(data);
-      setRawOutput([`GET ${url}`, `HTTP ${res.status}`, "", body].join("\n"));
-      setLastActionAt(Date.now());
-
-      if (!res.ok) {
-        setUiStatus("error", label, `Status check failed: HTTP ${res.status}`);
-        stopUpdatePolling();
-        return;
-      }
-
-      const statusValue = String(data?.status || "");
-      const progress = data?.progress || {};
-      const processedItems = Number(progress?.processed_items || 0);
-      const totalItems = Number(progress?.total_items || progress?.prepared || data?.result?.prepared || 0);
-      const updatedItems = Number(progress?.updated || data?.result?.updated || 0);
-      const failedItems = Number(progress?.failed || data?.result?.failed || 0);
-      const phase = String(progress?.phase || "");
-      pushProcessLog(processName, `status=${statusValue || "-"} phase=${phase || "-"}`);
-
-      if (statusValue === "queued") {
-        setUiStatus("loading", label, `Queued. Job: ${jobId}`);
-        return;
-      }
-      if (statusValue === "running") {
-        setUiStatus(
-          "loading",
-          label,
-          `Running: ${processedItems}/${totalItems} processed, updated ${updatedItems}, failed ${failedItems}${phase ? ` (${phase})` : ""}`
-        );
-        return;
-      }
-      if (statusValue === "completed") {
-        setUiStatus(
-          "success",
-          label,
-          `Completed: updated ${updatedItems}, failed ${failedItems}, processed ${processedItems}/${totalItems}`
-        );
-        stopUpdatePolling();
-        return;
-      }
-      if (statusValue === "failed") {
-        setUiStatus("error", label, `Failed: ${data?.error || "unknown error"}`);
-        stopUpdatePolling();
-      }
-    } catch (e) {
-      setUiStatus("error", label, String(e));
-      stopUpdatePolling();
+  function showUpdateJob(jobId, data, label = "Async update", processName = "update_async") {
+    const statusValue = String(data?.status || "");
+    const progress = data?.progress || {};
+    const processedItems = Number(progress?.processed_items || 0);
+    const totalItems = Number(progress?.total_items || progress?.prepared || data?.result?.prepared || 0);
+    const updatedItems = Number(progress?.updated || data?.result?.updated || 0);
+    const failedItems = Number(progress?.failed || data?.result?.failed || 0);
+    const phase = String(progress?.phase || "");
+    pushProcessLog(processName, `status=${statusValue || "-"} phase=${phase || "-"}`);
+
+    if (statusValue === "queued") {
+      setUiStatus("loading", label, `Queued. Job: ${jobId}`);
+      return;
+    }
+    if (statusValue === "running") {
+      setUiStatus(
+        "loading",
+        label,
+        `Running: ${processedItems}/${totalItems} processed, updated ${updatedItems}, failed ${failedItems}${phase ? ` (${phase})` : ""}`
+      );
+      return;
+    }
+    if (statusValue === "completed") {
+      setUiStatus(
+        "success",
+        label,
+        `Completed: updated ${updatedItems}, failed ${failedItems}, processed ${processedItems}/${totalItems}`
+      );
+      stopJobStream();
+      return;
+    }
+    if (statusValue === "failed") {
+      setUiStatus("error", label, `Failed: ${data?.error || "unknown error"}`);
+      stopJobStream();
     }
   }
 
-  async function pollUploadJob(jobId) {
-    const url = withAccount(`${endpoints.uploadAsync}/${encodeURIComponent(jobId)}`);
-    try {
-      const res = await fetch(url);
-      const text = await res.text();
-      const data = parseResponseBody(text);
-      const body = typeof data === "string" ? data : pretty(data);
-      setRawOutput([`GET ${url}`, `HTTP ${res.status}`, "", body].join("\n"));
-      setLastActionAt(Date.now());
-
-      if (!res.ok) {
-        setUiStatus("error", "Async upload", `Status check failed: HTTP ${res.status}`);
-        stopUpdatePolling();
-        return;
-      }
-
-      const statusValue = String(data?.status || "");
-      const progress = data?.progress || {};
-      const filesTotal = Number(progress?.files_total || 0);
-      const filesCompleted = Number(progress?.files_completed || 0);
-      const isManyFiles = filesTotal > 0 || data?.mode === "many_files";
-      const fileProcessedItems = Number(progress?.file_processed_items || 0);
-      const fileTotalItems = Number(progress?.file_total_items || 0);
-      const processedItems = Number(progress?.processed_items || 0);
-      const totalItems = Number(progress?.total_items || data?.result?.length || 0);
-      const successItems = Number(progress?.success || 0);
-      const failedItems = Number(progress?.failed || 0);
-      const phase = String(progress?.phase || "");
-      pushProcessLog("upload_async", `status=${statusValue || "-"} phase=${phase || "-"}`);
-
-      if (statusValue === "queued") {
-        setUiStatus("loading", "Async upload", `Queued. Job: ${jobId}`);
-        return;
-      }
-      if (statusValue === "running") {
-        const manyFilesText =
-          fileTotalItems > 0
-            ? `Running: files ${filesCompleted}/${filesTotal}, current file ${fileProcessedItems}/${fileTotalItems}, success ${successItems}, failed ${failedItems}`
-            : `Running: files ${filesCompleted}/${filesTotal}, success ${successItems}, failed ${failedItems}`;
-        const mainText = isManyFiles
-          ? manyFilesText
-          : `Running: ${processedItems}/${totalItems} processed, success ${successItems}, failed ${failedItems}`;
-        setUiStatus("loading", "Async upload", `${mainText}${phase ? ` (${phase})` : ""}`);
-        return;
-      }
-      if (statusValue === "completed") {
-        const completedText = isManyFiles
-          ? `Completed: files ${filesCompleted}/${filesTotal}, success ${successItems}, failed ${failedItems}`
-          : `Completed: success ${successItems}, failed ${failedItems}, processed ${processedItems}/${totalItems}`;
-        setUiStatus("success", "Async upload", completedText);
-        stopUpdatePolling();
-        return;
-      }
-      if (statusValue === "failed") {
-        setUiStatus("error", "Async upload", `Failed: ${data?.error || "unknown error"}`);
-        stopUpdatePolling();
-      }
-    } catch (e) {
-      setUiStatus("error", "Async upload", String(e));
-      stopUpdatePolling();
+  function showUploadJob(jobId, data) {
+    const statusValue = String(data?.status || "");
+    const progress = data?.progress || {};
+    const filesTotal = Number(progress?.files_total || 0);
+    const filesCompleted = Number(progress?.files_completed || 0);
+    const isManyFiles = filesTotal > 0 || data?.mode === "many_files";
+    const fileProcessedItems = Number(progress?.file_processed_items || 0);
+    const fileTotalItems = Number(progress?.file_total_items || 0);
+    const processedItems = Number(progress?.processed_items || 0);
+    const totalItems = Number(progress?.total_items || data?.result?.length || 0);
+    const successItems = Number(progress?.success || 0);
+    const failedItems = Number(progress?.failed || 0);
+    const phase = String(progress?.phase || "");
+    pushProcessLog("upload_async", `status=${statusValue || "-"} phase=${phase || "-"}`);
+
+    if (statusValue === "queued") {
+      setUiStatus("loading", "Async upload", `Queued. Job: ${jobId}`);
+      return;
+    }
+    if (statusValue === "running") {
+      const manyFilesText =
+        fileTotalItems > 0
+          ? `Running: files ${filesCompleted}/${filesTotal}, current file ${fileProcessedItems}/${fileTotalItems}, success ${successItems}, failed ${failedItems}`
+          : `Running: files ${filesCompleted}/${filesTotal}, success ${successItems}, failed ${failedItems}`;
+      const mainText = isManyFiles
+        ? manyFilesText
+        : `Running: ${processedItems}/${totalItems} processed, success ${successItems}, failed ${failedItems}`;
+      setUiStatus("loading", "Async upload", `${mainText}${phase ? ` (${phase})` : ""}`);
+      return;
+    }
+    if (statusValue === "completed") {
+      const completedText = isManyFiles
+        ? `Completed: files ${filesCompleted}/${filesTotal}, success ${successItems}, failed ${failedItems}`
+        : `Completed: success ${successItems}, failed ${failedItems}, processed ${processedItems}/${totalItems}`;
+      setUiStatus("success", "Async upload", completedText);
+      stopJobStream();
+      return;
+    }
+    if (statusValue === "failed") {
+      setUiStatus("error", "Async upload", `Failed: ${data?.error || "unknown error"}`);
+      stopJobStream();
     }
   }
 
-  async function pollDeleteJob(jobId) {
-    const url = withAccount(`${endpoints.deleteAsyncStatus}/${encodeURIComponent(jobId)}`);
-    try {
-      const res = await fetch(url);
-      const text = await res.text();
-      const data = parseResponseBody(text);
-      const body = typeof data === "string" ? data : pretty(data);
-      setRawOutput([`GET ${url}`, `HTTP ${res.status}`, "", body].join("\n"));
-      setLastActionAt(Date.now());
-
-      if (!res.ok) {
-        setUiStatus("error", "Async delete", `Status check failed: HTTP ${res.status}`);
-        stopUpdatePolling();
-        return;
-      }
-
-      const statusValue = String(data?.status || "");
-      const progress = data?.progress || {};
-      const requestedRaw = progress?.requested ?? data?.result?.requested ?? null;
-      const deletedRaw = progress?.deleted ?? data?.result?.deleted ?? null;
-      const failedRaw = progress?.failed ?? data?.result?.failed ?? null;
-      const requested = requestedRaw == null ? null : Number(requestedRaw);
-      const deleted = deletedRaw == null ? null : Number(deletedRaw);
-      const failed = failedRaw == null ? null : Number(failedRaw);
-      const filesTotal = Number(progress?.files_total ?? data?.result?.files_total ?? 0);
-      const filesCompleted = Number(progress?.files_completed ?? data?.result?.files_completed ?? 0);
-      const failedFiles = Number(progress?.failed_files ?? data?.result?.failed_files ?? 0);
-      const phase = String(progress?.phase || "");
-      pushProcessLog("delete_async", `status=${statusValue || "-"} phase=${phase || "-"}`);
-
-      if (statusValue === "queued") {
-        setUiStatus("loading", "Async delete", `Queued. Job: ${jobId}`);
+  function showDeleteJob(jobId, data) {
+    const statusValue = String(data?.status || "");
+    const progress = data?.progress || {};
+    const requestedRaw = progress?.requested ?? data?.result?.requested ?? null;
+    const deletedRaw = progress?.deleted ?? data?.result?.deleted ?? null;
+    const failedRaw = progress?.failed ?? data?.result?.failed ?? null;
+    const requested = requestedRaw == null ? null : Number(requestedRaw);
+    const deleted = deletedRaw == null ? null : Number(deletedRaw);
+    const failed = failedRaw == null ? null : Number(failedRaw);
+    const filesTotal = Number(progress?.files_total ?? data?.result?.files_total ?? 0);
+    const filesCompleted = Number(progress?.files_completed ?? data?.result?.files_completed ?? 0);
+    const failedFiles = Number(progress?.failed_files ?? data?.result?.failed_files ?? 0);
+    const phase = String(progress?.phase || "");
+    pushProcessLog("delete_async", `status=${statusValue || "-"} phase=${phase || "-"}`);
+
+    if (statusValue === "queued") {
+      setUiStatus("loading", "Async delete", `Queued. Job: ${jobId}`);
+      return;
+    }
+    if (statusValue === "running") {
+      if (phase === "taking_ids") {
+        const processedIds = Number(progress?.processed ?? 0);
+        const totalIds = Number(progress?.total ?? 0);
+        const collectedIds = Number(progress?.collected ?? 0);
+        const suffix = totalIds > 0 ? `${processedIds}/${totalIds}` : `${processedIds}`;
+        setUiStatus(
+          "loading",
+          "Async delete",
+          `Taking IDs: ${suffix}, collected ${collectedIds}`
+        );
         return;
       }
-      if (statusValue === "running") {
-        if (phase === "taking_ids") {
-          const processedIds = Number(progress?.processed ?? 0);
-          const totalIds = Number(progress?.total ?? 0);
-          const collectedIds = Number(progress?.collected ?? 0);
-          const suffix = totalIds > 0 ? `${processedIds}/${totalIds}` : `${processedIds}`;
-          setUiStatus(
-            "loading",
-            "Async delete",
-            `Taking IDs: ${suffix}, collected ${collectedIds}`
-          );
-          return;
-        }
-        if (phase === "loading_items") {
-          const fetchedItems = Number(progress?.fetched_items ?? 0);
-          const totalItems = Number(progress?.total_items ?? 0);
-          const suffix = totalItems > 0 ? `${fetchedItems}/${totalItems}` : `${fetchedItems}`;
-          setUiStatus("loading", "Async delete", `Loading items: ${suffix}`);
-          return;
-        }
-        if (phase === "deleting_files") {
-          setUiStatus(
-            "loading",
-            "Async delete",
-            `Running: files ${filesCompleted}/${filesTotal}, requested ${requested ?? "-"}, deleted ${deleted ?? "-"}, failed ${failed ?? "-"}, failed files ${failedFiles}`
-          );
-          return;
-        }
-        const metrics =
-          requested == null && deleted == null && failed == null
-            ? "Running: processing..."
-            : `Running: requested ${requested ?? "-"}, deleted ${deleted ?? "-"}, failed ${failed ?? "-"}`;
-        setUiStatus("loading", "Async delete", `${metrics}${phase ? ` (${phase})` : ""}`);
+      if (phase === "loading_items") {
+        const fetchedItems = Number(progress?.fetched_items ?? 0);
+        const totalItems = Number(progress?.total_items ?? 0);
+        const suffix = totalItems > 0 ? `${fetchedItems}/${totalItems}` : `${fetchedItems}`;
+        setUiStatus("loading", "Async delete", `Loading items: ${suffix}`);
         return;
       }
-      if (statusValue === "completed") {
+      if (phase === "deleting_files") {
         setUiStatus(
-          "success",
+          "loading",
           "Async delete",
-          filesTotal > 0
-            ? `Completed: files ${filesCompleted}/${filesTotal}, deleted ${deleted ?? 0}, failed ${failed ?? 0}, failed files ${failedFiles}, requested ${requested ?? 0}`
-            : `Completed: deleted ${deleted ?? 0}, failed ${failed ?? 0}, requested ${requested ?? 0}`
+          `Running: files ${filesCompleted}/${filesTotal}, requested ${requested ?? "-"}, deleted ${deleted ?? "-"}, failed ${failed ?? "-"}, failed files ${failedFiles}`
         );
-        stopUpdatePolling();
         return;
       }
-      if (statusValue === "failed") {
-        setUiStatus("error", "Async delete", `Failed: ${data?.error || "unknown error"}`);
-        stopUpdatePolling();
-      }
-    } catch (e) {
-      setUiStatus("error", "Async delete", String(e));
-      stopUpdatePolling();
+      const metrics =
+        requested == null && deleted == null && failed == null
+          ? "Running: processing..."
+          : `Running: requested ${requested ?? "-"}, deleted ${deleted ?? "-"}, failed ${failed ?? "-"}`;
+      setUiStatus("loading", "Async delete", `${metrics}${phase ? ` (${phase})` : ""}`);
+      return;
+    }
+    if (statusValue === "completed") {
+      setUiStatus(
+        "success",
+        "Async delete",
+        filesTotal > 0
+          ? `Completed: files ${filesCompleted}/${filesTotal}, deleted ${deleted ?? 0}, failed ${failed ?? 0}, failed files ${failedFiles}, requested ${requested ?? 0}`
+          : `Completed: deleted ${deleted ?? 0}, failed ${failed ?? 0}, requested ${requested ?? 0}`
+      );
+      stopJobStream();
+      return;
+    }
+    if (statusValue === "failed") {
+      setUiStatus("error", "Async delete", `Failed: ${data?.error || "unknown error"}`);
+      stopJobStream();
     }
   }
 
-  async function pollUploadedSplitJob(jobId) {
-    const url = withAccount(`${endpoints.uploadedSplitAsync}/${encodeURIComponent(jobId)}`);
-    try {
-      const res = await fetch(url);
-      const text = await res.text();
-      const data = parseResponseBody(text);
-      const body = typeof data === "string" ? data : pretty(data);
-      setRawOutput([`GET ${url}`, `HTTP ${res.status}`, "", body].join("\n"));
-      setLastActionAt(Date.now());
-
-      if (!res.ok) {
-        setUiStatus("error", "Uploaded split", `Status check failed: HTTP ${res.status}`);
-        stopUpdatePolling();
-        return;
-      }
-
-      const statusValue = String(data?.status || "");
-      const progress = data?.progress || {};
-      const phase = String(progress?.phase || "");
-      pushProcessLog("uploaded_split_async", `status=${statusValue || "-"} phase=${phase || "-"}`);
-      const statusesDone = Number(progress?.statuses_done || 0);
-      const statusesTotal = Number(progress?.statuses_total || 0);
-      const processedItems = Number(progress?.processed_items || 0);
-      const totalItems = Number(progress?.total_items || 0);
-      const uploaded = Number(progress?.uploaded || data?.result?.uploaded_count || 0);
-      const notUploaded = Number(progress?.not_uploaded || data?.result?.not_uploaded_count || 0);
-
-      if (statusValue === "queued") {
-        setUiStatus("loading", "Uploaded split", `Queued. Job: ${jobId}`);
-        return;
-      }
-      if (statusValue === "running") {
-        if (phase === "loading_hood_items") {
-          setUiStatus(
-            "loading",
-            "Uploaded split",
-            `Loading Hood items: statuses ${statusesDone}/${statusesTotal}`
-          );
-          return;
-        }
-        if (phase === "splitting_local_items") {
-          setUiStatus(
-            "loading",
-            "Uploaded split",
-            `Splitting local items: ${processedItems}/${totalItems}, uploaded ${uploaded}, not uploaded ${notUploaded}`
-          );
-          return;
-        }
-        setUiStatus("loading", "Uploaded split", `Running...${phase ? ` (${phase})` : ""}`);
+  function showUploadedSplitJob(jobId, data) {
+    const statusValue = String(data?.status || "");
+    const progress = data?.progress || {};
+    const phase = String(progress?.phase || "");
+    pushProcessLog("uploaded_split_async", `status=${statusValue || "-"} phase=${phase || "-"}`);
+    const statusesDone = Number(progress?.statuses_done || 0);
+    const statusesTotal = Number(progress?.statuses_total || 0);
+    const processedItems = Number(progress?.processed_items || 0);
+    const totalItems = Number(progress?.total_items || 0);
+    const uploaded = Number(progress?.uploaded || data?.result?.uploaded_count || 0);
+    const notUploaded = Number(progress?.not_uploaded || data?.result?.not_uploaded_count || 0);
+
+    if (statusValue === "queued") {
+      setUiStatus("loading", "Uploaded split", `Queued. Job: ${jobId}`);
+      return;
+    }
+    if (statusValue === "running") {
+      if (phase === "loading_hood_items") {
+        setUiStatus(
+          "loading",
+          "Uploaded split",
+          `Loading Hood items: statuses ${statusesDone}/${statusesTotal}`
+        );
         return;
       }
-      if (statusValue === "completed") {
-        const partial = Boolean(data?.result?.partial);
-        const warningsCount = Array.isArray(data?.result?.warnings) ? data.result.warnings.length : 0;
-        setUploadedSplitLists(buildSplitListsFromResult(data?.result || {}));
+      if (phase === "splitting_local_items") {
         setUiStatus(
-          "success",
+          "loading",
           "Uploaded split",
-          `Completed: uploaded ${uploaded}, not uploaded ${notUploaded}${partial ? `, partial with warnings ${warningsCount}` : ""}`
+          `Splitting local items: ${processedItems}/${totalItems}, uploaded ${uploaded}, not uploaded ${notUploaded}`
         );
-        stopUpdatePolling();
         return;
       }
-      if (statusValue === "failed") {
-        setUiStatus("error", "Uploaded split", `Failed: ${data?.error || "unknown error"}`);
-        stopUpdatePolling();
-      }
-    } catch (e) {
-      setUiStatus("error", "Uploaded split", String(e));
-      stopUpdatePolling();
+      setUiStatus("loading", "Uploaded split", `Running...${phase ? ` (${phase})` : ""}`);
+      return;
+    }
+    if (statusValue === "completed") {
+      const partial = Boolean(data?.result?.partial);
+      const warningsCount = Array.isArray(data?.result?.warnings) ? data.result.warnings.length : 0;
+      setUploadedSplitLists(buildSplitListsFromResult(data?.result || {}));
+      setUiStatus(
+        "success",
+        "Uploaded split",
+        `Completed: uploaded ${uploaded}, not uploaded ${notUploaded}${partial ? `, partial with warnings ${warningsCount}` : ""}`
+      );
+      stopJobStream();
+      return;
+    }
+    if (statusValue === "failed") {
+      setUiStatus("error", "Uploaded split", `Failed: ${data?.error || "unknown error"}`);
+      stopJobStream();
     }
   }
 
@@ -432,13 +403,12 @@ export default function App() {
         return;
       }
       setActiveUpdateJobId(jobId);
-      stopUpdatePolling();
+      stopJobStream();
       pushProcessLog("delete_async", `queued job_id=${jobId}`);
       setUiStatus("loading", label, `Queued. Job: ${jobId}`);
-      await pollDeleteJob(jobId);
-      updatePollTimerRef.current = setInterval(() => {
-        pollDeleteJob(jobId);
-      }, 2000);
+      watchJob("delete", jobId, `${endpoints.deleteAsyncStatus}/${encodeURIComponent(jobId)}`, "Async delete", (data) =>
+        showDeleteJob(jobId, data)
+      );
     } catch (e) {
       setUiStatus("error", label, String(e));
     } finally {
@@ -660,13 +630,12 @@ export default function App() {
         return;
       }
       setActiveUpdateJobId(jobId);
-      stopUpdatePolling();
+      stopJobStream();
       pushProcessLog("upload_async", `queued job_id=${jobId}`);
       setUiStatus("loading", "Async upload", `Queued. Job: ${jobId}`);
-      await pollUploadJob(jobId);
-      updatePollTimerRef.current = setInterval(() => {
-        pollUploadJob(jobId);
-      }, 2000);
+      watchJob("upload", jobId, `${endpoints.uploadAsync}/${encodeURIComponent(jobId)}`, "Async upload", (data) =>
+        showUploadJob(jobId, data)
+      );
     } catch (e) {
       setUiStatus("error", "Async upload", String(e));
     } finally {
@@ -709,13 +678,12 @@ export default function App() {
         return;
       }
       setActiveUpdateJobId(jobId);
-      stopUpdatePolling();
+      stopJobStream();
       pushProcessLog("upload_many_async", `queued job_id=${jobId}`);
       setUiStatus("loading", "Async upload", `Queued. Job: ${jobId}`);
-      await pollUploadJob(jobId);
-      updatePollTimerRef.current = setInterval(() => {
-        pollUploadJob(jobId);
-      }, 2000);
+      watchJob("upload", jobId, `${endpoints.uploadAsync}/${encodeURIComponent(jobId)}`, "Async upload", (data) =>
+        showUploadJob(jobId, data)
+      );
     } catch (e) {
       setUiStatus("error", "Async upload", String(e));
     } finally {
@@ -757,13 +725,12 @@ export default function App() {
         return;
       }
       setActiveUpdateJobId(jobId);
-      stopUpdatePolling();
+      stopJobStream();
       pushProcessLog("update_async", `queued job_id=${jobId}`);
       setUiStatus("loading", "Async update", `Queued. Job: ${jobId}`);
-      await pollUpdateJob(jobId);
-      updatePollTimerRef.current = setInterval(() => {
-        pollUpdateJob(jobId);
-      }, 2000);
+      watchJob("update", jobId, `${endpoints.updateAsync}/${encodeURIComponent(jobId)}`, "Async update", (data) =>
+        showUpdateJob(jobId, data)
+      );
     } catch (e) {
       setUiStatus("error", "Async update", String(e));
     } finally {
@@ -801,13 +768,12 @@ export default function App() {
         return;
       }
       setActiveUpdateJobId(jobId);
-      stopUpdatePolling();
+      stopJobStream();
       pushProcessLog("upload_async", `queued job_id=${jobId}`);
       setUiStatus("loading", "Async upload (all JSON files)", `Queued. Job: ${jobId}`);
-      await pollUploadJob(jobId);
-      updatePollTimerRef.current = setInterval(() => {
-        pollUploadJob(jobId);
-      }, 2000);
+      watchJob("upload", jobId, `${endpoints.uploadAsync}/${encodeURIComponent(jobId)}`, "Async upload", (data) =>
+        showUploadJob(jobId, data)
+      );
     } catch (e) {
       setUiStatus("error", "Async upload (all JSON files)", String(e));
     } finally {
@@ -845,13 +811,16 @@ export default function App() {
         return;
       }
       setActiveUpdateJobId(jobId);
-      stopUpdatePolling();
+      stopJobStream();
       pushProcessLog("update_all_async", `queued job_id=${jobId}`);
       setUiStatus("loading", "Async update (all JSON files)", `Queued. Job: ${jobId}`);
-      await pollUpdateJob(jobId, endpoints.updateAllAsync, "Async update (all JSON files)", "update_all_async");
-      updatePollTimerRef.current = setInterval(() => {
-        pollUpdateJob(jobId, endpoints.updateAllAsync, "Async update (all JSON files)", "update_all_async");
-      }, 2000);
+      watchJob(
+        "update",
+        jobId,
+        `${endpoints.updateAllAsync}/${encodeURIComponent(jobId)}`,
+        "Async update (all JSON files)",
+        (data) => showUpdateJob(jobId, data, "Async update (all JSON files)", "update_all_async")
+      );
     } catch (e) {
       setUiStatus("error", "Async update (all JSON files)", String(e));
     } finally {
@@ -906,13 +875,12 @@ export default function App() {
         return;
       }
       setActiveUpdateJobId(jobId);
-      stopUpdatePolling();
+      stopJobStream();
       pushProcessLog("uploaded_split_async", `queued job_id=${jobId}`);
       setUiStatus("loading", "Uploaded split", `Queued. Job: ${jobId}`);
-      await pollUploadedSplitJob(jobId);
-      updatePollTimerRef.current = setInterval(() => {
-        pollUploadedSplitJob(jobId);
-      }, 2000);
+      watchJob("split", jobId, `${endpoints.uploadedSplitAsync}/${encodeURIComponent(jobId)}`, "Uploaded split", (data) =>
+        showUploadedSplitJob(jobId, data)
+      );
     } catch (e) {
       setUiStatus("error", "Uploaded split", String(e));
     } finally {
@@ -977,7 +945,7 @@ export default function App() {
     );
   }
 
-  useEffect(() => () => stopUpdatePolling(), []);
+  useEffect(() => () => stopJobStream(), []);
 
   const statusClass = `status status-${status.type}`;
 
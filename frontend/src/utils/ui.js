@@ -70,5 +70,6 @@ export function buildEndpoints(apiBase) {
     deleteBySourceFilesAsync: `${base}/items/delete/by-source-files_async`,
     deleteAll: `${base}/items/delete/all`,
     deleteAllAsync: `${base}/items/delete/all_async`,
+    jobs: `${base}/items/jobs`,
   };
 }
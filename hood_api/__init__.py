@@ -1,9 +1,11 @@
 """Пакет Hood API: конфиг, отправка запросов, сборка XML и парсинг ответов."""
 
 from .config import ApiConfig
-from .client import send_request
+from .client import AsyncHoodClient, async_send_request, send_request
 
 __all__ = [
     "ApiConfig",
     "send_request",
+    "async_send_request",
+    "AsyncHoodClient",
 ]
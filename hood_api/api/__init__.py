@@ -6,8 +6,10 @@ from .parsers import (
     parse_item_update_response,
     parse_item_detail_response,
     parse_item_list_response,
+    iter_item_list_response,
     parse_item_status_response,
     parse_order_list_response,
+    iter_order_list_response,
     parse_update_order_status_response,
     parse_rate_buyer_response,
     parse_categories_browse_response,
@@ -21,8 +23,10 @@ __all__ = [
     "parse_item_update_response",
     "parse_item_detail_response",
     "parse_item_list_response",
+    "iter_item_list_response",
     "parse_item_status_response",
     "parse_order_list_response",
+    "iter_order_list_response",
     "parse_update_order_status_response",
     "parse_rate_buyer_response",
     "parse_categories_browse_response",
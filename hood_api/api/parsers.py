@@ -3,8 +3,66 @@
 Преобразуют сырой XML в структурированные данные (dict/list) для использования на сайте.
 """
 
+import io
+import os
+import threading
 import xml.etree.ElementTree as ET
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+try:
+    from lxml import etree as _lxml_etree
+except ImportError:  # lxml не обязателен: без него работает стандартный ElementTree.
+    _lxml_etree = None
+
+_LXML_PARSERS = threading.local()
+
+
+def _use_lxml() -> bool:
+    if _lxml_etree is None:
+        return False
+    return os.environ.get("HOOD_XML_PARSER", "auto").strip().lower() != "etree"
+
+
+def _lxml_parser():
+    # Парсер lxml нельзя делить между потоками — держим свой на каждый поток.
+    parser = getattr(_LXML_PARSERS, "parser", None)
+    if parser is None:
+        parser = _lxml_etree.XMLParser(resolve_entities=False, no_network=True, huge_tree=True)
+        _LXML_PARSERS.parser = parser
+    return parser
+
+
+def _parse_root(xml_str: str) -> ET.Element:
+    """
+    Разбирает ответ один раз. При установленном lxml (и HOOD_XML_PARSER != etree) использует его;
+    find/findall/text у lxml совместимы с ElementTree. Ошибка разбора всегда ET.ParseError.
+    """
+    if not _use_lxml():
+        return ET.fromstring(xml_str)
+    data = xml_str.encode("utf-8") if isinstance(xml_str, str) else xml_str
+    try:
+        return _lxml_etree.fromstring(data, _lxml_parser())
+    except _lxml_etree.XMLSyntaxError as exc:
+        raise ET.ParseError(str(exc)) from exc
+
+
+def _iterparse(xml_str: str) -> Iterator[tuple]:
+    """События start/end тем же бэкендом, что и _parse_root."""
+    data = xml_str.encode("utf-8") if isinstance(xml_str, str) else xml_str
+    if not _use_lxml():
+        yield from ET.iterparse(io.BytesIO(data), events=("start", "end"))
+        return
+    events = _lxml_etree.iterparse(
+        io.BytesIO(data),
+        events=("start", "end"),
+        resolve_entities=False,
+        no_network=True,
+        huge_tree=True,
+    )
+    try:
+        yield from events
+    except _lxml_etree.XMLSyntaxError as exc:
+        raise ET.ParseError(str(exc)) from exc
 
 
 def _text(el: Optional[ET.Element]) -> str:
@@ -18,12 +76,7 @@ def _find_text(root: ET.Element, tag: str, default: str = "") -> str:
     return _text(child) if child is not None else default
 
 
-def parse_generic_response(xml_str: str) -> Dict[str, Any]:
-    """
-    Базовый парсер: статус, сообщение, ошибки.
-    Возвращает dict: status, message, errors (список), success.
-    """
-    root = ET.fromstring(xml_str)
+def _generic_from_root(root: ET.Element) -> Dict[str, Any]:
     status = _find_text(root, "status", "unknown")
     message = _find_text(root, "message")
     errors: List[str] = []
@@ -39,10 +92,18 @@ def parse_generic_response(xml_str: str) -> Dict[str, Any]:
     }
 
 
+def parse_generic_response(xml_str: str) -> Dict[str, Any]:
+    """
+    Базовый парсер: статус, сообщение, ошибки.
+    Возвращает dict: status, message, errors (список), success.
+    """
+    return _generic_from_root(_parse_root(xml_str))
+
+
 def parse_item_insert_response(xml_str: str) -> Dict[str, Any]:
     """Парсит ответ itemInsert и itemValidate: referenceID, status, itemID, cost, message (Hood API Doc)."""
-    data = parse_generic_response(xml_str)
-    root = ET.fromstring(xml_str)
+    root = _parse_root(xml_str)
+    data = _generic_from_root(root)
     item = root.find(".//item")
     if item is not None:
         data["item_id"] = _find_text(item, "itemID")
@@ -64,19 +125,8 @@ def parse_item_insert_response(xml_str: str) -> Dict[str, Any]:
     return data
 
 
-def parse_item_delete_response(xml_str: str) -> Dict[str, Any]:
-    """
-    Парсит ответ itemDelete.
-    У Hood часто нет глобального <status>, поэтому учитываем статусы в <items>/<item>.
-    """
-    data = parse_generic_response(xml_str)
-    root = ET.fromstring(xml_str)
-    item_errors = [_text(el) for el in root.findall(".//itemError") if _text(el)]
-    if item_errors:
-        data["errors"] = (data.get("errors") or []) + item_errors
-        if not data.get("message"):
-            data["message"] = item_errors[0]
-
+def _item_results(root: ET.Element) -> tuple[List[Dict[str, Any]], List[str]]:
+    """Результаты по <item> (itemDelete/itemUpdate) и их статусы в нижнем регистре."""
     item_results: List[Dict[str, Any]] = []
     item_statuses: List[str] = []
     for item in root.findall(".//item"):
@@ -95,7 +145,23 @@ def parse_item_delete_response(xml_str: str) -> Dict[str, Any]:
                     "message": item_message or None,
                 }
             )
+    return item_results, item_statuses
+
+
+def parse_item_delete_response(xml_str: str) -> Dict[str, Any]:
+    """
+    Парсит ответ itemDelete.
+    У Hood часто нет глобального <status>, поэтому учитываем статусы в <items>/<item>.
+    """
+    root = _parse_root(xml_str)
+    data = _generic_from_root(root)
+    item_errors = [_text(el) for el in root.findall(".//itemError") if _text(el)]
+    if item_errors:
+        data["errors"] = (data.get("errors") or []) + item_errors
+        if not data.get("message"):
+            data["message"] = item_errors[0]
 
+    item_results, item_statuses = _item_results(root)
     if item_results:
         data["items"] = item_results
 
@@ -115,28 +181,10 @@ def parse_item_update_response(xml_str: str) -> Dict[str, Any]:
     Парсит ответ itemUpdate.
     У Hood часто нет глобального <status>, поэтому учитываем статусы в <items>/<item>.
     """
-    data = parse_generic_response(xml_str)
-    root = ET.fromstring(xml_str)
-
-    item_results: List[Dict[str, Any]] = []
-    item_statuses: List[str] = []
-    for item in root.findall(".//item"):
-        item_number = _find_text(item, "itemNumber")
-        item_id = _find_text(item, "itemID")
-        item_status = _find_text(item, "status")
-        item_message = _find_text(item, "message")
-        if item_status:
-            item_statuses.append(item_status.lower())
-        if item_number or item_id or item_status or item_message:
-            item_results.append(
-                {
-                    "item_number": item_number or None,
-                    "item_id": item_id or None,
-                    "status": item_status or None,
-                    "message": item_message or None,
-                }
-            )
+    root = _parse_root(xml_str)
+    data = _generic_from_root(root)
 
+    item_results, item_statuses = _item_results(root)
     if item_results:
         data["items"] = item_results
 
@@ -203,8 +251,8 @@ def _item_element_to_dict(item: ET.Element) -> Dict[str, Any]:
 
 def parse_item_detail_response(xml_str: str) -> Dict[str, Any]:
     """Парсит ответ itemDetail: данные по одному товару."""
-    data = parse_generic_response(xml_str)
-    root = ET.fromstring(xml_str)
+    root = _parse_root(xml_str)
+    data = _generic_from_root(root)
     items_data: List[Dict[str, Any]] = []
     for item in root.findall(".//item"):
         items_data.append(_item_element_to_dict(item))
@@ -212,26 +260,87 @@ def parse_item_detail_response(xml_str: str) -> Dict[str, Any]:
     return data
 
 
+def _iter_records(
+    xml_str: str,
+    record_tag: str,
+    convert: Callable[[ET.Element], Dict[str, Any]],
+    summary: Dict[str, Any],
+) -> Iterator[Dict[str, Any]]:
+    """
+    Потоковый проход по ответу: отдаёт convert(el) для каждого <record_tag> (не вложенного в такой же)
+    и сразу освобождает элемент, так что в памяти держится одна запись, а не всё дерево.
+    После исчерпания summary содержит status/message/errors/success (как parse_generic_response)
+    и текст остальных прямых потомков корня под ключом "_top".
+    """
+    stack: List[ET.Element] = []
+    depth_in_record = 0
+    top: Dict[str, str] = {}
+    errors: List[str] = []
+    for event, el in _iterparse(xml_str):
+        if event == "start":
+            stack.append(el)
+            if el.tag == record_tag:
+                depth_in_record += 1
+            continue
+        stack.pop()
+        if el.tag == record_tag:
+            depth_in_record -= 1
+            if depth_in_record == 0:
+                yield convert(el)
+                el.clear()
+                if stack:
+                    stack[-1].remove(el)
+            continue
+        if el.tag == "error" and stack:
+            msg = _text(el) or (el.get("message") or "")
+            if msg:
+                errors.append(msg)
+        elif len(stack) == 1 and el.tag not in top:
+            top[el.tag] = _text(el)
+
+    status = top.get("status", "unknown")
+    summary.update(
+        {
+            "status": status,
+            "message": top.get("message") or None,
+            "errors": errors,
+            "success": status.lower() in ("success", "ok", "1"),
+            "_top": top,
+        }
+    )
+
+
+def iter_item_list_response(xml_str: str, summary: Dict[str, Any] | None = None) -> Iterator[Dict[str, Any]]:
+    """
+    Потоковый вариант parse_item_list_response: товары по одному, без построения всего дерева.
+    Если передан summary, после исчерпания генератора в нём те же поля, что и в parse_item_list_response
+    (кроме items): status, message, errors, success, total_records, start_at, group_size.
+    """
+    summary = summary if summary is not None else {}
+    count = 0
+    for item in _iter_records(xml_str, "item", _item_element_to_dict, summary):
+        count += 1
+        yield item
+    top = summary.pop("_top")
+    summary["total_records"] = int(top.get("totalRecords") or "0")
+    summary["start_at"] = int(top.get("startAt") or "0")
+    summary["group_size"] = int(top.get("groupSize") or "0")
+    if not summary["errors"] and (count > 0 or summary["total_records"] > 0):
+        summary["success"] = True
+
+
 def parse_item_list_response(xml_str: str) -> Dict[str, Any]:
     """Парсит ответ itemList: список товаров, totalRecords, startAt, groupSize."""
-    data = parse_generic_response(xml_str)
-    root = ET.fromstring(xml_str)
-    data["total_records"] = int(_find_text(root, "totalRecords") or "0")
-    data["start_at"] = int(_find_text(root, "startAt") or "0")
-    data["group_size"] = int(_find_text(root, "groupSize") or "0")
-    items_data: List[Dict[str, Any]] = []
-    for item in root.findall(".//item"):
-        items_data.append(_item_element_to_dict(item))
+    data: Dict[str, Any] = {}
+    items_data = list(iter_item_list_response(xml_str, data))
     data["items"] = items_data
-    if not data["errors"] and (len(items_data) > 0 or data["total_records"] > 0):
-        data["success"] = True
     return data
 
 
 def parse_item_status_response(xml_str: str) -> Dict[str, Any]:
     """Парсит ответ itemStatus."""
-    data = parse_generic_response(xml_str)
-    root = ET.fromstring(xml_str)
+    root = _parse_root(xml_str)
+    data = _generic_from_root(root)
     items_data: List[Dict[str, Any]] = []
     for item in root.findall(".//item"):
         items_data.append(_item_element_to_dict(item))
@@ -277,21 +386,28 @@ def _order_element_to_dict(order_el: ET.Element) -> Dict[str, Any]:
     return out
 
 
+def iter_order_list_response(xml_str: str, summary: Dict[str, Any] | None = None) -> Iterator[Dict[str, Any]]:
+    """
+    Потоковый вариант parse_order_list_response: заказы по одному.
+    summary после исчерпания: status, message, errors, success.
+    """
+    summary = summary if summary is not None else {}
+    yield from _iter_records(xml_str, "order", _order_element_to_dict, summary)
+    summary.pop("_top", None)
+
+
 def parse_order_list_response(xml_str: str) -> Dict[str, Any]:
     """Парсит ответ orderList."""
-    data = parse_generic_response(xml_str)
-    root = ET.fromstring(xml_str)
-    orders: List[Dict[str, Any]] = []
-    for order_el in root.findall(".//order"):
-        orders.append(_order_element_to_dict(order_el))
+    data: Dict[str, Any] = {}
+    orders = list(iter_order_list_response(xml_str, data))
     data["orders"] = orders
     return data
 
 
 def parse_update_order_status_response(xml_str: str) -> Dict[str, Any]:
     """Парсит ответ updateOrderStatus."""
-    data = parse_generic_response(xml_str)
-    root = ET.fromstring(xml_str)
+    root = _parse_root(xml_str)
+    data = _generic_from_root(root)
     results: List[Dict[str, Any]] = []
     for order in root.findall(".//order"):
         results.append({
@@ -306,8 +422,8 @@ def parse_update_order_status_response(xml_str: str) -> Dict[str, Any]:
 
 def parse_rate_buyer_response(xml_str: str) -> Dict[str, Any]:
     """Парсит ответ rateBuyer."""
-    data = parse_generic_response(xml_str)
-    root = ET.fromstring(xml_str)
+    root = _parse_root(xml_str)
+    data = _generic_from_root(root)
     results: List[Dict[str, Any]] = []
     for order in root.findall(".//order"):
         results.append({
@@ -320,8 +436,8 @@ def parse_rate_buyer_response(xml_str: str) -> Dict[str, Any]:
 
 def parse_categories_browse_response(xml_str: str) -> Dict[str, Any]:
     """Парсит ответ categoriesBrowse."""
-    data = parse_generic_response(xml_str)
-    root = ET.fromstring(xml_str)
+    root = _parse_root(xml_str)
+    data = _generic_from_root(root)
     categories: List[Dict[str, Any]] = []
     for c in root.findall(".//category"):
         categories.append({
@@ -335,8 +451,8 @@ def parse_categories_browse_response(xml_str: str) -> Dict[str, Any]:
 
 def parse_shop_categories_list_response(xml_str: str) -> Dict[str, Any]:
     """Парсит ответ shopCategoriesList."""
-    data = parse_generic_response(xml_str)
-    root = ET.fromstring(xml_str)
+    root = _parse_root(xml_str)
+    data = _generic_from_root(root)
     categories: List[Dict[str, Any]] = []
     for c in root.findall(".//shopCategory") or root.findall(".//category"):
         categories.append({
@@ -350,8 +466,8 @@ def parse_shop_categories_list_response(xml_str: str) -> Dict[str, Any]:
 
 def parse_shop_category_mutation_response(xml_str: str) -> Dict[str, Any]:
     """Парсит ответ shopCategoriesInsert/Update/Delete."""
-    data = parse_generic_response(xml_str)
-    root = ET.fromstring(xml_str)
+    root = _parse_root(xml_str)
+    data = _generic_from_root(root)
     data["category_id"] = _find_text(root, "prodCatID")
     data["category_name"] = _find_text(root, "prodCatName")
     return data
@@ -7,8 +7,9 @@ import hashlib
 import html
 import os
 from datetime import datetime
+from functools import lru_cache
 from xml.etree import ElementTree as ET
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 
 from .config import ApiConfig
 
@@ -116,12 +117,7 @@ def _password_hash(password: str) -> str:
 
 
 def _api_head(config: ApiConfig, function: str) -> str:
-    ph = _password_hash(config.password)
-    return f"""<?xml version="1.0" encoding="UTF-8"?>
-<api type="public" version="2.0.1" user="{config.user}" password="{ph}">
-    <function>{function}</function>
-    <accountName>{config.user}</accountName>
-    <accountPass>{ph}</accountPass>"""
+    return _account_template(config).head(function)
 
 
 def _elem(parent: ET.Element, tag: str, text: str | None = None) -> None:
@@ -179,12 +175,20 @@ def _delivery_days(country: str | None) -> tuple[str, str]:
     return DELIVERY_DAYS_BY_COUNTRY.get(code, ("20", "40"))
 
 
-def _build_short_desc(item_name: str, product_properties: Optional[List[Dict[str, Any]]]) -> str:
+def _property_pairs(product_properties: Optional[Iterable[Any]]) -> Iterator[Tuple[Any, Any]]:
+    """productProperties as (name, value): accepts {"name", "value"} dicts and compact (name, value) pairs."""
+    for prop in product_properties or ():
+        if isinstance(prop, dict):
+            yield prop.get("name", ""), prop.get("value")
+        else:
+            yield prop[0], prop[1]
+
+
+def _build_short_desc(item_name: str, product_properties: Optional[Iterable[Any]]) -> str:
     title = str(item_name or "").strip()
     attrs: List[str] = []
-    for prop in product_properties or []:
-        name = str(prop.get("name", "")).strip()
-        value = prop.get("value")
+    for name, value in _property_pairs(product_properties):
+        name = str(name).strip()
         if value is None:
             continue
         if isinstance(value, list):
@@ -251,6 +255,47 @@ def _build_default_safety_instructions_xml() -> str:
     return f"<safetyInstructions>{instructions}</safetyInstructions>"
 
 
+class _AccountTemplate:
+    """
+    Неизменные для аккаунта части запросов: хэш пароля, шапка <api> по function,
+    профиль компании и готовый XML productContactInformation/safetyInstructions.
+    Собирается один раз на ApiConfig, билдеры добавляют только поля товаров.
+    """
+
+    __slots__ = ("user", "password_hash", "manufacturer_name", "contact_xml", "safety_xml", "_heads")
+
+    def __init__(self, config: ApiConfig) -> None:
+        company_profile = _resolve_company_profile(config)
+        self.user = config.user
+        self.password_hash = _password_hash(config.password)
+        self.manufacturer_name = str(company_profile.get("item_manufacturer") or DEFAULT_ITEM_MANUFACTURER)
+        self.contact_xml = _build_default_product_contact_information_xml(company_profile)
+        self.safety_xml = _build_default_safety_instructions_xml()
+        self._heads: Dict[str, str] = {}
+
+    def head(self, function: str) -> str:
+        head = self._heads.get(function)
+        if head is None:
+            ph = self.password_hash
+            head = f"""<?xml version="1.0" encoding="UTF-8"?>
+<api type="public" version="2.0.1" user="{self.user}" password="{ph}">
+    <function>{function}</function>
+    <accountName>{self.user}</accountName>
+    <accountPass>{ph}</accountPass>"""
+            self._heads[function] = head
+        return head
+
+
+@lru_cache(maxsize=32)
+def _compile_account_template(config: ApiConfig, xl_user: str) -> _AccountTemplate:
+    return _AccountTemplate(config)
+
+
+def _account_template(config: ApiConfig) -> _AccountTemplate:
+    # HOOD_API_XLUSER входит в ключ кэша: от него зависит профиль компании.
+    return _compile_account_template(config, os.environ.get("HOOD_API_XLUSER", ""))
+
+
 def _build_item_insert_or_validate(
     reference_id: str,
     title: str,
@@ -263,7 +308,7 @@ def _build_item_insert_or_validate(
     pay_options: List[str],
     ship_methods: List[Dict[str, Any]],
     image_urls: List[str],
-    product_properties: Optional[List[Dict[str, Any]]],
+    product_properties: Optional[Iterable[Any]],
     ean: Optional[str],
     mpn: Optional[str],
     item_number: Optional[str],
@@ -273,7 +318,8 @@ def _build_item_insert_or_validate(
     country: Optional[str] = None,
 ) -> str:
     """РћР±С‰Р°СЏ СЃР±РѕСЂРєР° XML РґР»СЏ itemInsert Рё itemValidate (Hood API Doc 2.0.1: С‚Р° Р¶Рµ СЃС‚СЂСѓРєС‚СѓСЂР°)."""
-    ph = _password_hash(config.password)
+    template = _account_template(config)
+    ph = template.password_hash
     pay_opts = pay_options or ["paypal"]
     ship_list = ship_methods or [{"name": "DHLPacket", "country": "nat", "value": "5.99"}]
     title_ok = (title or "").strip()
@@ -285,8 +331,7 @@ def _build_item_insert_or_validate(
     cond_ok = (condition or "new").strip()
     mode_ok = (item_mode or "classic").strip()
 
-    company_profile = _resolve_company_profile(config)
-    manufacturer_name = str(company_profile.get("item_manufacturer") or DEFAULT_ITEM_MANUFACTURER)
+    manufacturer_name = template.manufacturer_name
     now = datetime.now()
     delivery_from, delivery_to = _delivery_days(country)
     short_desc = _build_short_desc(title_ok, product_properties)
@@ -304,9 +349,8 @@ def _build_item_insert_or_validate(
     item_number_ok = (item_number or "").strip()
 
     properties_xml_parts = []
-    for prop in (product_properties or []):
-        prop_name = str(prop.get("name", "")).strip()
-        prop_value = prop.get("value")
+    for prop_name, prop_value in _property_pairs(product_properties):
+        prop_name = str(prop_name).strip()
         if not prop_name or prop_value is None:
             continue
         if isinstance(prop_value, list):
@@ -359,8 +403,8 @@ def _build_item_insert_or_validate(
         item_lines.append(f"<productProperties>{product_properties_xml}</productProperties>")
     if images_xml:
         item_lines.append(f"<images>{images_xml}</images>")
-    item_lines.append(_build_default_product_contact_information_xml(company_profile))
-    item_lines.append(_build_default_safety_instructions_xml())
+    item_lines.append(template.contact_xml)
+    item_lines.append(template.safety_xml)
     item_body = "\n        ".join(item_lines)
 
     return (
@@ -386,7 +430,7 @@ def build_item_insert(
     pay_options: List[str],
     ship_methods: List[Dict[str, Any]],
     image_urls: List[str],
-    product_properties: Optional[List[Dict[str, Any]]] = None,
+    product_properties: Optional[Iterable[Any]] = None,
     ean: Optional[str] = None,
     mpn: Optional[str] = None,
     item_number: Optional[str] = None,
@@ -416,7 +460,7 @@ def build_item_validate(
     pay_options: List[str],
     ship_methods: List[Dict[str, Any]],
     image_urls: List[str],
-    product_properties: Optional[List[Dict[str, Any]]] = None,
+    product_properties: Optional[Iterable[Any]] = None,
     ean: Optional[str] = None,
     mpn: Optional[str] = None,
     item_number: Optional[str] = None,
@@ -436,7 +480,7 @@ def build_item_validate(
 def build_item_detail(item_id: str, config: ApiConfig | None = None) -> str:
     """itemDetail: function, accountName, accountPass, items/item/itemID (Р±РµР· РЅРёС… API РІРѕР·РІСЂР°С‰Р°РµС‚ globalError)."""
     config = config or ApiConfig.from_env()
-    ph = _password_hash(config.password)
+    ph = _account_template(config).password_hash
     api = ET.Element("api", type="public", version="2.0.1", user=config.user, password=ph)
     ET.SubElement(api, "function").text = "itemDetail"
     ET.SubElement(api, "accountName").text = config.user
@@ -451,7 +495,7 @@ def build_item_detail(item_id: str, config: ApiConfig | None = None) -> str:
 def build_item_detail_by_item_number(item_number: str, config: ApiConfig | None = None) -> str:
     """itemDetail by itemNumber in root body (used by account-specific Hood setups)."""
     config = config or ApiConfig.from_env()
-    ph = _password_hash(config.password)
+    ph = _account_template(config).password_hash
     api = ET.Element("api", type="public", version="2.0.1", user=config.user, password=ph)
     ET.SubElement(api, "function").text = "itemDetail"
     ET.SubElement(api, "accountName").text = config.user
@@ -560,6 +604,7 @@ def _legacy_build_item_update(items: List[Dict[str, Any]], config: ApiConfig | N
 def build_item_update(items: List[Dict[str, Any]], config: ApiConfig | None = None) -> str:
     """itemUpdate: обновление до 5 товаров тем же набором полей, что и itemInsert."""
     config = config or ApiConfig.from_env()
+    template = _account_template(config)
     parts = []
     for it in items:
         item_id = str(it.get("itemID") or "").strip()
@@ -586,8 +631,7 @@ def build_item_update(items: List[Dict[str, Any]], config: ApiConfig | None = No
         price_num = _to_float(it.get("price"))
         price = _format_decimal(price_num)
 
-        company_profile = _resolve_company_profile(config)
-        manufacturer_name = str(company_profile.get("item_manufacturer") or DEFAULT_ITEM_MANUFACTURER)
+        manufacturer_name = template.manufacturer_name
         now = datetime.now()
         delivery_from, delivery_to = _delivery_days(country)
         short_desc = _build_short_desc(title, product_properties)
@@ -601,9 +645,8 @@ def build_item_update(items: List[Dict[str, Any]], config: ApiConfig | None = No
         images_xml = "".join(f"<imageURL>{html.escape(u)}</imageURL>" for u in clean_image_urls)
 
         properties_xml_parts = []
-        for prop in product_properties:
-            prop_name = str(prop.get("name", "")).strip()
-            prop_value = prop.get("value")
+        for prop_name, prop_value in _property_pairs(product_properties):
+            prop_name = str(prop_name).strip()
             if not prop_name or prop_value is None:
                 continue
             if isinstance(prop_value, list):
@@ -662,8 +705,8 @@ def build_item_update(items: List[Dict[str, Any]], config: ApiConfig | None = No
             lines.append(f"<productProperties>{product_properties_xml}</productProperties>")
         if images_xml:
             lines.append(f"<images>{images_xml}</images>")
-        lines.append(_build_default_product_contact_information_xml(company_profile))
-        lines.append(_build_default_safety_instructions_xml())
+        lines.append(template.contact_xml)
+        lines.append(template.safety_xml)
         parts.append("\n            ".join(["<item>", *lines, "</item>"]))
     items_xml = "\n        ".join(parts)
     return f"""{_api_head(config, "itemUpdate")}
@@ -673,6 +716,37 @@ def build_item_update(items: List[Dict[str, Any]], config: ApiConfig | None = No
 </api>"""
 
 
+def build_item_price_update(items: List[Dict[str, Any]], config: ApiConfig | None = None) -> str:
+    """
+    itemUpdate только с ценой/количеством: без описания, свойств, картинок и блоков производителя.
+    items: itemID или item_number, price, необязательно quantity.
+    """
+    config = config or ApiConfig.from_env()
+    parts = []
+    for it in items:
+        item_id = str(it.get("itemID") or "").strip()
+        item_number = str(it.get("item_number") or it.get("itemNumber") or it.get("ean") or "").strip()
+        if not item_id and not item_number:
+            continue
+        price_num = _to_float(it.get("price"))
+        lines: List[str] = []
+        if item_id:
+            lines.append(f"<itemID>{_escape_text(item_id)}</itemID>")
+        else:
+            lines.append(f"<itemNumber>{_escape_text(item_number)}</itemNumber>")
+        lines.append(f"<price>{_format_decimal(price_num)}</price>")
+        lines.append(f"<listPrice>{_format_decimal(_process_uvp(price_num))}</listPrice>")
+        if it.get("quantity") is not None:
+            lines.append(f"<quantity>{int(it.get('quantity') or 0)}</quantity>")
+        parts.append("".join(["<item>", *lines, "</item>"]))
+    items_xml = "\n        ".join(parts)
+    return f"""{_api_head(config, "itemUpdate")}
+    <items>
+        {items_xml}
+    </items>
+</api>"""
+
+
 def build_order_list(start_date: str, end_date: str, list_mode: str = "details",
                      order_id: Optional[str] = None, config: ApiConfig = None) -> str:
     """orderList: СЃРїРёСЃРѕРє Р·Р°РєР°Р·РѕРІ."""
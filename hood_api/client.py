@@ -1,15 +1,28 @@
-"""Единый HTTP-клиент для запросов к Hood API."""
+"""Единый HTTP-клиент для запросов к Hood API (синхронный и asyncio)."""
 
+import asyncio
 import os
 import re
 import time
+import weakref
 
+import httpx
 import requests
 from requests.adapters import HTTPAdapter
 
+from .concurrency import get_concurrency_limiter
 from .config import ApiConfig
+from .ratelimit import get_rate_limiter
 
 _SESSION: requests.Session | None = None
+_ASYNC_CLIENTS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncHoodClient]" = weakref.WeakKeyDictionary()
+
+_HEADERS = {
+    "Content-Type": "text/xml; charset=UTF-8",
+    "User-Agent": "HoodApiClient/1.0",
+}
+# Retry only transient statuses.
+_RETRY_STATUSES = (429, 500, 502, 503, 504)
 
 
 def _get_session() -> requests.Session:
@@ -33,47 +46,60 @@ def _get_session() -> requests.Session:
     return session
 
 
-def send_request(xml_body: str, config: ApiConfig | None = None) -> str:
-    """
-    Отправляет XML-запрос к Hood API и возвращает ответ как строку.
-    Для устойчивости на больших партиях использует configurable timeout + retries.
-    """
+def _debug_print_request(xml_body: str) -> None:
     if os.environ.get("HOOD_DEBUG", "").strip().lower() in ("1", "true", "yes"):
         masked = re.sub(r'password="[^"]*"', 'password="***"', xml_body)
         print("--- Запрос (password=***) ---\n", masked, "\n---", flush=True)
 
-    cfg = config or ApiConfig.from_env()
-    headers = {
-        "Content-Type": "text/xml; charset=UTF-8",
-        "User-Agent": "HoodApiClient/1.0",
-    }
 
+def _retry_settings() -> tuple[float, float, int, float]:
+    """connect timeout, read timeout, число попыток, базовая пауза backoff."""
     connect_timeout = float(os.environ.get("HOOD_API_CONNECT_TIMEOUT_SECONDS", "30"))
     read_timeout = float(os.environ.get("HOOD_API_TIMEOUT_SECONDS", "300"))
     max_retries = int(os.environ.get("HOOD_API_MAX_RETRIES", "3"))
     base_backoff = float(os.environ.get("HOOD_API_RETRY_BACKOFF_SECONDS", "2"))
+    return connect_timeout, read_timeout, max_retries, base_backoff
+
+
+def send_request(xml_body: str, config: ApiConfig | None = None) -> str:
+    """
+    Отправляет XML-запрос к Hood API и возвращает ответ как строку.
+    Для устойчивости на больших партиях использует configurable timeout + retries.
+    """
+    _debug_print_request(xml_body)
+
+    cfg = config or ApiConfig.from_env()
+    connect_timeout, read_timeout, max_retries, base_backoff = _retry_settings()
 
     last_exc: Exception | None = None
     session = _get_session()
+    limiter = get_rate_limiter(cfg)
+    adaptive = get_concurrency_limiter(cfg)
     for attempt in range(1, max_retries + 1):
+        if limiter is not None:
+            limiter.acquire()
+        started = time.monotonic()
         try:
             response = session.post(
                 cfg.base_url,
                 data=xml_body.encode("utf-8"),
-                headers=headers,
+                headers=_HEADERS,
                 timeout=(connect_timeout, read_timeout),
             )
             response.raise_for_status()
+            if adaptive is not None:
+                adaptive.record(time.monotonic() - started, overloaded=False)
             return response.text
         except requests.HTTPError as exc:
             status_code = exc.response.status_code if exc.response is not None else 0
-            # Retry only transient statuses.
-            if status_code not in (429, 500, 502, 503, 504):
+            if status_code not in _RETRY_STATUSES:
                 raise
             last_exc = exc
         except (requests.Timeout, requests.ConnectionError) as exc:
             last_exc = exc
 
+        if adaptive is not None:
+            adaptive.record(None, overloaded=True)
         if attempt >= max_retries:
             break
         time.sleep(base_backoff * (2 ** (attempt - 1)))
@@ -81,3 +107,104 @@ def send_request(xml_body: str, config: ApiConfig | None = None) -> str:
     if last_exc is not None:
         raise last_exc
     raise RuntimeError("Hood API request failed without exception details")
+
+
+class AsyncHoodClient:
+    """
+    Асинхронный клиент Hood API на общем пуле соединений httpx.
+    Один экземпляр держит сотни одновременных запросов в одном event loop
+    без отдельного потока на каждый вызов. Retry/backoff такие же, как у send_request.
+    """
+
+    def __init__(
+        self,
+        config: ApiConfig | None = None,
+        max_connections: int | None = None,
+        max_keepalive_connections: int | None = None,
+    ) -> None:
+        self.config = config
+        self._max_connections = max_connections or int(os.environ.get("HOOD_API_ASYNC_MAX_CONNECTIONS", "100"))
+        self._max_keepalive = max_keepalive_connections or int(
+            os.environ.get("HOOD_API_ASYNC_MAX_KEEPALIVE", "32")
+        )
+        self._client: httpx.AsyncClient | None = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            connect_timeout, read_timeout, _, _ = _retry_settings()
+            self._client = httpx.AsyncClient(
+                headers=_HEADERS,
+                timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+                limits=httpx.Limits(
+                    max_connections=self._max_connections,
+                    max_keepalive_connections=self._max_keepalive,
+                ),
+            )
+        return self._client
+
+    async def send(self, xml_body: str, config: ApiConfig | None = None) -> str:
+        _debug_print_request(xml_body)
+
+        cfg = config or self.config or ApiConfig.from_env()
+        _, _, max_retries, base_backoff = _retry_settings()
+
+        last_exc: Exception | None = None
+        client = self._get_client()
+        limiter = get_rate_limiter(cfg)
+        adaptive = get_concurrency_limiter(cfg)
+        for attempt in range(1, max_retries + 1):
+            if limiter is not None:
+                await limiter.acquire_async()
+            started = time.monotonic()
+            try:
+                response = await client.post(cfg.base_url, content=xml_body.encode("utf-8"))
+                response.raise_for_status()
+                if adaptive is not None:
+                    adaptive.record(time.monotonic() - started, overloaded=False)
+                return response.text
+            except httpx.HTTPStatusError as exc:
+                if exc.response.status_code not in _RETRY_STATUSES:
+                    raise
+                last_exc = exc
+            except (httpx.TimeoutException, httpx.TransportError) as exc:
+                last_exc = exc
+
+            if adaptive is not None:
+                adaptive.record(None, overloaded=True)
+            if attempt >= max_retries:
+                break
+            await asyncio.sleep(base_backoff * (2 ** (attempt - 1)))
+
+        if last_exc is not None:
+            raise last_exc
+        raise RuntimeError("Hood API request failed without exception details")
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def __aenter__(self) -> "AsyncHoodClient":
+        self._get_client()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+
+async def async_send_request(
+    xml_body: str,
+    config: ApiConfig | None = None,
+    client: AsyncHoodClient | None = None,
+) -> str:
+    """
+    Асинхронный аналог send_request.
+    Без явного client использует общий клиент текущего event loop.
+    """
+    if client is None:
+        loop = asyncio.get_running_loop()
+        client = _ASYNC_CLIENTS.get(loop)
+        if client is None:
+            client = AsyncHoodClient()
+            _ASYNC_CLIENTS[loop] = client
+    return await client.send(xml_body, config=config)
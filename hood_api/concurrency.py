@@ -0,0 +1,231 @@
+"""
+Адаптивное ограничение параллелизма (AIMD) для массовых задач Hood.
+Лимит растёт на 1, пока Hood отвечает быстро и без ошибок, и делится пополам
+при 429/5xx/таймаутах. Один лимитер на аккаунт (ApiConfig.user) на весь процесс.
+"""
+
+import asyncio
+import os
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, AsyncIterator, Callable, Deque, Dict, Iterator
+
+from .config import ApiConfig
+
+_LIMITERS: Dict[str, "AdaptiveConcurrencyLimiter"] = {}
+_LIMITERS_LOCK = threading.Lock()
+
+
+class _Waiter:
+    __slots__ = ("granted", "wake")
+
+    def __init__(self, wake: Callable[[], None]) -> None:
+        self.granted = False
+        self.wake = wake
+
+
+def _resolve_future(fut: "asyncio.Future[None]") -> None:
+    if not fut.done():
+        fut.set_result(None)
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    Семафор с плавающим размером. Слоты берут и потоки (slot), и корутины (async_slot);
+    обратную связь (latency, перегрузка) даёт send_request через record().
+    slot() реентерабелен в пределах потока: вложенный вызов (например, чтение itemList из воркера
+    update-чанка) выполняется в уже занятом слоте и не ждёт второго.
+    """
+
+    def __init__(
+        self,
+        initial: int,
+        min_limit: int,
+        max_limit: int,
+        latency_factor: float = 3.0,
+        decrease_cooldown: float = 5.0,
+    ) -> None:
+        self.min_limit = max(1, int(min_limit))
+        self.max_limit = max(self.min_limit, int(max_limit))
+        self.latency_factor = float(latency_factor)
+        self.decrease_cooldown = float(decrease_cooldown)
+        self._limit = float(min(max(int(initial), self.min_limit), self.max_limit))
+        self._in_flight = 0
+        self._waiters: Deque[_Waiter] = deque()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._since_increase = 0
+        self._last_decrease = 0.0
+        self._min_latency: float | None = None
+        self._avg_latency: float | None = None
+        self._successes = 0
+        self._overloads = 0
+        self._increases = 0
+        self._decreases = 0
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    def _grant_locked(self) -> None:
+        while self._waiters and self._in_flight < int(self._limit):
+            waiter = self._waiters.popleft()
+            self._in_flight += 1
+            waiter.granted = True
+            try:
+                waiter.wake()
+            except RuntimeError:
+                # Event loop ожидающей корутины уже закрыт — слот возвращаем.
+                self._in_flight -= 1
+
+    def acquire(self) -> None:
+        with self._lock:
+            if not self._waiters and self._in_flight < int(self._limit):
+                self._in_flight += 1
+                return
+            event = threading.Event()
+            self._waiters.append(_Waiter(event.set))
+        event.wait()
+
+    async def acquire_async(self) -> None:
+        loop = asyncio.get_running_loop()
+        fut: "asyncio.Future[None]" = loop.create_future()
+        with self._lock:
+            if not self._waiters and self._in_flight < int(self._limit):
+                self._in_flight += 1
+                return
+            waiter = _Waiter(lambda: loop.call_soon_threadsafe(_resolve_future, fut))
+            self._waiters.append(waiter)
+        try:
+            await fut
+        except asyncio.CancelledError:
+            with self._lock:
+                if waiter.granted:
+                    self._in_flight -= 1
+                    self._grant_locked()
+                else:
+                    self._waiters.remove(waiter)
+            raise
+
+    def release(self) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            self._grant_locked()
+
+    def held(self) -> bool:
+        """Занят ли слот текущим потоком."""
+        return getattr(self._local, "depth", 0) > 0
+
+    @contextmanager
+    def slot(self) -> Iterator[None]:
+        depth = getattr(self._local, "depth", 0)
+        if depth == 0:
+            self.acquire()
+        self._local.depth = depth + 1
+        try:
+            yield
+        finally:
+            self._local.depth = depth
+            if depth == 0:
+                self.release()
+
+    @asynccontextmanager
+    async def async_slot(self) -> AsyncIterator[None]:
+        await self.acquire_async()
+        try:
+            yield
+        finally:
+            self.release()
+
+    def record(self, latency: float | None, overloaded: bool) -> None:
+        """Обратная связь по одному HTTP-вызову: additive increase / multiplicative decrease."""
+        with self._lock:
+            if overloaded:
+                self._overloads += 1
+                now = time.monotonic()
+                # Пачка ошибок от одного всплеска режет лимит только один раз.
+                if now - self._last_decrease >= self.decrease_cooldown:
+                    self._limit = max(float(self.min_limit), self._limit / 2)
+                    self._last_decrease = now
+                    self._decreases += 1
+                    self._since_increase = 0
+                return
+
+            self._successes += 1
+            if latency is not None:
+                self._min_latency = latency if self._min_latency is None else min(self._min_latency, latency)
+                self._avg_latency = (
+                    latency if self._avg_latency is None else self._avg_latency * 0.8 + latency * 0.2
+                )
+                if (
+                    self.latency_factor > 0
+                    and self._avg_latency > self._min_latency * self.latency_factor
+                ):
+                    # Hood заметно замедлился — держим текущий лимит.
+                    return
+
+            self._since_increase += 1
+            if self._since_increase >= int(self._limit) and self._limit < self.max_limit:
+                self._limit += 1
+                self._since_increase = 0
+                self._increases += 1
+                self._grant_locked()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "limit": int(self._limit),
+                "min_limit": self.min_limit,
+                "max_limit": self.max_limit,
+                "in_flight": self._in_flight,
+                "waiting": len(self._waiters),
+                "successes": self._successes,
+                "overloads": self._overloads,
+                "increases": self._increases,
+                "decreases": self._decreases,
+                "avg_latency_seconds": round(self._avg_latency, 3) if self._avg_latency is not None else None,
+                "min_latency_seconds": round(self._min_latency, 3) if self._min_latency is not None else None,
+            }
+
+
+def get_concurrency_limiter(config: ApiConfig) -> AdaptiveConcurrencyLimiter | None:
+    """
+    Общий AIMD-лимитер для аккаунта config.user.
+    Включается через HOOD_ADAPTIVE_CONCURRENCY=1; иначе задачи используют свои фиксированные workers.
+    """
+    if os.environ.get("HOOD_ADAPTIVE_CONCURRENCY", "").strip().lower() not in ("1", "true", "yes"):
+        return None
+    key = str(config.user or "").strip().lower()
+    with _LIMITERS_LOCK:
+        limiter = _LIMITERS.get(key)
+        if limiter is None:
+            limiter = AdaptiveConcurrencyLimiter(
+                initial=int(os.environ.get("HOOD_ADAPTIVE_INITIAL_CONCURRENCY", "4")),
+                min_limit=int(os.environ.get("HOOD_ADAPTIVE_MIN_CONCURRENCY", "1")),
+                max_limit=int(os.environ.get("HOOD_ADAPTIVE_MAX_CONCURRENCY", "32")),
+                latency_factor=float(os.environ.get("HOOD_ADAPTIVE_LATENCY_FACTOR", "3")),
+                decrease_cooldown=float(os.environ.get("HOOD_ADAPTIVE_DECREASE_COOLDOWN_SECONDS", "5")),
+            )
+            _LIMITERS[key] = limiter
+        return limiter
+
+
+def run_in_slot(limiter: AdaptiveConcurrencyLimiter | None, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """Выполняет fn в слоте лимитера (или напрямую, если адаптивный режим выключен)."""
+    if limiter is None:
+        return fn(*args, **kwargs)
+    with limiter.slot():
+        return fn(*args, **kwargs)
+
+
+def concurrency_stats() -> Dict[str, Dict[str, Any]]:
+    with _LIMITERS_LOCK:
+        limiters = dict(_LIMITERS)
+    return {user: limiter.stats() for user, limiter in limiters.items()}
+
+
+def current_limit(limiter: AdaptiveConcurrencyLimiter | None, fallback: int) -> int:
+    """Текущий параллелизм для progress: лимит AIMD или фиксированное число workers."""
+    return limiter.limit if limiter is not None else int(fallback)
@@ -0,0 +1,112 @@
+"""
+Ограничение частоты запросов к Hood API.
+Один токен-бакет на аккаунт (ApiConfig.user) на весь процесс: upload/update/split/delete
+задачи делят общий бюджет и не упираются в троттлинг Hood (429/503).
+"""
+
+import asyncio
+import os
+import threading
+import time
+from typing import Any, Dict
+
+from .config import ApiConfig
+
+_LIMITERS: Dict[str, "TokenBucket"] = {}
+_LIMITERS_LOCK = threading.Lock()
+
+
+class TokenBucket:
+    """
+    Потокобезопасный токен-бакет: rate токенов в секунду, не больше burst в запасе.
+    Токен резервируется сразу (баланс может уйти в минус), поэтому ожидающие
+    обслуживаются по очереди без активного опроса.
+    """
+
+    def __init__(self, rate: float, burst: int) -> None:
+        self.rate = float(rate)
+        self.burst = max(1, int(burst))
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self._acquired = 0
+        self._delayed = 0
+        self._waiting = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+    def _reserve(self) -> float:
+        """Забирает токен и возвращает, сколько секунд нужно подождать до его появления."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(float(self.burst), self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1.0
+            self._acquired += 1
+            delay = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            if delay > 0:
+                self._delayed += 1
+                self._waiting += 1
+                self._total_wait += delay
+                self._max_wait = max(self._max_wait, delay)
+            return delay
+
+    def _done_waiting(self) -> None:
+        with self._lock:
+            self._waiting -= 1
+
+    def acquire(self) -> float:
+        delay = self._reserve()
+        if delay > 0:
+            try:
+                time.sleep(delay)
+            finally:
+                self._done_waiting()
+        return delay
+
+    async def acquire_async(self) -> float:
+        delay = self._reserve()
+        if delay > 0:
+            try:
+                await asyncio.sleep(delay)
+            finally:
+                self._done_waiting()
+        return delay
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "rate_per_second": self.rate,
+                "burst": self.burst,
+                "acquired": self._acquired,
+                "delayed": self._delayed,
+                "waiting_now": self._waiting,
+                "total_wait_seconds": round(self._total_wait, 3),
+                "avg_wait_seconds": round(self._total_wait / self._delayed, 3) if self._delayed else 0.0,
+                "max_wait_seconds": round(self._max_wait, 3),
+            }
+
+
+def get_rate_limiter(config: ApiConfig) -> TokenBucket | None:
+    """
+    Общий лимитер для аккаунта config.user.
+    HOOD_API_RATE_LIMIT_PER_SECOND=0 (по умолчанию) отключает ограничение.
+    """
+    rate = float(os.environ.get("HOOD_API_RATE_LIMIT_PER_SECOND", "0") or 0)
+    if rate <= 0:
+        return None
+    key = str(config.user or "").strip().lower()
+    with _LIMITERS_LOCK:
+        limiter = _LIMITERS.get(key)
+        if limiter is None:
+            burst = int(os.environ.get("HOOD_API_RATE_LIMIT_BURST", "") or max(1, int(rate)))
+            limiter = TokenBucket(rate=rate, burst=burst)
+            _LIMITERS[key] = limiter
+        return limiter
+
+
+def rate_limiter_stats() -> Dict[str, Dict[str, Any]]:
+    """Метрики ожидания в очереди по каждому аккаунту."""
+    with _LIMITERS_LOCK:
+        limiters = dict(_LIMITERS)
+    return {user: limiter.stats() for user, limiter in limiters.items()}